@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compare the streaming .xlsx loader with the pandas loader.
+
+    python benchmarks/bench_load.py --rows 200000
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import openpyxl
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gluecksrad_io import _load_namelist_pandas, read_namelist  # noqa: E402
+
+
+def make_workbook(path: Path, rows: int) -> None:
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(["Name", "Counter"])
+    for i in range(rows):
+        ws.append([f"Person {i:07d}", i % 4])
+    wb.save(path)
+
+
+def measure(func, path: Path) -> tuple[float, float]:
+    """Return (seconds, peak MiB) of *func*; timed without tracemalloc."""
+    gc.collect()
+    t = time.perf_counter()
+    func(path)
+    elapsed = time.perf_counter() - t
+
+    gc.collect()
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--rows", type=int, default=200_000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "roster.xlsx"
+        make_workbook(path, args.rows)
+        for label, func in (("pandas", _load_namelist_pandas), ("streaming", read_namelist)):
+            sec, mib = measure(func, path)
+            print(f"{label:<10} {args.rows:>9} rows  {sec:8.3f} s  peak {mib:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
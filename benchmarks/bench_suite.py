@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark the hot paths on synthetic rosters of 1k-1M rows.
+
+    python benchmarks/bench_suite.py --out before.json
+    python benchmarks/bench_suite.py --out after.json --compare before.json
+
+Stages per roster size and storage format:
+  load         storage.read() of the file (no cache)
+  load_cached  storage.read() served from a RosterCache entry
+  engine       FairnessEngine construction from the counters
+  eligible     engine.candidates()  (V2 eligible_indices)
+  eligible_v1  V1 eligible_indices on a DataFrame, for reference
+  draw_100     draw_and_apply of a 100-name batch incl. normalisation
+  save_patch   storage.save() of 100 changed counters
+  save_full    storage.save() of all counters
+  populate     VirtualTree.set_source (populate_tree), GUI only
+  refresh      VirtualTree refresh of 100 changed rows (refresh_counters)
+
+Each stage is timed --repeat times (best is kept) and run once more
+under tracemalloc for its peak memory. GUI stages need a display; with
+--xvfb a private Xvfb server is started if none is set. With --compare,
+stages slower than the baseline by more than --threshold (and --min-ms)
+are listed and the exit code is 1.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gluecksrad_engine import FairnessEngine, draw_and_apply  # noqa: E402
+from gluecksrad_io import RosterCache, open_storage  # noqa: E402
+
+FORMATS = {"xlsx": ".xlsx", "csv": ".csv", "sqlite": ".db"}
+
+
+# ============================================================
+# Synthetic rosters
+# ============================================================
+def make_roster(path: Path, rows: int) -> None:
+    """Names "Person 0000000".. with counters cycling 0..3 (generation is not timed)."""
+    names = [f"Person {i:07d}" for i in range(rows)]
+    counters = [i % 4 for i in range(rows)]
+    if path.suffix == ".xlsx":
+        import openpyxl
+
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(["Name", "Counter"])
+        for row in zip(names, counters):
+            ws.append(row)
+        wb.save(path)
+    else:
+        storage = open_storage(path)
+        try:
+            storage.save(names, counters)
+        finally:
+            storage.close()
+
+
+def roster_file(workdir: Path, fmt: str, rows: int) -> Path:
+    path = workdir / f"roster_{rows}{FORMATS[fmt]}"
+    if not path.exists():
+        t = time.perf_counter()
+        make_roster(path, rows)
+        print(f"  generated {path.name} in {time.perf_counter() - t:.1f} s", file=sys.stderr)
+    return path
+
+
+# ============================================================
+# Measurement
+# ============================================================
+# A stage is a factory: it does the untimed setup and returns the call to time
+Stage = Callable[[], Callable[[], object]]
+
+
+def measure(stage: Stage, repeat: int) -> tuple[float, float]:
+    """Return (best seconds, peak MiB) of *stage*; timed without tracemalloc."""
+    best = float("inf")
+    for _ in range(repeat):
+        func = stage()
+        gc.collect()
+        t = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t)
+
+    func = stage()
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 2**20
+
+
+def data_stages(path: Path, fmt: str, rows: int, cache_dir: Path) -> dict[str, Stage]:
+    rng = random.Random(1)
+    changed = sorted(rng.sample(range(rows), min(100, rows)))
+
+    def read(cache: Optional[RosterCache] = None):
+        storage = open_storage(path, cache=cache)
+        try:
+            return storage.read()
+        finally:
+            storage.close()
+
+    names, counters, _ = read()
+    cache = RosterCache(cache_dir)
+    read(cache)  # creates the entry for load_cached
+
+    def saver(subset):
+        def setup():
+            storage = open_storage(path)
+            storage.read()
+            new = list(counters)
+            for i in (range(rows) if subset is None else subset):
+                new[i] += 1
+
+            def run():
+                try:
+                    storage.save(names, new, subset)
+                finally:
+                    storage.close()
+            return run
+        return setup
+
+    def draw():
+        engine = FairnessEngine(counters)
+        return lambda: draw_and_apply(engine, min(100, rows), random.Random(2))
+
+    def eligible():
+        engine = FairnessEngine(counters)
+        return engine.candidates
+
+    stages: dict[str, Stage] = {
+        "load": lambda: read,
+        "load_cached": lambda: lambda: read(cache),
+        "engine": lambda: lambda: FairnessEngine(counters),
+        "eligible": eligible,
+        "draw_100": draw,
+        "save_patch": saver(changed),
+        "save_full": saver(None),
+    }
+    try:
+        import pandas as pd
+
+        def eligible_v1():
+            df = pd.DataFrame({"Name": names, "Counter": list(counters)})
+            # gluecksrad_V1.eligible_indices, without importing the GUI module
+            return lambda: df.index[df["Counter"] == df["Counter"].min()].tolist()
+
+        stages["eligible_v1"] = eligible_v1
+    except ImportError:
+        pass
+    return stages
+
+
+def gui_stages(root, names: list[str], counters: list[int]) -> dict[str, Stage]:
+    from gluecksrad_V2 import VirtualTree
+
+    engine = FairnessEngine(counters)
+    changed = random.Random(1).sample(range(len(names)), min(100, len(names)))
+
+    def populate():
+        tree = VirtualTree(root, ("Name", "Counter"))
+        tree.pack()
+        root.update_idletasks()
+
+        def run():
+            tree.set_source(names, engine.counter)
+            root.update()
+            tree.destroy()
+        return run
+
+    def refresh():
+        tree = VirtualTree(root, ("Name", "Counter"))
+        tree.pack()
+        tree.set_source(names, engine.counter)
+        root.update()
+
+        def run():
+            for i in changed:
+                tree.refresh_index(i)
+            tree.refresh()
+            root.update()
+            tree.destroy()
+        return run
+
+    return {"populate": populate, "refresh": refresh}
+
+
+# ============================================================
+# Display
+# ============================================================
+def start_xvfb() -> Optional[subprocess.Popen]:
+    """Start Xvfb on a free display number and point DISPLAY at it."""
+    if os.environ.get("DISPLAY") or shutil.which("Xvfb") is None:
+        return None
+    for num in range(99, 120):
+        if Path(f"/tmp/.X{num}-lock").exists():
+            continue
+        proc = subprocess.Popen(
+            ["Xvfb", f":{num}", "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        for _ in range(50):
+            if Path(f"/tmp/.X11-unix/X{num}").exists():
+                os.environ["DISPLAY"] = f":{num}"
+                return proc
+            if proc.poll() is not None:
+                break
+            time.sleep(0.1)
+        proc.kill()
+    return None
+
+
+def open_display():
+    """A withdrawn Tk root, or None if no display is available."""
+    try:
+        import tkinter as tk
+
+        root = tk.Tk()
+    except Exception as e:  # ImportError or TclError ("no display")
+        print(f"  GUI stages skipped: {e}", file=sys.stderr)
+        return None
+    root.geometry("740x620")
+    return root
+
+
+# ============================================================
+# Comparison
+# ============================================================
+def compare(results: list[dict], baseline_path: Path, threshold: float, min_ms: float) -> list[str]:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    before = {(r["stage"], r["format"], r["rows"]): r for r in baseline["results"]}
+    slower = []
+    print(f"\n{'stage':<12} {'format':<7} {'rows':>8} {'before':>10} {'after':>10} {'ratio':>7}")
+    for r in results:
+        old = before.get((r["stage"], r["format"], r["rows"]))
+        if old is None or not old["seconds"]:
+            continue
+        ratio = r["seconds"] / old["seconds"]
+        flag = ""
+        if ratio > 1 + threshold and (r["seconds"] - old["seconds"]) * 1000 > min_ms:
+            flag = "  slower"
+            slower.append(f"{r['stage']}/{r['format']}/{r['rows']}")
+        print(f"{r['stage']:<12} {r['format']:<7} {r['rows']:>8} {old['seconds'] * 1000:>8.2f}ms "
+              f"{r['seconds'] * 1000:>8.2f}ms {ratio:>6.2f}x{flag}")
+    return slower
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).resolve().parent,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ============================================================
+# Main
+# ============================================================
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sizes", default="1000,10000,100000,1000000", help="comma-separated row counts")
+    ap.add_argument("--formats", default=",".join(FORMATS), help="comma-separated subset of xlsx,csv,sqlite")
+    ap.add_argument("--stages", help="comma-separated subset of stages (default: all)")
+    ap.add_argument("--repeat", type=int, default=3, help="timed runs per stage, the best is kept")
+    ap.add_argument("--workdir", type=Path, help="keep generated rosters here (default: temporary)")
+    ap.add_argument("--xvfb", action="store_true", help="start Xvfb for the GUI stages if no DISPLAY is set")
+    ap.add_argument("--no-gui", action="store_true", help="skip the GUI stages")
+    ap.add_argument("--out", type=Path, help="write the results as JSON")
+    ap.add_argument("--compare", type=Path, help="baseline JSON from an earlier run")
+    ap.add_argument("--threshold", type=float, default=0.25, help="tolerated slowdown (default: 0.25 = 25%%)")
+    ap.add_argument("--min-ms", type=float, default=1.0,
+                    help="ignore slowdowns smaller than this many milliseconds (timer noise)")
+    args = ap.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    formats = args.formats.split(",")
+    wanted = set(args.stages.split(",")) if args.stages else None
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        ap.error(f"unknown format(s): {', '.join(sorted(unknown))}")
+
+    xvfb = start_xvfb() if args.xvfb and not args.no_gui else None
+    root = None if args.no_gui else open_display()
+    results: list[dict] = []
+
+    def record(stage: str, fmt: str, rows: int, func: Stage) -> None:
+        if wanted is not None and stage not in wanted:
+            return
+        sec, mib = measure(func, args.repeat)
+        results.append({"stage": stage, "format": fmt, "rows": rows, "seconds": sec, "peak_mib": mib})
+        print(f"{stage:<12} {fmt:<7} {rows:>8}  {sec * 1000:10.2f} ms  peak {mib:8.1f} MiB")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = args.workdir or Path(tmp)
+            workdir.mkdir(parents=True, exist_ok=True)
+            for rows in sizes:
+                for fmt in formats:
+                    path = roster_file(workdir, fmt, rows)
+                    # Work on a copy so the saves do not change the cached input
+                    work = Path(tmp) / f"work{path.suffix}"
+                    shutil.copyfile(path, work)
+                    for stage, func in data_stages(work, fmt, rows, Path(tmp) / "cache").items():
+                        record(stage, fmt, rows, func)
+                if root is not None:
+                    names = [f"Person {i:07d}" for i in range(rows)]
+                    for stage, func in gui_stages(root, names, [i % 4 for i in range(rows)]).items():
+                        record(stage, "tk", rows, func)
+    finally:
+        if root is not None:
+            root.destroy()
+        if xvfb is not None:
+            xvfb.terminate()
+
+    if args.out:
+        meta = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "revision": _git_revision(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": args.repeat,
+        }
+        args.out.write_text(json.dumps({"meta": meta, "results": results}, indent=2), encoding="utf-8")
+    if args.compare:
+        slower = compare(results, args.compare, args.threshold, args.min_ms)
+        if slower:
+            print(f"\n{len(slower)} stage(s) slower than the baseline: {', '.join(slower)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
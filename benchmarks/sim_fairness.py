@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Monte-Carlo check of the fairness rules over many seeds and batch sizes.
+
+    python benchmarks/sim_fairness.py --picks 100000000 --sizes 10,1000 --batches 1,7,50
+
+Methods:
+  v2     FairnessEngine.pick / apply_winner, as in gluecksrad_V2 and the CLI
+  batch  vectorised draw_batch (NumPy), for large batches
+  v1     V1 reference (eligible_indices + normalize_if_all_equal) run in
+         lock-step with the engine; every step compares the candidate sets
+         and every batch the normalised counters
+
+Work is split into chunks of --chunk picks, each a fresh roster with its
+own seed, and spread over a process pool. Selection counts are compared
+with the water-filled expectation; chi2/dof far below 1 (p ~ 1) means the
+rules are more even than independent random draws, as intended. Exit
+code 1 if the counter spread after a batch ever exceeds 1 once levelled,
+or if V1 and V2 disagree.
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gluecksrad_engine import FairnessEngine, draw_batch  # noqa: E402
+
+METHODS = ("v2", "batch", "v1")
+
+
+# ============================================================
+# Simulation of one chunk (runs in a worker process)
+# ============================================================
+def initial_counters(size: int, start: int, rng: random.Random) -> list[int]:
+    """All zero, or uniformly random in 0..start to test levelling."""
+    if start <= 0:
+        return [0] * size
+    return [rng.randint(0, start) for _ in range(size)]
+
+
+def expected_counts(counters: list[int], picks: int) -> list[float]:
+    """Expected picks per name: water-fill *picks* onto *counters*.
+
+    The rules always lift the lowest counters first, so a fair draw ends
+    with every name at the same (fractional) level T.
+    """
+    order = sorted(counters)
+    level, k = float(order[0]), 1
+    remaining = float(picks)
+    while k < len(order):
+        # Lift the k lowest names from *level* up to the next counter
+        need = (order[k] - level) * k
+        if need > remaining:
+            break
+        remaining -= need
+        level, k = float(order[k]), k + 1
+    level += remaining / k
+    return [max(0.0, level - c) for c in counters]
+
+
+def _simulate_v2(counters, batch, batches, rng, track_v1=False):
+    engine = FairnessEngine(counters)
+    counts = [0] * len(counters)
+    top = max(counters)
+    stats = {"max_spread": 0, "levelled_after": None, "mismatches": 0}
+    levelled = top - min(counters) <= 1
+    if levelled:
+        stats["levelled_after"] = 0
+
+    v1 = list(counters) if track_v1 else None
+    excluded: set[int] = set()
+
+    for b in range(batches):
+        for _ in range(batch):
+            if v1 is None:
+                idx = engine.pick(rng)
+            else:
+                # V1 draw_next_one: minimum, minus this batch's winners
+                # unless nobody would remain
+                m = min(v1)
+                elig = [i for i, c in enumerate(v1) if c == m]
+                filtered = [i for i in elig if i not in excluded] or elig
+                if set(filtered) != set(engine.candidates()):
+                    stats["mismatches"] += 1
+                idx = rng.choice(filtered)
+                excluded.add(idx)
+                v1[idx] += 1
+                if len(set(v1)) == 1:  # normalize_if_all_equal
+                    v1 = [0] * len(v1)
+            engine.apply_winner(idx)
+            counts[idx] += 1
+            raw = engine.counter(idx) + engine.offset
+            if raw > top:
+                top = raw
+        engine.clear_batch()
+        excluded.clear()
+
+        spread = top - engine.offset
+        if levelled:
+            stats["max_spread"] = max(stats["max_spread"], spread)
+        elif spread <= 1:
+            levelled = True
+            stats["levelled_after"] = (b + 1) * batch
+        if v1 is not None:
+            m = min(v1)
+            if [c - m for c in v1] != engine.counters():
+                stats["mismatches"] += 1
+    return counts, stats
+
+
+def _simulate_batch(counters, batch, batches, rng):
+    import numpy as np
+
+    nprng = np.random.default_rng(rng.getrandbits(64))
+    c = np.asarray(counters, dtype=np.int64)
+    counts = np.zeros(c.size, dtype=np.int64)
+    stats = {"max_spread": 0, "levelled_after": None, "mismatches": 0}
+    levelled = int(c.max() - c.min()) <= 1
+    if levelled:
+        stats["levelled_after"] = 0
+    for b in range(batches):
+        winners, c = draw_batch(c, batch, nprng)
+        counts += np.bincount(winners, minlength=c.size)
+        spread = int(c.max())  # draw_batch normalises the minimum to 0
+        if levelled:
+            stats["max_spread"] = max(stats["max_spread"], spread)
+        elif spread <= 1:
+            levelled = True
+            stats["levelled_after"] = (b + 1) * batch
+    return counts.tolist(), stats
+
+
+def simulate(task: dict) -> dict:
+    """Run one chunk: *batches* batches of *batch* picks on a fresh roster."""
+    rng = random.Random(f"{task['seed']}:{task['method']}:{task['size']}:{task['batch']}:{task['chunk']}")
+    counters = initial_counters(task["size"], task["start"], rng)
+    picks = task["batch"] * task["batches"]
+    t = time.perf_counter()
+    if task["method"] == "batch":
+        counts, stats = _simulate_batch(counters, task["batch"], task["batches"], rng)
+    else:
+        counts, stats = _simulate_v2(counters, task["batch"], task["batches"], rng, task["method"] == "v1")
+    return {
+        "key": (task["method"], task["size"], task["batch"]),
+        "counts": counts,
+        "expected": expected_counts(counters, picks),
+        "picks": picks,
+        "seconds": time.perf_counter() - t,
+        **stats,
+    }
+
+
+# ============================================================
+# Statistics
+# ============================================================
+def chi_square_p(chi2: float, dof: int) -> float:
+    """Upper-tail p-value, Wilson–Hilferty approximation (no SciPy needed)."""
+    if dof <= 0:
+        return 1.0
+    k = 2.0 / (9.0 * dof)
+    z = ((chi2 / dof) ** (1.0 / 3.0) - (1.0 - k)) / math.sqrt(k)
+    return 0.5 * math.erfc(z / math.sqrt(2.0))
+
+
+class Result:
+    """Aggregate of all chunks of one (method, size, batch) configuration."""
+
+    def __init__(self, method: str, size: int, batch: int) -> None:
+        self.method, self.size, self.batch = method, size, batch
+        self.counts = [0] * size
+        self.expected = [0.0] * size
+        self.picks = 0
+        self.chunks = 0
+        self.cpu_seconds = 0.0
+        self.max_spread = 0
+        self.levelled_after: Optional[int] = 0
+        self.mismatches = 0
+
+    def add(self, part: dict) -> None:
+        for i, (o, e) in enumerate(zip(part["counts"], part["expected"])):
+            self.counts[i] += o
+            self.expected[i] += e
+        self.picks += part["picks"]
+        self.chunks += 1
+        self.cpu_seconds += part["seconds"]
+        self.max_spread = max(self.max_spread, part["max_spread"])
+        self.mismatches += part["mismatches"]
+        if part["levelled_after"] is None or self.levelled_after is None:
+            self.levelled_after = None
+        else:
+            self.levelled_after = max(self.levelled_after, part["levelled_after"])
+
+    @property
+    def chi2(self) -> float:
+        return sum((o - e) ** 2 / e for o, e in zip(self.counts, self.expected) if e > 0)
+
+    @property
+    def ok(self) -> bool:
+        return self.levelled_after is not None and self.max_spread <= 1 and self.mismatches == 0
+
+    def as_dict(self) -> dict:
+        dof = self.size - 1
+        chi2 = self.chi2
+        return {
+            "method": self.method,
+            "size": self.size,
+            "batch": self.batch,
+            "picks": self.picks,
+            "chunks": self.chunks,
+            "cpu_seconds": round(self.cpu_seconds, 3),
+            "picks_per_second": round(self.picks / self.cpu_seconds) if self.cpu_seconds else None,
+            "count_min": min(self.counts),
+            "count_max": max(self.counts),
+            "max_deviation": max(abs(o - e) for o, e in zip(self.counts, self.expected)),
+            "max_spread": self.max_spread,
+            "levelled_after": self.levelled_after,
+            "chi2": chi2,
+            "dof": dof,
+            "p_value": chi_square_p(chi2, dof),
+            "v1_mismatches": self.mismatches if self.method == "v1" else None,
+            "ok": self.ok,
+        }
+
+
+# ============================================================
+# Main
+# ============================================================
+def make_tasks(args) -> list[dict]:
+    tasks = []
+    for method in args.methods:
+        for size in args.sizes:
+            for batch in args.batches:
+                per_chunk = max(1, args.chunk // batch)
+                total = max(1, args.picks // batch)
+                chunk = 0
+                while total > 0:
+                    n = min(per_chunk, total)
+                    tasks.append({
+                        "method": method, "size": size, "batch": batch, "batches": n,
+                        "start": args.start, "seed": args.seed, "chunk": chunk,
+                    })
+                    total -= n
+                    chunk += 1
+    # Longest chunks first keeps the pool busy until the end
+    tasks.sort(key=lambda t: -t["batch"] * t["batches"] * (t["size"] if t["method"] == "v1" else 1))
+    return tasks
+
+
+def _int_list(text: str) -> list[int]:
+    values = [int(v) for v in text.split(",") if v.strip()]
+    if not values or min(values) < 1:
+        raise argparse.ArgumentTypeError("comma-separated positive integers")
+    return values
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--picks", type=int, default=10_000_000, help="picks per configuration")
+    ap.add_argument("--sizes", type=_int_list, default=[10, 1000], help="roster sizes, e.g. 10,1000")
+    ap.add_argument("--batches", type=_int_list, default=[1, 7, 50], help="batch sizes, e.g. 1,7,50")
+    ap.add_argument("--methods", type=lambda s: s.split(","), default=["v2"],
+                    help=f"comma-separated subset of {','.join(METHODS)}")
+    ap.add_argument("--start", type=int, default=0,
+                    help="random initial counters in 0..START (default: all 0)")
+    ap.add_argument("--chunk", type=int, default=1_000_000, help="picks per worker task")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", type=Path, help="also write the results to this file")
+    args = ap.parse_args()
+    unknown = set(args.methods) - set(METHODS)
+    if unknown:
+        ap.error(f"unknown method(s): {', '.join(sorted(unknown))}")
+
+    tasks = make_tasks(args)
+    results: dict[tuple, Result] = {}
+    t = time.perf_counter()
+    with multiprocessing.Pool(args.jobs) as pool:
+        for part in pool.imap_unordered(simulate, tasks):
+            key = tuple(part["key"])
+            if key not in results:
+                results[key] = Result(*key)
+            results[key].add(part)
+    wall = time.perf_counter() - t
+
+    rows = [results[k].as_dict() for k in sorted(results)]
+    print(f"{'method':<6} {'size':>7} {'batch':>6} {'picks':>12} {'min':>10} {'max':>10} "
+          f"{'spread':>6} {'chi2/dof':>9} {'p':>6} {'picks/s':>10}  ok")
+    for r in rows:
+        print(f"{r['method']:<6} {r['size']:>7} {r['batch']:>6} {r['picks']:>12} "
+              f"{r['count_min']:>10} {r['count_max']:>10} {r['max_spread']:>6} "
+              f"{r['chi2'] / max(r['dof'], 1):>9.4f} {r['p_value']:>6.3f} "
+              f"{r['picks_per_second'] or 0:>10}  {'yes' if r['ok'] else 'NO'}")
+    total = sum(r["picks"] for r in rows)
+    print(f"{total} picks in {wall:.1f} s with {args.jobs} processes ({total / wall:,.0f} picks/s)")
+
+    if args.json:
+        args.json.write_text(json.dumps(
+            {"args": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+             "wall_seconds": wall, "results": rows},
+            indent=2,
+        ), encoding="utf-8")
+    return 0 if all(r["ok"] for r in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,92 +5,754 @@ Glücksrad – Faire Zufallsauswahl V2
 Bug-fixes and improvements over V1.
 """
 
+import time
+
+_T_START = time.perf_counter()
+
 import random
 import logging
+import queue
+import threading
+from array import array
+from collections import deque
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional, Sequence
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import pandas as pd
+
+from gluecksrad_engine import STRATEGIES, DrawStrategy, FairnessEngine, ShuffleDeck
+from gluecksrad_io import (
+    STORAGE_BACKENDS,
+    DeckFile,
+    DrawJournal,
+    LoadCancelled,
+    Roster,
+    RosterCache,
+    RosterDiff,
+    RosterStorage,
+    diff_roster,
+    open_storage,
+)
+
+_T_IMPORTED = time.perf_counter()
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s  %(levelname)s  %(message)s")
 log = logging.getLogger(__name__)
 
 
 # ============================================================
-# Excel handling
+# Spin animation paths
+# ============================================================
+def classic_spin_frames(
+    candidates: Sequence[int], winner_idx: int, rounds: int, rollout_factor: float,
+    fast_ms: float, slow_ms: float, grow: float,
+) -> Iterator[tuple[int, float]]:
+    """Yield ``(index, delay_ms)`` frames of the round-based spin.
+
+    SPIN_ROUNDS full passes over *candidates*, then a rollout of
+    ≈ rollout_factor × len(candidates) steps that stops on the winner.
+    Frames are produced lazily; the duration grows with the list length.
+    """
+    def path() -> Iterator[int]:
+        for _ in range(rounds):
+            yield from candidates
+        n = len(candidates)
+        rollout = max(1, int(n * rollout_factor))
+        cur = random.randrange(n)
+        # BUG-FIX V2: hard upper bound in case the winner is not in the list
+        for steps in range(1, rollout + n * 2 + 1):
+            idx = candidates[cur]
+            yield idx
+            if steps >= rollout and idx == winner_idx:
+                return
+            cur = (cur + 1) % n
+        yield winner_idx
+
+    delay = float(fast_ms)
+    for idx in path():
+        delay = min(delay * grow, float(slow_ms))
+        yield idx, delay
+
+
+def _decel_delays(fast_ms: float, slow_ms: float, grow: float) -> Iterator[float]:
+    """Delays of the deceleration ramp from *fast_ms* up to *slow_ms*."""
+    d = float(fast_ms)
+    while d < slow_ms:
+        yield d
+        d *= grow
+    yield float(slow_ms)
+
+
+def timed_spin_frames(
+    candidates: Sequence[int], winner_pos: int, duration_ms: float,
+    fast_ms: float, slow_ms: float, grow: float,
+) -> Iterator[tuple[int, float]]:
+    """Yield ``(index, delay_ms)`` frames of a spin lasting ≈ *duration_ms*.
+
+    The frame count depends only on the time budget: a fast phase followed
+    by the deceleration ramp (cut from the front if the budget is short).
+    Large candidate lists are strided so one pass covers the whole list,
+    and the last frame is ``candidates[winner_pos]``. O(1) memory.
+    """
+    ramp_ms = 0.0
+    ramp_len = 0
+    for d in _decel_delays(fast_ms, slow_ms, grow):
+        ramp_ms += d
+        ramp_len += 1
+
+    fast_frames = 0
+    skip = 0
+    if duration_ms >= ramp_ms:
+        fast_frames = int((duration_ms - ramp_ms) // fast_ms)
+    else:
+        for d in _decel_delays(fast_ms, slow_ms, grow):
+            if ramp_ms <= duration_ms or skip == ramp_len - 1:
+                break
+            ramp_ms -= d
+            skip += 1
+    total = fast_frames + ramp_len - skip
+
+    n = len(candidates)
+    stride = max(1, n // total)
+    pos = (winner_pos - (total - 1) * stride) % n
+    ramp = _decel_delays(fast_ms, slow_ms, grow)
+    for _ in range(skip):
+        next(ramp)
+    for k in range(total):
+        delay = float(fast_ms) if k < fast_frames else next(ramp)
+        yield candidates[pos], delay
+        pos = (pos + stride) % n
+
+
+# ============================================================
+# Timer registry
 # ============================================================
-def load_namelist(xls_path: Path) -> pd.DataFrame:
-    """Load names (col A) and optional counters (col B) from an Excel file.
+class TimerRegistry:
+    """Tracks pending Tk ``after`` callbacks by group.
 
-    Bug-fix V2: after converting Name to str, rows that became the literal
-    string 'nan' (from NaN cells) are now also filtered out.
-    Bug-fix V2: empty DataFrames are caught early with a clear error message.
+    Ids are removed when their callback fires, so the registry only ever
+    holds live timers – memory and shutdown cost stay constant over uptime.
     """
-    df = pd.read_excel(xls_path)
-    if df.shape[1] < 1:
-        raise ValueError("Spalte A (Namen) fehlt.")
 
-    # Rename columns robustly
-    if "A" in df.columns and "B" in df.columns:
-        df = df.rename(columns={"A": "Name", "B": "Counter"})
-    else:
-        cols = list(df.columns)
-        rename_map = {cols[0]: "Name"}
-        if len(cols) >= 2:
-            rename_map[cols[1]] = "Counter"
-        df = df.rename(columns=rename_map)
-
-    if "Counter" not in df.columns:
-        df["Counter"] = 0
-
-    df["Name"] = df["Name"].astype(str).str.strip()
-    # BUG-FIX: astype(str) turns NaN → "nan"; filter that out too
-    df = df[~df["Name"].isin(["", "nan", "None"])]
-    df["Counter"] = pd.to_numeric(df["Counter"], errors="coerce").fillna(0).astype(int)
-    df = df.reset_index(drop=True)
-
-    if df.empty:
-        raise ValueError("Die Datei enthält keine gültigen Namen.")
-    return df
-
-
-def save_namelist(df: pd.DataFrame, xls_path: Path) -> None:
-    """Save the name/counter DataFrame back to Excel."""
-    # BUG-FIX V2: write to a temp file first, then replace – prevents data
-    # loss if the write is interrupted or the file is locked.
-    tmp_path = xls_path.with_suffix(".tmp.xlsx")
-    try:
-        with pd.ExcelWriter(tmp_path, engine="openpyxl") as writer:
-            df.to_excel(writer, index=False)
-        tmp_path.replace(xls_path)
-    except Exception:
-        # Clean up temp file on failure
-        if tmp_path.exists():
-            tmp_path.unlink(missing_ok=True)
-        raise
+    def __init__(self, widget: tk.Misc) -> None:
+        self._widget = widget
+        self._groups: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self._groups.values())
+
+    def counts(self) -> dict[str, int]:
+        """Live timer count per group."""
+        return {g: len(ids) for g, ids in self._groups.items() if ids}
+
+    def after(self, ms: int, func: Callable[[], None], group: str = "default") -> str:
+        """Schedule *func* after *ms* in *group*."""
+        return self._register(group, func, lambda cb: self._widget.after(ms, cb))
+
+    def after_idle(self, func: Callable[[], None], group: str = "default") -> str:
+        """Schedule *func* for the next idle moment in *group*."""
+        return self._register(group, func, lambda cb: self._widget.after_idle(cb))
+
+    def _register(self, group: str, func: Callable[[], None], schedule) -> str:
+        ids = self._groups.setdefault(group, set())
+        aid = ""
+
+        def fire() -> None:
+            ids.discard(aid)
+            func()
+
+        aid = schedule(fire)
+        ids.add(aid)
+        return aid
+
+    def cancel_group(self, group: str) -> None:
+        """Cancel all pending callbacks of *group*."""
+        for aid in self._groups.pop(group, ()):
+            try:
+                self._widget.after_cancel(aid)
+            except (tk.TclError, ValueError):
+                pass
+
+    def cancel_all(self) -> None:
+        for group in list(self._groups):
+            self.cancel_group(group)
+
+
+# ============================================================
+# Instrumentation
+# ============================================================
+class Histogram:
+    """Duration histogram with power-of-two microsecond buckets (O(1) memory).
+
+    Bucket k holds durations in [2**(k-1), 2**k) µs; the last bucket is
+    open-ended (≥ ~4 s). Percentiles are bucket upper bounds.
+    """
+
+    __slots__ = ("count", "total", "max", "buckets")
+    BUCKETS = 24
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * self.BUCKETS
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[min(self.BUCKETS - 1, int(seconds * 1e6).bit_length())] += 1
+
+    def percentile(self, q: float) -> float:
+        """Upper bound (seconds) of the bucket holding the *q* quantile."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for k, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(self.max, (1 << k) / 1e6)
+        return self.max
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": 1000.0 * self.total,
+            "mean_ms": 1000.0 * self.total / self.count if self.count else 0.0,
+            "p50_ms": 1000.0 * self.percentile(0.5),
+            "p95_ms": 1000.0 * self.percentile(0.95),
+            "max_ms": 1000.0 * self.max,
+            "buckets_us": {f"<{1 << k}": n for k, n in enumerate(self.buckets) if n},
+        }
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+class _Timer:
+    __slots__ = ("hist", "t")
+
+    def __init__(self, hist: Histogram) -> None:
+        self.hist = hist
+
+    def __enter__(self) -> None:
+        self.t = time.perf_counter()
+
+    def __exit__(self, *exc) -> bool:
+        self.hist.add(time.perf_counter() - self.t)
+        return False
+
+
+class PerfRecorder:
+    """Per-phase timing histograms for the hot paths of the app.
+
+    ``with perf.timed("save"): ...`` records one sample; when disabled it
+    costs one attribute check. Histograms are only written from the Tk
+    thread, except "parse" (load worker) and "save" (save worker).
+    """
+
+    STAGES = {
+        "parse": "Datei einlesen",
+        "populate": "Liste aufbauen",
+        "draw": "Gewinner bestimmen",
+        "eligible": "Kandidaten ermitteln",
+        "path": "Spin-Pfad erzeugen",
+        "frame": "Spin-Frame zeichnen",
+        "blink": "Blink-Frame zeichnen",
+        "refresh": "Zähler aktualisieren",
+        "persist": "Ziehung protokollieren",
+        "save": "Datei speichern",
+    }
+    _NULL = _NullTimer()
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.started = time.time()
+        self.hists = {stage: Histogram() for stage in self.STAGES}
+
+    def reset(self) -> None:
+        self.started = time.time()
+        self.hists = {stage: Histogram() for stage in self.STAGES}
+
+    def record(self, stage: str, seconds: float) -> None:
+        if self.enabled:
+            self.hists[stage].add(seconds)
+
+    def timed(self, stage: str):
+        """Context manager timing its body as one sample of *stage*."""
+        return _Timer(self.hists[stage]) if self.enabled else self._NULL
+
+    def wrap(self, stage: str, func: Callable[..., None]) -> Callable[..., None]:
+        """*func* with every call timed as *stage*."""
+        def timed_call(*args) -> None:
+            if not self.enabled:
+                return func(*args)
+            t = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                self.hists[stage].add(time.perf_counter() - t)
+        return timed_call
+
+    def timed_iter(self, stage: str, items: Iterable) -> Iterator:
+        """Iterate *items*; the time spent producing them is one sample."""
+        return self._timed_iter(stage, items) if self.enabled else iter(items)
+
+    def _timed_iter(self, stage: str, items: Iterable) -> Iterator:
+        it = iter(items)
+        spent = 0.0
+        while True:
+            t = time.perf_counter()
+            try:
+                item = next(it)
+            except StopIteration:
+                break
+            spent += time.perf_counter() - t
+            yield item
+        self.record(stage, spent + time.perf_counter() - t)
+
+    def as_dict(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "since": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "stages": {stage: h.as_dict() for stage, h in self.hists.items()},
+        }
+
+
+# ============================================================
+# Background saving
+# ============================================================
+class SaveWorker:
+    """Runs storage writes on one background thread, in submission order.
+
+    Jobs are submitted from the Tk thread; their outcome travels back
+    through a queue polled with ``after`` (Tk is not thread-safe), and
+    *on_done(error)* runs on the Tk thread. A job submitted with a *key*
+    is dropped while another job with that key is still waiting, so
+    back-to-back requests coalesce – the waiting job reads the latest
+    state when it runs. The job queue is bounded; submitting never blocks
+    the Tk thread: while the queue is full, jobs wait in an overflow list
+    that :meth:`_poll` feeds in order.
+    """
+
+    POLL_MS = 20
+
+    def __init__(self, timers: TimerRegistry, maxsize: int = 32) -> None:
+        self._timers = timers
+        self._jobs: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize)
+        self._results: "queue.Queue[tuple]" = queue.Queue()
+        self._waiting: set[str] = set()
+        self._lock = threading.Lock()
+        self._outstanding = 0  # submitted, outcome not yet delivered (Tk thread only)
+        self._overflow: deque[tuple] = deque()  # waiting for queue space (Tk thread only)
+        self._polling = False
+        self._thread = threading.Thread(target=self._run, name="save", daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self) -> bool:
+        return self._outstanding > 0
+
+    def submit(
+        self, func: Callable[[], None],
+        on_done: Optional[Callable[[Optional[Exception]], None]] = None,
+        key: Optional[str] = None,
+    ) -> bool:
+        """Queue *func*; False if a job with *key* is already waiting."""
+        if key is not None:
+            with self._lock:
+                if key in self._waiting:
+                    return False
+                self._waiting.add(key)
+        self._outstanding += 1
+        self._overflow.append((func, on_done, key))
+        self._feed()
+        if not self._polling:
+            self._polling = True
+            self._timers.after(self.POLL_MS, self._poll, "save")
+        return True
+
+    def _feed(self, block: bool = False) -> None:
+        """Move overflow jobs into the job queue, oldest first."""
+        try:
+            while self._overflow:
+                self._jobs.put(self._overflow[0], block)
+                self._overflow.popleft()
+        except queue.Full:
+            pass
+
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            func, on_done, key = job
+            if key is not None:
+                with self._lock:
+                    self._waiting.discard(key)
+            try:
+                func()
+                error = None
+            except Exception as e:
+                log.exception("Speichern im Hintergrund fehlgeschlagen")
+                error = e
+            self._results.put((on_done, error))
+
+    def _deliver(self, on_done, error: Optional[Exception]) -> None:
+        self._outstanding -= 1
+        if on_done is not None:
+            on_done(error)
+
+    def _poll(self) -> None:
+        try:
+            while True:
+                self._deliver(*self._results.get_nowait())
+        except queue.Empty:
+            pass
+        self._feed()
+        self._polling = self._outstanding > 0
+        if self._polling:
+            self._timers.after(self.POLL_MS, self._poll, "save")
+
+    def flush(self) -> None:
+        """Block until every job ran and its *on_done* was called.
+
+        Only for moments the UI may wait: closing, reloading, snapshots.
+        Jobs submitted by an *on_done* are waited for as well.
+        """
+        while self._outstanding:
+            self._feed(block=True)
+            self._deliver(*self._results.get())
+
+    def close(self) -> None:
+        self.flush()
+        self._jobs.put(None)
+        self._thread.join()
 
 
 # ============================================================
-# Fairness logic
+# Animation clock
 # ============================================================
-def eligible_indices(df: pd.DataFrame) -> list[int]:
-    """Return indices of all rows whose Counter equals the global minimum."""
-    m = df["Counter"].min()
-    return df.index[df["Counter"] == m].tolist()
+class FrameStats:
+    """Running frame-time statistics (O(1) memory)."""
 
+    __slots__ = ("frames", "skipped", "late_sum", "late_max", "render_sum", "render_max",
+                 "overrun")
 
-def normalize_counters(df: pd.DataFrame) -> None:
-    """Subtract the minimum counter from all rows so the lowest counter is 0.
+    def __init__(self) -> None:
+        self.frames = 0
+        self.skipped = 0
+        self.late_sum = 0.0      # seconds a tick fired after its deadline
+        self.late_max = 0.0
+        self.render_sum = 0.0    # seconds spent in the frame callback
+        self.render_max = 0.0
+        self.overrun = 0.0       # real minus planned duration (last run)
+
+    def add(self, other: "FrameStats") -> None:
+        self.frames += other.frames
+        self.skipped += other.skipped
+        self.late_sum += other.late_sum
+        self.late_max = max(self.late_max, other.late_max)
+        self.render_sum += other.render_sum
+        self.render_max = max(self.render_max, other.render_max)
+        self.overrun = other.overrun
+
+    def as_dict(self) -> dict[str, float]:
+        n = max(1, self.frames)
+        return {
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "late_mean_ms": 1000.0 * self.late_sum / n,
+            "late_max_ms": 1000.0 * self.late_max,
+            "render_mean_ms": 1000.0 * self.render_sum / n,
+            "render_max_ms": 1000.0 * self.render_max,
+            "overrun_ms": 1000.0 * self.overrun,
+        }
+
+
+class AnimationClock:
+    """Plays ``(payload, delay_ms)`` frames against absolute deadlines.
+
+    Every frame's deadline is derived from the start time and the sum of
+    the preceding delays (``time.perf_counter``), so timer jitter and slow
+    frame callbacks do not add up. When a tick arrives after the following
+    frame's slot has already ended, the intermediate frames are skipped;
+    the final frame is always shown.
+    """
+
+    def __init__(self, schedule: Callable[[int, Callable[[], None], str], object]) -> None:
+        self._schedule = schedule
+        self._run_id = 0
+        self.last_run = FrameStats()
+        self.total = FrameStats()
+
+    def cancel(self) -> None:
+        """Stop the current run; already scheduled ticks become no-ops."""
+        self._run_id += 1
+
+    def run(
+        self,
+        frames: Iterable[tuple[object, float]],
+        on_frame: Callable[[object], None],
+        on_done: Callable[[], None],
+        group: str = "default",
+    ) -> None:
+        """Play *frames*, calling *on_frame(payload)*; ticks go to *group*."""
+        self.cancel()
+        run_id = self._run_id
+        it = iter(frames)
+        stats = FrameStats()
+        self.last_run = stats
+        state = {"deadline": time.perf_counter(), "next": next(it, None)}
+
+        def done() -> None:
+            if run_id != self._run_id:
+                return
+            stats.overrun = time.perf_counter() - state["deadline"]
+            self.total.add(stats)
+            on_done()
+
+        def tick() -> None:
+            if run_id != self._run_id:
+                return
+            now = time.perf_counter()
+            frame = state["next"]
+            if frame is None:
+                done()
+                return
+            late = max(0.0, now - state["deadline"])
+            stats.late_sum += late
+            stats.late_max = max(stats.late_max, late)
 
-    Improvement V2: the V1 version only normalised when ALL counters were
-    equal, which meant counters grew unboundedly. This version always
-    normalises relative to the minimum, keeping numbers small and
-    preventing potential integer-overflow-style drift over many rounds.
+            # Fell behind: skip frames whose display slot is already over
+            nxt = next(it, None)
+            while nxt is not None and state["deadline"] + frame[1] / 1000.0 <= now:
+                state["deadline"] += frame[1] / 1000.0
+                stats.skipped += 1
+                frame, nxt = nxt, next(it, None)
+            state["next"] = nxt
+
+            t = time.perf_counter()
+            on_frame(frame[0])
+            render = time.perf_counter() - t
+            stats.frames += 1
+            stats.render_sum += render
+            stats.render_max = max(stats.render_max, render)
+
+            state["deadline"] += frame[1] / 1000.0
+            wait_ms = max(1, int(round((state["deadline"] - time.perf_counter()) * 1000)))
+            self._schedule(wait_ms, tick if nxt is not None else done, group)
+
+        tick()
+
+
+# ============================================================
+# Virtualised name list
+# ============================================================
+class VirtualTree(ttk.Frame):
+    """Name/counter list that only creates Treeview items for visible rows.
+
+    The Treeview holds a fixed pool of "slot" items (visible rows plus a
+    small overscan) which are re-filled from the data source on scrolling,
+    so loading cost does not grow with the roster. Rows are addressed by
+    data index; the scan row and the marked (winner) rows are stored here
+    and applied as tags while rendering.
     """
-    m = df["Counter"].min()
-    if m > 0:
-        df["Counter"] = df["Counter"] - m
+
+    OVERSCAN = 2  # extra slots below the last fully visible row
+
+    def __init__(self, master, columns: tuple[str, ...], height: int = 18) -> None:
+        super().__init__(master)
+        self.tree = ttk.Treeview(
+            self, columns=columns, show="headings", height=height, selectmode="none"
+        )
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self._names: Sequence[str] = ()
+        self._counter: Callable[[int], int] = lambda i: 0
+        self._top = 0
+        self._rows = height
+        self._slots: list[str] = []
+        self.scan_index: Optional[int] = None
+        self.marked: set[int] = set()
+
+        self.tree.bind("<Configure>", self._on_configure)
+        # Every scroll goes through scroll_to; "break" keeps the Treeview
+        # class bindings from also scrolling the slot pool internally
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_break(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_break(3))
+        self.tree.bind("<Up>", lambda e: self._scroll_break(-1))
+        self.tree.bind("<Down>", lambda e: self._scroll_break(1))
+        self.tree.bind("<Prior>", lambda e: self._scroll_break(-self._rows))
+        self.tree.bind("<Next>", lambda e: self._scroll_break(self._rows))
+        self.tree.bind("<Home>", lambda e: self._scroll_break(-len(self._names)))
+        self.tree.bind("<End>", lambda e: self._scroll_break(len(self._names)))
+
+    # ----- Treeview passthrough -----
+    def heading(self, *args, **kw):
+        return self.tree.heading(*args, **kw)
+
+    def column(self, *args, **kw):
+        return self.tree.column(*args, **kw)
+
+    def tag_configure(self, *args, **kw):
+        return self.tree.tag_configure(*args, **kw)
+
+    # ----- data -----
+    def set_source(self, names: Sequence[str], counter: Callable[[int], int]) -> None:
+        """Show *names*; *counter(i)* supplies the counter of row *i*."""
+        self._names = names
+        self._counter = counter
+        self._top = 0
+        self.scan_index = None
+        self.marked.clear()
+        self._sync_slots()
+        self.refresh()
+        self.after_idle(lambda: self._measure(self.tree.winfo_height()))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    # ----- highlights -----
+    def set_scan(self, idx: Optional[int]) -> None:
+        """Move the yellow scan highlight to *idx* (None removes it)."""
+        old, self.scan_index = self.scan_index, idx
+        if old is not None:
+            self.refresh_index(old)
+        if idx is not None:
+            self.refresh_index(idx)
+
+    def set_marked(self, idx: int, on: bool = True) -> None:
+        """Toggle the green winner highlight of *idx*."""
+        if on:
+            self.marked.add(idx)
+        else:
+            self.marked.discard(idx)
+        self.refresh_index(idx)
+
+    def move_row(self, src: int, dst: int) -> None:
+        """Row *src* replaced the removed row *dst* (swap-remove)."""
+        self.marked.discard(dst)
+        if src in self.marked:
+            self.marked.discard(src)
+            self.marked.add(dst)
+        if self.scan_index in (src, dst):
+            self.scan_index = None
+
+    def rows_changed(self) -> None:
+        """Rows were added or removed in the source; O(visible rows)."""
+        self._sync_slots()
+        self.refresh()
+
+    def clear_marks(self) -> None:
+        self.marked.clear()
+        self.scan_index = None
+        self.refresh()
+
+    def _tag(self, idx: int) -> str:
+        if idx == self.scan_index:
+            return "scan"
+        return "winner" if idx in self.marked else "normal"
+
+    # ----- rendering -----
+    def refresh(self) -> None:
+        """Re-render all visible rows (O(visible rows))."""
+        for j, iid in enumerate(self._slots):
+            self._render(iid, self._top + j)
+        self._update_scrollbar()
+
+    def refresh_index(self, idx: int) -> None:
+        """Re-render row *idx* if it is currently visible."""
+        j = idx - self._top
+        if 0 <= j < len(self._slots):
+            self._render(self._slots[j], idx)
+
+    def _render(self, iid: str, idx: int) -> None:
+        if idx < len(self._names):
+            self.tree.item(
+                iid, values=(self._names[idx], self._counter(idx)), tags=(self._tag(idx),)
+            )
+        else:
+            self.tree.item(iid, values=("", ""), tags=("normal",))
+
+    def _sync_slots(self) -> None:
+        """Create or delete slot items to match the visible row count."""
+        want = min(len(self._names), self._rows + self.OVERSCAN)
+        while len(self._slots) < want:
+            iid = f"slot-{len(self._slots)}"
+            self.tree.insert("", "end", iid=iid, tags=("normal",))
+            self._slots.append(iid)
+        while len(self._slots) > want:
+            self.tree.delete(self._slots.pop())
+        self._top = max(0, min(self._top, len(self._names) - self._rows))
+
+    def _update_scrollbar(self) -> None:
+        n = len(self._names)
+        if n <= self._rows:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self._top / n, min(1.0, (self._top + self._rows) / n))
+
+    # ----- scrolling -----
+    def see(self, idx: int) -> None:
+        """Scroll minimally so that row *idx* is visible."""
+        if idx < self._top:
+            self.scroll_to(idx)
+        elif idx >= self._top + self._rows:
+            self.scroll_to(idx - self._rows + 1)
+
+    def scroll_to(self, top: int) -> None:
+        top = max(0, min(int(top), len(self._names) - self._rows))
+        if top != self._top:
+            self._top = top
+            self.refresh()
+
+    def scroll(self, rows: int) -> None:
+        self.scroll_to(self._top + rows)
+
+    def _on_scrollbar(self, action: str, amount: str, unit: str = "units") -> None:
+        if action == "moveto":
+            self.scroll_to(round(float(amount) * len(self._names)))
+        elif action == "scroll":
+            step = self._rows if unit == "pages" else 1
+            self.scroll(int(amount) * step)
+
+    def _on_mousewheel(self, event) -> str:
+        return self._scroll_break(-3 if event.delta > 0 else 3)
+
+    def _scroll_break(self, rows: int) -> str:
+        self.scroll(rows)
+        return "break"
+
+    def _on_configure(self, event) -> None:
+        self._measure(event.height)
+
+    def _measure(self, height: int) -> None:
+        """Derive the visible row count from the real row geometry."""
+        bbox = self.tree.bbox(self._slots[0]) if self._slots else ""
+        if bbox:
+            _, y, _, h = bbox
+            rows = max(1, (height - y) // max(1, h))
+        else:
+            rows = self._rows
+        if rows != self._rows:
+            self._rows = rows
+            self._sync_slots()
+            self.refresh()
+        # Slots never scroll inside the Treeview itself
+        self.tree.yview_moveto(0)
 
 
 # ============================================================
@@ -103,8 +765,25 @@ class GluecksradApp(tk.Tk):
         self.geometry("740x620")
         self.minsize(500, 400)
 
-        self.df: Optional[pd.DataFrame] = None
+        # Names plus the counters as last read from / written to the file;
+        # the latter tell external edits from our own unsaved picks
+        self.roster: Optional[Roster] = None
         self.xls_path: Optional[Path] = None
+        # Picks are journalled; the workbook is rewritten only on compaction
+        self.journal: Optional[DrawJournal] = None
+        # Fairness state (counters, batch exclusions) lives in the engine;
+        # the file counters in the roster are only updated by saves.
+        self.engine = FairnessEngine()
+        # Counter changes not yet shown in the list, flushed in after_idle
+        self._view_changes = self.engine.track()
+        self._view_flush_pending = False
+        # Backend of the loaded roster (Excel, CSV, SQLite – see open_storage)
+        self.storage: Optional[RosterStorage] = None
+        # Parsed rosters of unchanged files are reloaded from here
+        self.cache = RosterCache()
+        # Counter changes not yet saved; backends that can (.xlsx, SQLite)
+        # write only these entries on compaction
+        self._save_changes = self.engine.track()
 
         # ----- Configurable animation parameters -----
         self.SPIN_FAST_MS = 18            # start delay per step (smaller = faster)
@@ -112,8 +791,35 @@ class GluecksradApp(tk.Tk):
         self.SPIN_GROW = 1.12             # multiplicative delay growth (>1.0)
         self.SPIN_ROUNDS = 3              # fast full passes over eligible list
         self.SPIN_ROLLOUT_FACTOR = 1.5    # rollout length ≈ factor × len(eligible)
+        self.SPIN_DURATION_MS = 0         # fixed spin duration (0 = use rounds/rollout)
         self.BLINK_TIMES = 3              # winner blink pairs
         self.BLINK_MS = 180               # ms per blink toggle
+        self.WEIGHT_BASE = 2.0            # weighted mode: chance ∝ base^-counter
+        self.SPIN_WINDOW = 64             # weighted mode: rows spun around a winner off the minimum
+        self.JOURNAL_COMPACT_EVERY = 500  # journalled picks before the workbook is rewritten
+        self.WATCH_INTERVAL_MS = 1000     # file watcher poll interval
+        self.watch_file = tk.BooleanVar(self, value=True)
+        # Draw strategy by name (see gluecksrad_engine.STRATEGIES): "fair"
+        # lowest counter only, "weighted" chance decays with the counter,
+        # "deck" a shuffled deck dealt once per cycle
+        self.strategies: dict[str, DrawStrategy] = {name: cls() for name, cls in STRATEGIES.items()}
+        self.strategies["weighted"].base = self.WEIGHT_BASE
+        self.draw_mode = tk.StringVar(self, value="fair")
+        self.draw_mode.trace_add("write", lambda *_: self._on_draw_mode_changed())
+        # Deck position of the loaded roster (<roster>.deck), persisted by
+        # the save worker; _deck_pending is the latest unwritten state
+        self.deck_file: Optional[DeckFile] = None
+        self._deck_saved_version: Optional[int] = None
+        self._deck_pending: Optional[tuple[str, object]] = None
+        self._deck_lock = threading.Lock()
+
+        # Hot-path timings, shown in the "Performance …" dialog
+        self.perf = PerfRecorder()
+        self.perf_enabled = tk.BooleanVar(self, value=True)
+        self.perf_enabled.trace_add(
+            "write", lambda *_: setattr(self.perf, "enabled", self.perf_enabled.get())
+        )
+        self._perf_dlg: Optional[tk.Toplevel] = None
 
         self._build_ui()
         self._make_styles()
@@ -121,15 +827,38 @@ class GluecksradApp(tk.Tk):
 
         # ----- Animation / round state -----
         self.anim_running: bool = False
-        self.current_highlight_row: Optional[str] = None
         self.to_draw_total: int = 0
         self.drawn_count: int = 0
-        # BUG-FIX V2: store pending `after` ids so we can cancel on reload/close
-        self._pending_after_ids: list[str] = []
+        # Winners of the current batch, decided up front by the strategy
+        self.batch_winners: list[int] = []
+        # BUG-FIX V2: track pending `after` ids so we can cancel on reload/close
+        self.timers = TimerRegistry(self)
+        # Spin and blink frames run against absolute deadlines
+        self.clock = AnimationClock(self._safe_after)
+        # Compaction and database commits run off the Tk thread
+        self.saver = SaveWorker(self.timers)
+        self._compacting = False
+        self._compact_again = False
+        # Database picks not yet committed, drained by the save worker
+        self._db_picks: list[int] = []
+        self._db_lock = threading.Lock()
 
         # Track picks within the current multi-pick round
         self.round_selected_idx: set[int] = set()
-        self.round_excluded_idx: set[int] = set()
+
+        # Background loading: worker thread → queue → _poll_load
+        self.loading: bool = False
+        self._load_cancel = threading.Event()
+
+        # File watching: bumped on every roster change; a merge computed against an older
+        # generation is discarded
+        self._roster_generation = 0
+        self._merging = False
+        self._watch_pending: Optional[tuple[int, int]] = None
+        self._watch_failed: Optional[tuple[int, int]] = None
+
+        # Filled in by run() once the window is painted
+        self.startup_times: dict[str, float] = {}
 
         # Properly handle window close
         self.protocol("WM_DELETE_WINDOW", self._on_close)
@@ -137,24 +866,31 @@ class GluecksradApp(tk.Tk):
     # ================================================================
     # Safe `after` wrapper – keeps track of pending callbacks
     # ================================================================
-    def _safe_after(self, ms: int, func) -> str:
-        """Schedule *func* after *ms* and track the id for cancellation."""
-        aid = self.after(ms, func)
-        self._pending_after_ids.append(aid)
-        return aid
-
-    def _cancel_pending(self) -> None:
-        """Cancel all scheduled `after` callbacks."""
-        for aid in self._pending_after_ids:
-            try:
-                self.after_cancel(aid)
-            except (tk.TclError, ValueError):
-                pass
-        self._pending_after_ids.clear()
+    def _safe_after(self, ms: int, func, group: str = "draw") -> str:
+        """Schedule *func* after *ms* in timer *group* ("draw", "blink", …)."""
+        return self.timers.after(ms, func, group)
+
+    def _cancel_pending(self, *groups: str) -> None:
+        """Cancel scheduled `after` callbacks of *groups* (default: all)."""
+        if groups:
+            for group in groups:
+                self.timers.cancel_group(group)
+        else:
+            self.timers.cancel_all()
 
     def _on_close(self) -> None:
         """Graceful shutdown: cancel animations, then destroy."""
+        log.debug("Closing with %d live timer(s): %s", len(self.timers), self.timers.counts())
+        self._load_cancel.set()
+        self.clock.cancel()
         self._cancel_pending()
+        # An interrupted batch stays in the journal and is offered on restart
+        if self.journal is not None and not self.journal.batch_open:
+            self._compact()
+        # Wait for queued saves so no round is lost
+        self.saver.close()
+        self._close_journal()
+        self._close_storage()
         self.destroy()
 
     # ================================================================
@@ -164,24 +900,22 @@ class GluecksradApp(tk.Tk):
         topbar = ttk.Frame(self)
         topbar.pack(side=tk.TOP, fill=tk.X, padx=8, pady=8)
 
-        ttk.Button(topbar, text="Excel laden …", command=self.on_load_excel).pack(side=tk.LEFT)
+        self.btn_load = ttk.Button(topbar, text="Liste laden …", command=self.on_load_excel)
+        self.btn_load.pack(side=tk.LEFT)
         self.path_label = ttk.Label(topbar, text="Keine Datei geladen")
         self.path_label.pack(side=tk.LEFT, padx=10)
 
         middle = ttk.Frame(self)
         middle.pack(fill=tk.BOTH, expand=True, padx=8, pady=(0, 8))
 
+        # IMPROVEMENT: virtualised list – only visible rows exist as items
         columns = ("Name", "Counter")
-        self.tree = ttk.Treeview(middle, columns=columns, show="headings", height=18)
+        self.tree = VirtualTree(middle, columns=columns, height=18)
         self.tree.heading("Name", text="Name")
         self.tree.heading("Counter", text="Gezogen")
         self.tree.column("Name", width=480, anchor=tk.W)
         self.tree.column("Counter", width=120, anchor=tk.CENTER)
-        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-        scrollbar = ttk.Scrollbar(middle, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(fill=tk.BOTH, expand=True)
 
         control = ttk.Frame(self)
         control.pack(fill=tk.X, padx=8, pady=(0, 8))
@@ -208,6 +942,14 @@ class GluecksradApp(tk.Tk):
         )
         self.btn_reload.pack(side=tk.LEFT, padx=(10, 0))
 
+        # Progress row, only shown while a file loads in the background
+        self.load_frame = ttk.Frame(self)
+        self.load_progress = ttk.Progressbar(self.load_frame, mode="indeterminate", maximum=100)
+        self.load_progress.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        ttk.Button(self.load_frame, text="Abbrechen", command=self.on_cancel_load).pack(
+            side=tk.LEFT, padx=(10, 0)
+        )
+
         self.status = ttk.Label(self, text="Bereit.")
         self.status.pack(fill=tk.X, padx=8, pady=(0, 8))
 
@@ -219,8 +961,20 @@ class GluecksradApp(tk.Tk):
     def _build_menubar(self) -> None:
         menubar = tk.Menu(self)
 
+        menu_file = tk.Menu(menubar, tearoff=False)
+        menu_file.add_command(label="Sicherungskopie speichern …", command=self.on_snapshot)
+        menu_file.add_command(label="Roster-Cache leeren", command=self.on_clear_cache)
+        menubar.add_cascade(label="Datei", menu=menu_file)
+
         menu_settings = tk.Menu(menubar, tearoff=False)
         menu_settings.add_command(label="Spin-Parameter …", command=self.open_config_dialog)
+        menu_settings.add_command(label="Performance …", command=self.open_perf_dialog)
+        menu_settings.add_separator()
+        for name, strategy in self.strategies.items():
+            menu_settings.add_radiobutton(label=strategy.label, variable=self.draw_mode, value=name)
+        menu_settings.add_separator()
+        menu_settings.add_checkbutton(label="Datei auf Änderungen überwachen", variable=self.watch_file)
+        menu_settings.add_checkbutton(label="Leistungsmessung aktiv", variable=self.perf_enabled)
         menubar.add_cascade(label="Einstellungen", menu=menu_settings)
 
         menu_help = tk.Menu(menubar, tearoff=False)
@@ -265,8 +1019,10 @@ class GluecksradApp(tk.Tk):
         e_grow = field("Verzögerungsfaktor (>1.0):", self.SPIN_GROW)
         e_rounds = field("Spin-Runden:", self.SPIN_ROUNDS)
         e_roll = field("Ausroll-Faktor:", self.SPIN_ROLLOUT_FACTOR)
+        e_dur = field("Spin-Dauer (ms, 0 = nach Runden):", self.SPIN_DURATION_MS)
         e_blink = field("Blinkanzahl:", self.BLINK_TIMES)
         e_bms = field("Blinktempo (ms):", self.BLINK_MS)
+        e_base = field("Gewichtungsbasis (>1.0):", self.WEIGHT_BASE)
 
         row += 1
         btns = ttk.Frame(frm)
@@ -280,8 +1036,11 @@ class GluecksradApp(tk.Tk):
                 self.SPIN_GROW = max(1.01, float(e_grow.get()))
                 self.SPIN_ROUNDS = max(0, int(e_rounds.get()))
                 self.SPIN_ROLLOUT_FACTOR = max(0.0, float(e_roll.get()))
+                self.SPIN_DURATION_MS = max(0, int(float(e_dur.get())))
                 self.BLINK_TIMES = max(0, int(e_blink.get()))
                 self.BLINK_MS = max(20, int(e_bms.get()))
+                self.WEIGHT_BASE = max(1.01, float(e_base.get()))
+                self.strategies["weighted"].base = self.WEIGHT_BASE
             except Exception as ex:
                 messagebox.showerror("Fehler", str(ex))
                 return
@@ -292,6 +1051,99 @@ class GluecksradApp(tk.Tk):
         for c in (0, 1):
             frm.grid_columnconfigure(c, weight=1)
 
+    # ================================================================
+    # Performance dialog
+    # ================================================================
+    def perf_report(self) -> dict:
+        """Timings plus the context needed to read them (for JSON export)."""
+        report = self.perf.as_dict()
+        report["animation"] = self.clock.total.as_dict()
+        report["startup"] = self.startup_times
+        report["roster"] = {
+            "file": str(self.xls_path) if self.xls_path is not None else None,
+            "backend": self.storage.name if self.storage is not None else None,
+            "entries": len(self.roster) if self.roster is not None else 0,
+            "journalled_picks": self.journal.picks if self.journal is not None else 0,
+        }
+        report["timers"] = self.timers.counts()
+        return report
+
+    def open_perf_dialog(self) -> None:
+        """Live table of the phase timings; not modal, so draws can run."""
+        if self._perf_dlg is not None and self._perf_dlg.winfo_exists():
+            self._perf_dlg.lift()
+            return
+        dlg = self._perf_dlg = tk.Toplevel(self)
+        dlg.title("Performance")
+
+        frm = ttk.Frame(dlg, padding=12)
+        frm.pack(fill=tk.BOTH, expand=True)
+
+        columns = ("count", "mean", "p50", "p95", "max", "total")
+        table = ttk.Treeview(frm, columns=columns, height=len(PerfRecorder.STAGES), selectmode="none")
+        table.heading("#0", text="Phase")
+        table.column("#0", width=170, anchor=tk.W)
+        for col, text in zip(columns, ("Anzahl", "Mittel ms", "p50 ms", "p95 ms", "Max ms", "Summe ms")):
+            table.heading(col, text=text)
+            table.column(col, width=80, anchor=tk.E)
+        for stage, label in PerfRecorder.STAGES.items():
+            table.insert("", "end", iid=stage, text=label)
+        table.pack(fill=tk.BOTH, expand=True)
+
+        frames_label = ttk.Label(frm)
+        frames_label.pack(fill=tk.X, pady=(8, 0))
+
+        def update() -> None:
+            for stage, h in self.perf.hists.items():
+                d = h.as_dict()
+                table.item(stage, values=(
+                    d["count"], f"{d['mean_ms']:.2f}", f"{d['p50_ms']:.2f}",
+                    f"{d['p95_ms']:.2f}", f"{d['max_ms']:.2f}", f"{d['total_ms']:.0f}",
+                ))
+            a = self.clock.total
+            n = max(1, a.frames)
+            frames_label.config(
+                text=f"Animation: {a.frames} Frames, {a.skipped} übersprungen, "
+                f"Verspätung Ø {1000.0 * a.late_sum / n:.1f} ms / max {1000.0 * a.late_max:.1f} ms"
+                + ("" if self.perf.enabled else "  –  Messung ausgeschaltet")
+            )
+
+        def tick() -> None:
+            if dlg.winfo_exists():
+                update()
+                self._safe_after(1000, tick, "perf")
+
+        def reset() -> None:
+            self.perf.reset()
+            self.clock.total = FrameStats()
+            update()
+
+        def export() -> None:
+            dest = filedialog.asksaveasfilename(
+                parent=dlg, title="Messwerte exportieren",
+                initialfile="gluecksrad_performance.json", defaultextension=".json",
+                filetypes=[("JSON", "*.json")],
+            )
+            if not dest:
+                return
+            import json
+
+            try:
+                Path(dest).write_text(
+                    json.dumps(self.perf_report(), indent=2, ensure_ascii=False), encoding="utf-8"
+                )
+            except OSError as e:
+                messagebox.showerror("Speicherfehler", str(e), parent=dlg)
+
+        btns = ttk.Frame(frm)
+        btns.pack(fill=tk.X, pady=(10, 0))
+        ttk.Button(btns, text="Schließen", command=dlg.destroy).pack(side=tk.RIGHT, padx=(10, 0))
+        ttk.Button(btns, text="Als JSON exportieren …", command=export).pack(side=tk.RIGHT, padx=(10, 0))
+        ttk.Button(btns, text="Zurücksetzen", command=reset).pack(side=tk.RIGHT)
+
+        dlg.bind("<Destroy>", lambda e: e.widget is dlg and self._cancel_pending("perf"))
+        tick()
+
     # ================================================================
     # Excel loading / reloading
     # ================================================================
@@ -300,10 +1152,14 @@ class GluecksradApp(tk.Tk):
         if self.anim_running:
             messagebox.showwarning("Bitte warten", "Bitte warten, bis die aktuelle Ziehung beendet ist.")
             return
+        if self.loading:
+            return
 
+        # The backend follows the file type (see open_storage)
+        patterns = {cls.label: " ".join("*" + s for s in cls.suffixes) for cls in STORAGE_BACKENDS.values()}
         file_path = filedialog.askopenfilename(
-            title="Excel mit Namensliste auswählen",
-            filetypes=[("Excel-Dateien", "*.xlsx *.xls")],
+            title="Namensliste auswählen",
+            filetypes=[("Namenslisten", " ".join(patterns.values())), *patterns.items()],
         )
         if not file_path:
             return
@@ -314,58 +1170,503 @@ class GluecksradApp(tk.Tk):
         if self.anim_running:
             messagebox.showwarning("Bitte warten", "Bitte warten, bis die aktuelle Ziehung beendet ist.")
             return
-        if self.xls_path is None:
+        if self.xls_path is None or self.loading:
             return
-        self._load_file(self.xls_path)
+        self._load_file(self.xls_path, self.storage.name if self.storage is not None else None)
+
+    def on_cancel_load(self) -> None:
+        if self.loading:
+            self._load_cancel.set()
+            self.status.config(text="Laden wird abgebrochen …")
+
+    def _load_file(self, path: Path, backend: Optional[str] = None) -> None:
+        """Parse *path* on a worker thread; the UI stays responsive.
+
+        *backend* names a storage backend; by default the file type decides.
+        The worker only talks to the Tk thread through a queue of
+        ("progress", rows, fraction) / ("done", roster, storage) / ("error", exc) /
+        ("cancelled",) messages, polled by _poll_load.
+        """
+        if self.loading:
+            return
+        self.loading = True
+        self._load_cancel = threading.Event()
+        cancel = self._load_cancel
+        q: "queue.Queue[tuple]" = queue.Queue()
 
-    def _load_file(self, path: Path) -> None:
+        def work() -> None:
+            storage = None
+            try:
+                storage = open_storage(path, backend, self.cache)
+                with self.perf.timed("parse"):
+                    roster = storage.load(
+                        progress=lambda rows, frac: q.put(("progress", rows, frac)),
+                        cancel=cancel.is_set,
+                    )
+            except Exception as e:
+                if storage is not None:
+                    storage.close()
+                q.put(("cancelled",) if isinstance(e, LoadCancelled) else ("error", e))
+            else:
+                q.put(("done", roster, storage))
+
+        self._set_loading_ui(True)
+        self.status.config(text=f"Lade {path.name} …")
+        threading.Thread(target=work, name="load", daemon=True).start()
+        self._safe_after(50, lambda: self._poll_load(q, path), "load")
+
+    def _poll_load(self, q: "queue.Queue[tuple]", path: Path) -> None:
         try:
-            self.df = load_namelist(path)
-        except Exception as e:
-            log.exception("Fehler beim Laden von %s", path)
-            messagebox.showerror("Fehler beim Laden", str(e))
-            return
+            while True:
+                msg = q.get_nowait()
+                if msg[0] == "progress":
+                    _, rows, frac = msg
+                    # Without a known size the bar stays indeterminate
+                    if frac is not None:
+                        if str(self.load_progress["mode"]) != "determinate":
+                            self.load_progress.stop()
+                            self.load_progress.config(mode="determinate")
+                        self.load_progress["value"] = 100.0 * frac
+                    self.status.config(text=f"Lade {path.name} … {rows} Zeilen")
+                    continue
+                self.loading = False
+                self._set_loading_ui(False)
+                if msg[0] == "done":
+                    self._on_loaded(path, msg[1], msg[2])
+                elif msg[0] == "error":
+                    log.error("Fehler beim Laden von %s", path, exc_info=msg[1])
+                    self.status.config(text="Laden fehlgeschlagen.")
+                    messagebox.showerror("Fehler beim Laden", str(msg[1]))
+                else:
+                    self.status.config(text="Laden abgebrochen.")
+                return
+        except queue.Empty:
+            pass
+        self._safe_after(50, lambda: self._poll_load(q, path), "load")
+
+    def _set_loading_ui(self, loading: bool) -> None:
+        """Show the progress row and gate the buttons while loading."""
+        if loading:
+            self.load_progress.config(mode="indeterminate", value=0)
+            self.load_progress.start(15)
+            self.load_frame.pack(fill=tk.X, padx=8, pady=(0, 8), before=self.status)
+            for btn in (self.btn_load, self.btn_draw, self.btn_clear, self.btn_reload):
+                btn.config(state=tk.DISABLED)
+        else:
+            self.load_progress.stop()
+            self.load_frame.pack_forget()
+            self.btn_load.config(state=tk.NORMAL)
+            if self.roster is not None:
+                for btn in (self.btn_draw, self.btn_clear, self.btn_reload):
+                    btn.config(state=tk.NORMAL)
+
+    def _on_loaded(self, path: Path, roster: Roster, storage: RosterStorage) -> None:
+        # Saves of the previous roster still use its storage and journal
+        self.saver.flush()
+        self._close_journal()
+        self._close_storage()
+        self.roster = roster
+        self.engine.reset(roster.counters)
+        # The file matches the engine now; replayed picks count as changes
+        self._save_changes.drain()
+        self._roster_generation += 1
+        self.storage = storage
         self.xls_path = path
+        pending = None
+        if storage.journalled:
+            # Re-apply picks that were journalled but not yet written back
+            self.journal = DrawJournal(path)
+            try:
+                pending = self.journal.replay(self.roster.names, self.engine)
+            except (OSError, ValueError, KeyError) as e:
+                log.exception("Journal von %s nicht lesbar", path)
+                messagebox.showerror("Journalfehler", str(e))
+            if self.journal.picks:
+                log.info("Replayed %d journalled pick(s) for %s", self.journal.picks, path)
+        self._load_deck(path)
         self.path_label.config(text=str(self.xls_path.name))
         self.populate_tree()
         self.btn_draw.config(state=tk.NORMAL)
         self.btn_clear.config(state=tk.NORMAL)
         self.btn_reload.config(state=tk.NORMAL)
         # IMPROVEMENT V2: update Spinbox max to number of entries
-        self.spin_n.config(to=len(self.df))
-        self.status.config(text=f"Geladen: {len(self.df)} Einträge aus {self.xls_path.name}")
-        log.info("Loaded %d names from %s", len(self.df), path)
+        self.spin_n.config(to=len(roster))
+        self.status.config(text=f"Geladen: {len(roster)} Einträge aus {self.xls_path.name}")
+        log.info("Loaded %d names from %s%s", len(roster), path, " (cache)" if storage.from_cache else "")
+        self._start_watch()
+        if pending is not None:
+            self._offer_resume(*pending)
+
+    # ================================================================
+    # Journal / persistence
+    # ================================================================
+    def _journal_write(self, op: str, *args) -> None:
+        """Call journal method *op*; write errors are reported, not raised."""
+        if self.journal is None:
+            return
+        try:
+            getattr(self.journal, op)(*args)
+        except OSError as e:
+            log.exception("Journalfehler")
+            messagebox.showerror("Speicherfehler", str(e))
+
+    def _persist_pick(self, idx: int) -> None:
+        """Record a pick: journalled for file backends, committed for databases."""
+        with self.perf.timed("persist"):
+            if self.journal is not None:
+                self._journal_write("pick", idx, self.roster.names[idx])
+            elif self.storage is not None:
+                # Committed by the save worker; picks queued meanwhile go
+                # into the same job
+                with self._db_lock:
+                    self._db_picks.append(idx)
+                self._save_changes.drain()
+                self.saver.submit(self._commit_db_picks(self.storage), self._on_saved, "db-picks")
+
+    def _commit_db_picks(self, storage: RosterStorage) -> Callable[[], None]:
+        def job() -> None:
+            with self._db_lock:
+                picks, self._db_picks = self._db_picks, []
+            for idx in picks:
+                storage.apply_winner(idx)
+        return job
+
+    def _on_saved(self, error: Optional[Exception]) -> None:
+        """Report the outcome of a background save (Tk thread)."""
+        if error is not None:
+            messagebox.showerror("Speicherfehler", str(error))
+
+    def _compact(self) -> None:
+        """Write all journalled picks back to the file on the save worker.
+
+        The Tk thread only snapshots the counters; draws may continue while
+        the file is written, their picks are carried into the new journal.
+        Requests during a running compaction coalesce into one more.
+        """
+        if self.journal is None or self.storage is None or self.roster is None:
+            return
+        if not self.journal.picks:
+            return
+        if self._compacting:
+            self._compact_again = True
+            return
+        # A normalisation shift changes every displayed counter
+        indices, offset_changed = self._save_changes.drain()
+        counters = self.engine.counters()
+        names = list(self.roster.names)
+        storage, journal = self.storage, self.journal
+        try:
+            journal.checkpoint()
+        except OSError as e:
+            self._restore_save_changes(indices, offset_changed)
+            log.exception("Journalfehler")
+            messagebox.showerror("Speicherfehler", str(e))
+            return
+        self._compacting = True
+
+        def job() -> None:
+            with self.perf.timed("save"):
+                storage.save(
+                    names, counters, None if offset_changed else indices,
+                    before_replace=journal.mark_compacting,
+                )
+            journal.reset(carry=True)
+
+        def done(error: Optional[Exception]) -> None:
+            self._compacting = False
+            if error is None:
+                log.info("Saved to %s", storage.path)
+                if storage is self.storage:
+                    self.roster.counters = array("q", counters)
+            else:
+                # Keep the changes for the next attempt
+                journal.drop_checkpoint()
+                if storage is self.storage:
+                    self._restore_save_changes(indices, offset_changed)
+                self._on_saved(error)
+            if self._compact_again:
+                self._compact_again = False
+                self._compact()
+
+        self.saver.submit(job, done)
+
+    def _restore_save_changes(self, indices: Iterable[int], offset_changed: bool) -> None:
+        if offset_changed:
+            self._save_changes.mark_offset()
+        for i in indices:
+            self._save_changes.mark(i)
+
+    def _close_storage(self) -> None:
+        if self.storage is not None:
+            self.storage.close()
+            self.storage = None
+
+    def on_snapshot(self) -> None:
+        """Save a copy of the roster, including all picks so far."""
+        if self.storage is None or self.xls_path is None:
+            messagebox.showinfo("Sicherungskopie", "Keine Datei geladen.")
+            return
+        if self.anim_running:
+            messagebox.showwarning("Bitte warten", "Bitte warten, bis die aktuelle Ziehung beendet ist.")
+            return
+        dest = filedialog.asksaveasfilename(
+            title="Sicherungskopie speichern",
+            initialfile=f"{self.xls_path.stem}_Sicherung{self.xls_path.suffix}",
+            defaultextension=self.xls_path.suffix,
+        )
+        if not dest:
+            return
+        # The copy is taken after all queued saves, including this compaction
+        self.saver.flush()
+        self._compact()
+        storage = self.storage
+
+        def done(error: Optional[Exception]) -> None:
+            if error is not None:
+                messagebox.showerror("Speicherfehler", str(error))
+            else:
+                self.status.config(text=f"Sicherungskopie gespeichert: {Path(dest).name}")
+
+        self.saver.submit(lambda: storage.snapshot(Path(dest)), done)
+
+    def on_clear_cache(self) -> None:
+        """Drop all cached parses; the next load of every file parses it again."""
+        try:
+            self.cache.clear()
+        except OSError as e:
+            messagebox.showerror("Cache", str(e))
+            return
+        self.status.config(text="Roster-Cache geleert.")
+
+    def _close_journal(self) -> None:
+        if self.journal is not None:
+            try:
+                self.journal.close()
+            except OSError:
+                log.exception("Journalfehler")
+            self.journal = None
+
+    def _load_deck(self, path: Path) -> None:
+        """Continue the shuffle deck saved for *path*, if there is one."""
+        self.strategies["deck"] = deck = ShuffleDeck()
+        self.deck_file = DeckFile(path)
+        self._deck_pending = None
+        try:
+            saved = self.deck_file.read()
+        except OSError:
+            log.exception("Kartenstapel von %s nicht lesbar", path)
+            saved = None
+        if saved is not None and len(self.roster):
+            deck.restore(self.engine, self.roster.names, *saved)
+        self._deck_saved_version = deck.version
+
+    def _save_deck(self) -> None:
+        """Persist the deck on the save worker: in full if it changed, else its position."""
+        deck = self.strategies["deck"]
+        if self.deck_file is None or deck.level is None:
+            return
+        with self._deck_lock:
+            pending = self._deck_pending
+            if deck.version != self._deck_saved_version or (pending is not None and pending[0] == "write"):
+                # A full write that is still waiting takes the new position
+                self._deck_pending = ("write", deck.state(self.roster.names))
+                self._deck_saved_version = deck.version
+            else:
+                self._deck_pending = ("advance", deck.pos)
+        self.saver.submit(self._write_deck(self.deck_file), self._on_saved, "deck")
+
+    def _on_draw_mode_changed(self) -> None:
+        """Leaving the deck mode ends its cycle; the saved position is dropped."""
+        if self.draw_mode.get() == "deck" or self.strategies["deck"].level is None:
+            return
+        self.strategies["deck"] = deck = ShuffleDeck()
+        self._deck_saved_version = deck.version
+        if self.deck_file is not None:
+            with self._deck_lock:
+                self._deck_pending = None
+            self.saver.submit(self.deck_file.remove, self._on_saved)
+
+    def _write_deck(self, deck_file: DeckFile) -> Callable[[], None]:
+        def job() -> None:
+            with self._deck_lock:
+                pending, self._deck_pending = self._deck_pending, None
+            if pending is not None:
+                op, arg = pending
+                getattr(deck_file, op)(arg)
+        return job
+
+    def _offer_resume(self, planned: list[int], picked: list[int]) -> None:
+        """Continue a batch that was interrupted by a crash or close."""
+        remaining = len(planned) - len(picked)
+        if remaining > 0 and messagebox.askyesno(
+            "Unterbrochene Ziehung",
+            f"Die letzte Ziehung wurde nach {len(picked)} von {len(planned)} "
+            "Gewinnern unterbrochen.\nFortsetzen?",
+        ):
+            self.to_draw_total = len(planned)
+            self.drawn_count = len(picked)
+            self.batch_winners = planned
+            self.round_selected_idx = set(picked)
+            for idx in picked:
+                self.tree.set_marked(idx, True)
+            self.status.config(text=f"Setze Ziehung fort ({remaining} verbleibend) …")
+            self.btn_draw.config(state=tk.DISABLED)
+            self.anim_running = True
+            self.draw_next_one()
+            return
+        self._journal_write("end_batch")
+        self.engine.clear_batch()
+
+    # ================================================================
+    # File watching
+    # ================================================================
+    def _start_watch(self) -> None:
+        self._cancel_pending("watch")
+        self._watch_pending = self._watch_failed = None
+        if self.storage is not None and self.storage.file_id is not None:
+            self._safe_after(self.WATCH_INTERVAL_MS, self._watch_tick, "watch")
+
+    def _watch_tick(self) -> None:
+        """Poll size/mtime of the loaded file – O(1) per tick."""
+        self._safe_after(self.WATCH_INTERVAL_MS, self._watch_tick, "watch")
+        storage = self.storage
+        if (
+            not self.watch_file.get() or storage is None or storage.file_id is None
+            or self.anim_running or self.loading or self._merging or self.saver.busy
+        ):
+            return
+        try:
+            st = storage.path.stat()
+        except OSError:
+            return  # being replaced right now – look again next tick
+        file_id = (st.st_size, st.st_mtime_ns)
+        if file_id == storage.file_id or file_id == self._watch_failed:
+            self._watch_pending = None
+            return
+        # Editors save in several steps; merge once the file stopped changing
+        if file_id != self._watch_pending:
+            self._watch_pending = file_id
+            return
+        self._watch_pending = None
+        self._merge_external(storage, file_id)
+
+    def _merge_external(self, storage: RosterStorage, file_id: tuple[int, int]) -> None:
+        """Re-read the file on a worker thread and diff it against the roster."""
+        self._merging = True
+        generation = self._roster_generation
+        old = self.roster.copy()
+        fresh = open_storage(storage.path, storage.name, self.cache)
+        q: "queue.Queue[tuple]" = queue.Queue()
+
+        def work() -> None:
+            try:
+                names, counters, layout = fresh.read()
+                diff = diff_roster(
+                    old.names, old.counters, names, counters,
+                    layout.rows if layout is not None else None,
+                )
+            except Exception as e:
+                q.put(("error", e))
+            else:
+                q.put(("done", diff))
+
+        def poll() -> None:
+            try:
+                msg = q.get_nowait()
+            except queue.Empty:
+                self._safe_after(50, poll, "watch")
+                return
+            self._merging = False
+            if msg[0] == "error":
+                # Probably mid-save or not a valid roster; wait for the next change
+                log.warning("Geänderte Datei %s nicht lesbar: %s", storage.path, msg[1])
+                self._watch_failed = file_id
+            elif (
+                generation != self._roster_generation or self.storage is not storage
+                or self.anim_running or self.saver.busy
+            ):
+                log.info("Roster changed during merge; retrying")
+            else:
+                self._apply_merge(fresh, msg[1])
+
+        threading.Thread(target=work, name="merge", daemon=True).start()
+        self._safe_after(50, poll, "watch")
+
+    def _apply_merge(self, fresh: RosterStorage, diff: RosterDiff) -> None:
+        """Apply external edits in O(size of the change); other rows keep their state."""
+        roster = self.roster
+        for i, c in diff.changed:
+            self.engine.set_counter(i, c)
+            roster.counters[i] = c
+        deck = self.strategies["deck"]
+        for i in diff.removed:
+            last = self.engine.remove(i)
+            deck.remove(i, last)
+            roster.remove(i)
+            self.tree.move_row(last, i)
+        for name, c in diff.added:
+            deck.insert(self.engine, self.engine.append(c))
+            roster.append(name, c)
+        self._save_deck()
+        fresh.remap(diff)
+        self._close_storage()
+        self.storage = fresh
+        self._roster_generation += 1
+        # Nothing unsaved: let the journal describe the new file version
+        if self.journal is not None and not self.journal.picks:
+            self._journal_write("reset")
+        self.tree.rows_changed()
+        self._schedule_refresh()
+        self.spin_n.config(to=len(roster))
+        if diff:
+            self.status.config(
+                text=f"Externe Änderungen übernommen: {len(diff.added)} neu, "
+                f"{len(diff.removed)} entfernt, {len(diff.changed)} Zähler geändert"
+            )
+        log.info(
+            "Merged external edit of %s: +%d -%d ~%d",
+            fresh.path, len(diff.added), len(diff.removed), len(diff.changed),
+        )
 
     # ================================================================
     # Treeview helpers
     # ================================================================
     def populate_tree(self) -> None:
-        self.tree.delete(*self.tree.get_children())
-        if self.df is None:
-            return
-        for i, row in self.df.iterrows():
-            self.tree.insert(
-                "", "end", iid=f"row-{i}",
-                values=(row["Name"], int(row["Counter"])),
-                tags=("normal",),
-            )
-        self.current_highlight_row = None
+        self._view_changes.drain()
+        if self.roster is None:
+            self.tree.set_source((), self.engine.counter)
+            return
+        with self.perf.timed("populate"):
+            self.tree.set_source(self.roster.names, self.engine.counter)
 
     def refresh_counters(self) -> None:
-        """Update counter values in the tree without full repopulation."""
-        if self.df is None:
+        """Push pending counter changes to the list in one pass.
+
+        Only changed rows are re-rendered; an offset change (normalisation)
+        re-renders the visible window once instead of every row.
+        """
+        self._view_flush_pending = False
+        indices, offset_changed = self._view_changes.drain()
+        if self.roster is None:
             return
-        children = set(self.tree.get_children(""))
-        for i, row in self.df.iterrows():
-            iid = f"row-{i}"
-            if iid in children:
-                self.tree.item(iid, values=(row["Name"], int(row["Counter"])))
+        with self.perf.timed("refresh"):
+            if offset_changed:
+                self.tree.refresh()
+            else:
+                for idx in indices:
+                    self.tree.refresh_index(idx)
+
+    def _schedule_refresh(self) -> None:
+        """Coalesce counter updates into a single after_idle flush."""
+        if not self._view_flush_pending:
+            self._view_flush_pending = True
+            self.timers.after_idle(self.refresh_counters, "view")
 
     # ================================================================
     # Drawing logic
     # ================================================================
     def on_draw_clicked(self) -> None:
-        if self.df is None or self.anim_running:
+        if self.roster is None or self.anim_running or self.loading:
             return
         try:
             n = int(self.spin_n.get())
@@ -377,149 +1678,130 @@ class GluecksradApp(tk.Tk):
             messagebox.showwarning("Eingabe", "Mindestens 1 Person muss gezogen werden.")
             return
 
-        n = min(n, len(self.df))
+        n = min(n, len(self.roster))
         self.to_draw_total = n
         self.drawn_count = 0
+        strategy = self.strategies[self.draw_mode.get()]
+        with self.perf.timed("draw"):
+            self.batch_winners = strategy.draw(self.engine, n)
+        if strategy is self.strategies["deck"]:
+            self._save_deck()
         self.round_selected_idx.clear()
-        self.round_excluded_idx.clear()
+        self.engine.clear_batch()
+        self._journal_write("begin_batch", self.batch_winners, self.roster.names)
         self.status.config(text=f"Ziehe {n} Person(en) …")
         self.btn_draw.config(state=tk.DISABLED)
         self.anim_running = True
         self.draw_next_one()
 
     def draw_next_one(self) -> None:
-        if self.df is None:
+        if self.roster is None:
             self._end_round_early()
             return
 
-        # base eligible set = all with minimal counter
-        elig = eligible_indices(self.df)
-        if not elig:
-            normalize_counters(self.df)
-            elig = eligible_indices(self.df)
+        # Minimal-counter candidates not yet drawn this batch (the engine
+        # falls back to repeats once everyone at the minimum was drawn)
+        with self.perf.timed("eligible"):
+            elig_filtered = self.engine.candidates()
 
-        # BUG-FIX V2 safety: if still empty after normalising, bail out
-        if not elig:
-            log.error("No eligible indices even after normalisation.")
+        # BUG-FIX V2 safety: nothing to draw from, bail out
+        if not elig_filtered:
+            log.error("No eligible indices.")
             self._end_round_early()
             return
 
-        # Exclude indices already selected this batch, if alternatives remain
-        elig_filtered = [i for i in elig if i not in self.round_excluded_idx]
-        if not elig_filtered:
-            # everyone at minimal counter already picked – allow repeats
-            elig_filtered = list(elig)
-
-        winner_idx = random.choice(elig_filtered)
-
-        # Build animation path: fast rounds + rollout ending at winner
-        path: list[int] = []
-        for _ in range(self.SPIN_ROUNDS):
-            path.extend(elig_filtered)
-
-        rollout = max(1, int(len(elig_filtered) * self.SPIN_ROLLOUT_FACTOR))
-        start = random.randrange(len(elig_filtered))
-        cur = start
-        steps = 0
-        # BUG-FIX V2: add a hard upper-bound to prevent infinite loop when
-        # elig_filtered has only 1 element and rollout > 1
-        max_steps = rollout + len(elig_filtered) * 2
-        while True:
-            idx = elig_filtered[cur]
-            path.append(idx)
-            steps += 1
-            if steps >= rollout and idx == winner_idx:
-                break
-            if steps >= max_steps:
-                # Safety exit – append winner explicitly
-                path.append(winner_idx)
-                break
-            cur = (cur + 1) % len(elig_filtered)
-
-        self._animate_scan(path, winner_idx, float(self.SPIN_FAST_MS))
+        # The winner is already decided; the spin only animates it over the
+        # candidates it was drawn from
+        winner_idx = self.batch_winners[self.drawn_count]
+        winner_pos = self.engine.candidate_position(winner_idx)
+        if winner_pos < 0:
+            # Weighted mode: the winner is outside the minimum bucket; spin
+            # over a window of rows around it, not the whole roster
+            size = min(len(self.roster), self.SPIN_WINDOW)
+            lo = max(0, min(winner_idx - size // 2, len(self.roster) - size))
+            elig_filtered, winner_pos = range(lo, lo + size), winner_idx - lo
+
+        # Animation frames are generated lazily; the timed mode keeps the
+        # spin duration independent of the number of candidates
+        if self.SPIN_DURATION_MS > 0:
+            frames = timed_spin_frames(
+                elig_filtered, winner_pos,
+                self.SPIN_DURATION_MS, self.SPIN_FAST_MS, self.SPIN_SLOW_MS, self.SPIN_GROW,
+            )
+        else:
+            frames = classic_spin_frames(
+                elig_filtered, winner_idx, self.SPIN_ROUNDS, self.SPIN_ROLLOUT_FACTOR,
+                self.SPIN_FAST_MS, self.SPIN_SLOW_MS, self.SPIN_GROW,
+            )
+        self._animate_scan(frames, winner_idx)
+
+    def _animate_scan(self, frames: Iterator[tuple[int, float]], winner_idx: int) -> None:
+        """Play the spin frames on the animation clock, then finish the pick."""
+        self.clock.run(
+            ((idx, max(5.0, delay)) for idx, delay in self.perf.timed_iter("path", frames)),
+            self.perf.wrap("frame", self._highlight_scan_row),
+            lambda: self._on_spin_done(winner_idx),
+            "draw",
+        )
 
-    def _animate_scan(self, path: list[int], winner_idx: int, delay: float) -> None:
-        """Recursive animation: highlight each row in *path* with increasing delay."""
-        if not path:
-            self.finish_one_draw(winner_idx)
-            return
-        idx = path.pop(0)
-        self._highlight_scan_row(idx)
-        next_delay = min(delay * self.SPIN_GROW, float(self.SPIN_SLOW_MS))
-        self._safe_after(
-            max(5, int(next_delay)),
-            lambda: self._animate_scan(path, winner_idx, next_delay),
+    def _on_spin_done(self, winner_idx: int) -> None:
+        st = self.clock.last_run
+        log.debug(
+            "Spin: %d frames, %d skipped, max late %.1f ms, overrun %.1f ms",
+            st.frames, st.skipped, st.late_max * 1000, st.overrun * 1000,
         )
+        self.finish_one_draw(winner_idx)
 
     def _highlight_scan_row(self, idx: int) -> None:
-        self._clear_scan_highlight()
-        iid = f"row-{idx}"
-        try:
-            self.tree.item(iid, tags=("scan",))
-            self.tree.see(iid)
-            self.current_highlight_row = iid
-        except tk.TclError:
-            pass
+        self.tree.set_scan(idx)
+        self.tree.see(idx)
 
     def _clear_scan_highlight(self) -> None:
-        if self.current_highlight_row:
-            try:
-                tags = self.tree.item(self.current_highlight_row, "tags")
-                new_tag = "winner" if "winner" in tags else "normal"
-                self.tree.item(self.current_highlight_row, tags=(new_tag,))
-            except tk.TclError:
-                pass
-        self.current_highlight_row = None
+        self.tree.set_scan(None)
 
     # ================================================================
     # Blink & Finish
     # ================================================================
-    def _blink_row(self, iid: str, times_left: int) -> None:
-        if times_left <= 0:
-            try:
-                self.tree.item(iid, tags=("winner",))
-            except tk.TclError:
-                pass
-            return
-        try:
-            cur = self.tree.item(iid, "tags")
-            new_tag = "normal" if "winner" in cur else "winner"
-            self.tree.item(iid, tags=(new_tag,))
-        except tk.TclError:
-            pass
-        self._safe_after(self.BLINK_MS, lambda: self._blink_row(iid, times_left - 1))
+    def _blink_row(self, idx: int, toggles: int, on_done: Callable[[], None]) -> None:
+        """Toggle the winner highlight *toggles* times, then leave it on."""
+        frames = ((k % 2 == 1, float(self.BLINK_MS)) for k in range(toggles))
+
+        def done() -> None:
+            self.tree.set_marked(idx, True)
+            on_done()
+
+        toggle = self.perf.wrap("blink", lambda on: self.tree.set_marked(idx, on))
+        self.clock.run(frames, toggle, done, "blink")
 
     def finish_one_draw(self, idx: int) -> None:
-        if self.df is None:
+        if self.roster is None:
             self._end_round_early()
             return
 
-        iid = f"row-{idx}"
-        try:
-            self.tree.item(iid, tags=("winner",))
-            self.tree.see(iid)
-        except tk.TclError:
-            pass
+        self._clear_scan_highlight()
+        self.tree.set_marked(idx, True)
+        self.tree.see(idx)
 
         self.round_selected_idx.add(idx)
-        self.round_excluded_idx.add(idx)
 
         # Blink, then apply counter & continue
-        self._blink_row(iid, self.BLINK_TIMES * 2)
-        blink_duration = (self.BLINK_TIMES * 2) * self.BLINK_MS + 100
-        self._safe_after(blink_duration, lambda: self._apply_winner_and_continue(idx))
+        self._blink_row(
+            idx, self.BLINK_TIMES * 2,
+            lambda: self._safe_after(100, lambda: self._apply_winner_and_continue(idx)),
+        )
 
     def _apply_winner_and_continue(self, idx: int) -> None:
-        if self.df is None:
+        if self.roster is None:
             self._end_round_early()
             return
 
-        self.df.at[idx, "Counter"] += 1
-        normalize_counters(self.df)
-        self.refresh_counters()
+        self.engine.apply_winner(idx)
+        self._roster_generation += 1
+        self._schedule_refresh()
 
         self.drawn_count += 1
-        name = self.df.at[idx, "Name"]
+        name = self.roster.names[idx]
+        self._persist_pick(idx)
         self.status.config(
             text=f"Gezogen: {self.drawn_count}/{self.to_draw_total} – Gewinner: {name}"
         )
@@ -531,33 +1813,30 @@ class GluecksradApp(tk.Tk):
             self._safe_after(150, self.finish_round)
 
     def finish_round(self) -> None:
-        # Save Excel
-        try:
-            if self.xls_path and self.df is not None:
-                save_namelist(self.df, self.xls_path)
-                log.info("Saved to %s", self.xls_path)
-        except Exception as e:
-            log.exception("Speicherfehler")
-            messagebox.showerror("Speicherfehler", str(e))
+        # The picks are already journalled; rewrite the workbook periodically
+        self._journal_write("end_batch")
+        if self.journal is not None and self.journal.picks >= self.JOURNAL_COMPACT_EVERY:
+            self._compact()
 
         # Summarise all winners
-        winner_names = [
-            self.df.at[i, "Name"] for i in sorted(self.round_selected_idx) if self.df is not None
-        ]
+        winner_names = [self.roster.names[i] for i in sorted(self.round_selected_idx)]
         summary = ", ".join(winner_names) if winner_names else ""
         self.status.config(text=f"Runde beendet – Gewinner: {summary}")
 
         self.anim_running = False
         self.btn_draw.config(state=tk.NORMAL)
         self.round_selected_idx.clear()
-        self.round_excluded_idx.clear()
+        self.engine.clear_batch()
 
     def _end_round_early(self) -> None:
         """Abort the current round gracefully (e.g. on unexpected state)."""
+        self.clock.cancel()
+        self._cancel_pending("draw", "blink")
         self.anim_running = False
         self.btn_draw.config(state=tk.NORMAL)
         self.round_selected_idx.clear()
-        self.round_excluded_idx.clear()
+        self.engine.clear_batch()
+        self._journal_write("end_batch")
         self.status.config(text="Ziehung abgebrochen.")
         log.warning("Round ended early.")
 
@@ -566,19 +1845,76 @@ class GluecksradApp(tk.Tk):
     # ================================================================
     def clear_winner_highlights(self) -> None:
         """Remove green winner highlights (visual only)."""
-        for iid in self.tree.get_children(""):
-            try:
-                self.tree.item(iid, tags=("normal",))
-            except tk.TclError:
-                pass
-        self._clear_scan_highlight()
+        self.tree.clear_marks()
         self.status.config(text="Markierungen zurückgesetzt.")
 
 
 # ============================================================
 # Main
 # ============================================================
-if __name__ == "__main__":
+def _warm_up_imports() -> None:
+    """Import numpy (batch draws) in the background after first paint.
+
+    pandas is left out: only the legacy .xls path needs it, and it is
+    imported there on demand.
+    """
+    t = time.perf_counter()
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        log.exception("Warm-up import failed")
+        return
+    log.info("Warm-up imports done in %.0f ms", (time.perf_counter() - t) * 1000)
+
+
+def run(startup_report: bool = False, path: Optional[Path] = None, backend: Optional[str] = None) -> None:
+    """Start the GUI, optionally loading *path* with storage *backend*.
+
+    numpy is not needed to show the window; it is imported on a background
+    thread once the first frame is painted, so the first large batch does
+    not pay for it either. The startup times (module imports,
+    window construction, first paint) are logged; with *startup_report*
+    they are printed as JSON and the app exits after the first paint.
+    """
     random.seed()
     app = GluecksradApp()
+    t_built = time.perf_counter()
+
+    def first_paint() -> None:
+        app.update_idletasks()
+        t_paint = time.perf_counter()
+        app.startup_times = {
+            "imports_ms": (_T_IMPORTED - _T_START) * 1000,
+            "window_ms": (t_built - _T_IMPORTED) * 1000,
+            "first_paint_ms": (t_paint - _T_START) * 1000,
+        }
+        log.info(
+            "Startup: imports %.0f ms, window %.0f ms, first paint after %.0f ms",
+            *app.startup_times.values(),
+        )
+        if startup_report:
+            import json
+
+            print(json.dumps(app.startup_times))
+            app.destroy()
+            return
+        threading.Thread(target=_warm_up_imports, name="warm-up", daemon=True).start()
+        if path is not None:
+            app._load_file(path, backend)
+
+    app.after_idle(first_paint)
     app.mainloop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Glücksrad – faire Zufallsauswahl")
+    parser.add_argument("file", nargs="?", type=Path, help="Namensliste, die beim Start geladen wird")
+    parser.add_argument(
+        "--backend", choices=sorted(STORAGE_BACKENDS),
+        help="Speicherformat erzwingen (Standard: nach Dateiendung)",
+    )
+    parser.add_argument("--startup-report", action="store_true", help="Startzeiten als JSON ausgeben")
+    args = parser.parse_args()
+    run(startup_report=args.startup_report, path=args.file, backend=args.backend)
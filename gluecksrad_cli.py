@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Glücksrad – Ziehung ohne Oberfläche
+
+Headless draws for scripts, cron jobs and CI:
+
+    python gluecksrad_cli.py --file roster.xlsx --draw 5 --json
+
+Uses the same storage backends, draw journal and fairness engine as
+gluecksrad_V2, but never imports tkinter (and pandas only for .xls).
+"""
+
+import argparse
+import csv
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+
+from gluecksrad_engine import FairnessEngine, draw_and_apply
+from gluecksrad_io import (
+    STORAGE_BACKENDS,
+    DrawJournal,
+    RosterCache,
+    RosterStorage,
+    SqliteStorage,
+    open_storage,
+)
+
+
+# ============================================================
+# Drawing
+# ============================================================
+def draw_from_file(storage: RosterStorage, n: int, seed: Optional[int], save: bool) -> list[str]:
+    """Draw from a file backend; picks still in a GUI journal are honoured."""
+    names, counters, _ = storage.read()
+    engine = FairnessEngine(counters)
+    changes = engine.track()
+
+    journal = DrawJournal(storage.path)
+    if journal.path.exists():
+        # Picks the GUI journalled but did not write back yet; an
+        # interrupted batch is ended here like "Nein" in the resume dialog
+        journal.replay(names, engine)
+        engine.clear_batch()
+    else:
+        journal = None
+
+    winners = draw_and_apply(engine, min(n, len(names)), random.Random(seed))
+    if save:
+        indices, offset_changed = changes.drain()
+        storage.save(
+            names,
+            engine.counters(),
+            None if offset_changed else indices,
+            before_replace=journal.mark_compacting if journal is not None else None,
+        )
+        if journal is not None:
+            journal.reset()
+            journal.close()
+    return [names[i] for i in winners]
+
+
+def draw_from_database(storage: SqliteStorage, n: int, seed: Optional[int], save: bool) -> list[str]:
+    """Draw on the database directly, without loading the roster."""
+    return storage.draw(min(n, storage.count()), random.Random(seed), commit=save)
+
+
+# ============================================================
+# Output
+# ============================================================
+def write_winners(winners: Sequence[str], fmt: str, path: Path, saved: bool) -> None:
+    if fmt == "json":
+        json.dump(
+            {"file": str(path), "winners": list(winners), "saved": saved},
+            sys.stdout, ensure_ascii=False,
+        )
+        sys.stdout.write("\n")
+    elif fmt == "csv":
+        writer = csv.writer(sys.stdout, delimiter=";", lineterminator="\n")
+        writer.writerow(("Nr", "Name"))
+        writer.writerows(enumerate(winners, 1))
+    else:
+        for name in winners:
+            print(name)
+
+
+# ============================================================
+# Main
+# ============================================================
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Glücksrad – Ziehung ohne Oberfläche")
+    parser.add_argument("--file", type=Path, required=True, help="Namensliste (.xlsx, .xls, .csv, .db)")
+    parser.add_argument("--draw", type=int, default=1, metavar="N", help="Anzahl Gewinner (Standard: 1)")
+    parser.add_argument(
+        "--backend", choices=sorted(STORAGE_BACKENDS),
+        help="Speicherformat erzwingen (Standard: nach Dateiendung)",
+    )
+    out = parser.add_mutually_exclusive_group()
+    out.add_argument("--json", dest="fmt", action="store_const", const="json", help="Ausgabe als JSON")
+    out.add_argument("--csv", dest="fmt", action="store_const", const="csv", help="Ausgabe als CSV")
+    parser.add_argument("--seed", type=int, help="Zufallsstartwert (reproduzierbare Ziehung)")
+    parser.add_argument("--no-save", action="store_true", help="Zähler nicht speichern (Probelauf)")
+    parser.add_argument("--no-cache", action="store_true", help="Roster-Cache nicht verwenden")
+    args = parser.parse_args(argv)
+    if args.draw < 1:
+        parser.error("--draw muss mindestens 1 sein")
+
+    try:
+        storage = open_storage(args.file, args.backend, None if args.no_cache else RosterCache())
+        try:
+            if isinstance(storage, SqliteStorage):
+                winners = draw_from_database(storage, args.draw, args.seed, not args.no_save)
+            else:
+                winners = draw_from_file(storage, args.draw, args.seed, not args.no_save)
+        finally:
+            storage.close()
+    except Exception as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 1
+
+    write_winners(winners, args.fmt or "text", args.file, not args.no_save)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,747 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Glücksrad – headless fairness engine.
+
+Keeps the "lowest counter first, no repeats within a batch" rule of
+gluecksrad_V2 without touching a DataFrame: names live in counter buckets
+(counter -> index set), the global minimum is tracked lazily and
+normalisation is a logical offset instead of a column-wide rewrite.
+"""
+
+import random
+from typing import Iterable, Optional, Sequence
+
+
+# ============================================================
+# Indexable set
+# ============================================================
+class _IndexSet:
+    """Set of ints with O(1) add, remove and uniform random choice."""
+
+    __slots__ = ("items", "pos")
+
+    def __init__(self) -> None:
+        self.items: list[int] = []
+        self.pos: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, idx: int) -> bool:
+        return idx in self.pos
+
+    def add(self, idx: int) -> None:
+        if idx not in self.pos:
+            self.pos[idx] = len(self.items)
+            self.items.append(idx)
+
+    def remove(self, idx: int) -> None:
+        # Swap with the last element, then pop – keeps removal O(1)
+        p = self.pos.pop(idx)
+        last = self.items.pop()
+        if last != idx:
+            self.items[p] = last
+            self.pos[last] = p
+
+    def choice(self, rng: random.Random) -> int:
+        return self.items[rng.randrange(len(self.items))]
+
+
+class ChangeTracker:
+    """Indices whose displayed counter changed since the last :meth:`drain`.
+
+    A shift of the normalisation offset changes every displayed counter; it
+    is recorded as one *offset_changed* event instead of n index entries.
+    """
+
+    __slots__ = ("indices", "offset_changed")
+
+    def __init__(self) -> None:
+        self.indices: set[int] = set()
+        self.offset_changed = False
+
+    def __bool__(self) -> bool:
+        return self.offset_changed or bool(self.indices)
+
+    def mark(self, idx: int) -> None:
+        if not self.offset_changed:
+            self.indices.add(idx)
+
+    def move(self, src: int, dst: int) -> None:
+        """Entry *src* now lives at index *dst* (see FairnessEngine.remove)."""
+        if src in self.indices:
+            self.indices.discard(src)
+            self.indices.add(dst)
+
+    def mark_offset(self) -> None:
+        self.offset_changed = True
+        self.indices.clear()
+
+    def drain(self) -> tuple[set[int], bool]:
+        """Return ``(indices, offset_changed)`` and start over."""
+        out = (self.indices, self.offset_changed)
+        self.indices = set()
+        self.offset_changed = False
+        return out
+
+
+class _Bucket:
+    """All indices sharing one raw counter value.
+
+    *open* holds the indices that may still be drawn in the current batch,
+    *held* the ones already drawn this batch (the V2 ``round_excluded_idx``).
+    """
+
+    __slots__ = ("open", "held")
+
+    def __init__(self) -> None:
+        self.open = _IndexSet()
+        self.held = _IndexSet()
+
+    def __len__(self) -> int:
+        return len(self.open) + len(self.held)
+
+
+# ============================================================
+# Fairness engine
+# ============================================================
+class FairnessEngine:
+    """Bucketed counter store implementing the V2 fairness rules.
+
+    Counters are stored *raw*; the value shown to users is ``raw - offset``.
+    :meth:`normalize` moves *offset* to the current minimum, which
+    renormalises all counters in O(1) where ``normalize_counters`` rewrote
+    the whole column.
+    """
+
+    def __init__(self, counters: Iterable[int] = ()) -> None:
+        self._raw: list[int] = []
+        self._buckets: dict[int, _Bucket] = {}
+        self._min: Optional[int] = None
+        self._min_dirty = False
+        self._offset = 0
+        self._held: set[int] = set()
+        self._trackers: list[ChangeTracker] = []
+        self.reset(counters)
+
+    # ----- construction -----
+    def reset(self, counters: Iterable[int]) -> None:
+        """Replace all counters (e.g. after loading a file)."""
+        self._raw = [int(c) for c in counters]
+        self._buckets = {}
+        self._held.clear()
+        for idx, c in enumerate(self._raw):
+            self._bucket(c).open.add(idx)
+        self._min = min(self._buckets) if self._buckets else None
+        self._min_dirty = False
+        self._offset = 0
+        for t in self._trackers:
+            t.mark_offset()
+
+    def track(self) -> ChangeTracker:
+        """Return a new tracker that records all future counter changes."""
+        t = ChangeTracker()
+        self._trackers.append(t)
+        return t
+
+    def _bucket(self, c: int) -> _Bucket:
+        b = self._buckets.get(c)
+        if b is None:
+            b = self._buckets[c] = _Bucket()
+        return b
+
+    def _drop_if_empty(self, c: int) -> None:
+        if not self._buckets[c]:
+            del self._buckets[c]
+            if c == self._min:
+                self._min_dirty = True
+
+    # ----- read access -----
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    @property
+    def offset(self) -> int:
+        """Raw value that currently corresponds to a displayed counter of 0."""
+        return self._offset
+
+    def _min_raw(self) -> Optional[int]:
+        if self._min_dirty:
+            # Only hit after arbitrary edits; winner application keeps the
+            # minimum up to date itself. Cost is O(distinct counter values).
+            self._min = min(self._buckets) if self._buckets else None
+            self._min_dirty = False
+        return self._min
+
+    def counter(self, idx: int) -> int:
+        """Displayed counter of *idx*."""
+        return self._raw[idx] - self._offset
+
+    def counters(self) -> list[int]:
+        """All displayed counters, in index order."""
+        off = self._offset
+        return [c - off for c in self._raw]
+
+    def candidates(self) -> list[int]:
+        """Indices eligible for the next pick.
+
+        All indices at the minimal counter that were not drawn in the current
+        batch; if everyone at the minimum was already drawn, repeats are
+        allowed. The returned list is internal state – do not modify it.
+        """
+        m = self._min_raw()
+        if m is None:
+            return []
+        b = self._buckets[m]
+        return b.open.items if b.open else b.held.items
+
+    def candidate_position(self, idx: int) -> int:
+        """Position of *idx* in :meth:`candidates` in O(1), -1 if absent."""
+        m = self._min_raw()
+        if m is None:
+            return -1
+        b = self._buckets[m]
+        return (b.open if b.open else b.held).pos.get(idx, -1)
+
+    # ----- mutation -----
+    def pick(self, rng: Optional[random.Random] = None) -> int:
+        """Choose a random winner among :meth:`candidates` (not applied yet)."""
+        m = self._min_raw()
+        if m is None:
+            raise ValueError("Keine Namen vorhanden.")
+        b = self._buckets[m]
+        return (b.open if b.open else b.held).choice(rng if rng is not None else random)
+
+    def normalize(self) -> None:
+        """Shift the displayed counters so the lowest one is 0."""
+        m = self._min_raw()
+        if m is not None and m > self._offset:
+            self._offset = m
+            for t in self._trackers:
+                t.mark_offset()
+
+    def apply_winner(self, idx: int) -> None:
+        """Increment *idx*, exclude it for the rest of the batch, normalise."""
+        c = self._raw[idx]
+        b = self._buckets[c]
+        if idx in b.open:
+            b.open.remove(idx)
+        else:
+            b.held.remove(idx)
+        self._raw[idx] = c + 1
+        self._bucket(c + 1).held.add(idx)
+        self._held.add(idx)
+        for t in self._trackers:
+            t.mark(idx)
+        if not b:
+            del self._buckets[c]
+            if c == self._min and not self._min_dirty:
+                # The winner now sits at c + 1, so that is the new minimum
+                self._min = c + 1
+        self.normalize()
+
+    def set_counter(self, idx: int, value: int) -> None:
+        """Set the displayed counter of *idx* to *value*."""
+        raw = int(value) + self._offset
+        c = self._raw[idx]
+        if raw == c:
+            return
+        b = self._buckets[c]
+        held = idx in b.held
+        (b.held if held else b.open).remove(idx)
+        self._drop_if_empty(c)
+        self._raw[idx] = raw
+        nb = self._bucket(raw)
+        (nb.held if held else nb.open).add(idx)
+        for t in self._trackers:
+            t.mark(idx)
+        if not self._min_dirty and (self._min is None or raw < self._min):
+            self._min = raw
+
+    def append(self, value: int) -> int:
+        """Add an entry with displayed counter *value*; returns its index."""
+        idx = len(self._raw)
+        raw = int(value) + self._offset
+        self._raw.append(raw)
+        self._bucket(raw).open.add(idx)
+        for t in self._trackers:
+            t.mark(idx)
+        if not self._min_dirty and (self._min is None or raw < self._min):
+            self._min = raw
+        return idx
+
+    def remove(self, idx: int) -> int:
+        """Remove entry *idx* in O(1) by moving the last entry into its place.
+
+        Returns the former index of the moved entry (``idx`` itself if it
+        was the last one); callers keep parallel lists in step the same way.
+        """
+        c = self._raw[idx]
+        b = self._buckets[c]
+        (b.held if idx in b.held else b.open).remove(idx)
+        self._drop_if_empty(c)
+        self._held.discard(idx)
+        last = len(self._raw) - 1
+        if last != idx:
+            lc = self._raw[last]
+            lb = self._buckets[lc]
+            held = last in lb.held
+            (lb.held if held else lb.open).remove(last)
+            (lb.held if held else lb.open).add(idx)
+            if held:
+                self._held.discard(last)
+                self._held.add(idx)
+            self._raw[idx] = lc
+        self._raw.pop()
+        for t in self._trackers:
+            t.indices.discard(idx)
+            if last != idx:
+                t.move(last, idx)
+                t.mark(idx)
+        return last
+
+    def clear_batch(self) -> None:
+        """Forget the batch exclusions; costs O(winners in the batch)."""
+        for idx in self._held:
+            b = self._buckets[self._raw[idx]]
+            b.held.remove(idx)
+            b.open.add(idx)
+        self._held.clear()
+
+
+# ============================================================
+# Vectorised batch draw
+# ============================================================
+def draw_batch(counters, n: int, rng=None):
+    """Draw *n* winners at once with the same rules as a sequential batch.
+
+    Equivalent to calling :meth:`FairnessEngine.pick` / ``apply_winner``
+    *n* times on a fresh batch, but computed in a few NumPy passes: the
+    batch "water-fills" the lowest counters up to a level *T*. On every
+    level the names first reaching it are drawn (in random order) before
+    repeats among the names already drawn in this batch.
+
+    Returns ``(winners, new_counters)`` as int64 arrays; *new_counters* is
+    normalised like :meth:`FairnessEngine.normalize`.
+    """
+    import numpy as np  # deferred: keeps importing the engine cheap
+
+    c = np.asarray(counters, dtype=np.int64)
+    if rng is None:
+        rng = np.random.default_rng()
+    n = int(n)
+    if n <= 0 or c.size == 0:
+        return np.empty(0, dtype=np.int64), c.copy()
+
+    # Histogram of counter values (bincount is O(N) for the usual small,
+    # normalised counters; unique() covers wide value ranges)
+    m = int(c.min())
+    span = int(c.max()) - m + 1
+    if span <= 4 * c.size + 1024:
+        hist = np.bincount(c - m, minlength=span)
+        values = np.flatnonzero(hist) + m
+        counts = hist[values - m]
+    else:
+        values, counts = np.unique(c, return_counts=True)
+
+    # fill[j]: picks needed to lift everyone below values[j] up to values[j]
+    cum_n = np.cumsum(counts)
+    cum_s = np.cumsum(counts * values)
+    fill = np.zeros(len(values), dtype=np.int64)
+    fill[1:] = cum_n[:-1] * values[1:] - cum_s[:-1]
+    j = int(np.searchsorted(fill, n, side="right")) - 1
+    per_level = int(cum_n[j])
+    level_T = int(values[j]) + (n - int(fill[j])) // per_level
+    rest = (n - int(fill[j])) % per_level
+
+    # Names below T are all drawn at least once; those at exactly T compete
+    # for the *rest* picks on the final level.
+    low = np.flatnonzero(c < level_T)
+    low = low[np.lexsort((rng.random(low.size), c[low]))]
+    low_c = c[low]
+    at_T = np.flatnonzero(c == level_T)
+
+    n_new_T = min(rest, at_T.size)
+    new_T = at_T[rng.choice(at_T.size, n_new_T, replace=False)] if n_new_T else at_T[:0]
+    rep_T = low[rng.choice(low.size, rest - n_new_T, replace=False)] if rest > n_new_T else low[:0]
+
+    # Repeats on full levels k in [m, T): every name with counter < k once
+    levels = np.arange(m, level_T, dtype=np.int64)
+    rep_sizes = np.searchsorted(low_c, levels, side="left")
+    total = int(rep_sizes.sum())
+    rep_level = np.repeat(levels, rep_sizes)
+    starts = np.repeat(np.cumsum(rep_sizes) - rep_sizes, rep_sizes)
+    rep_full = low[np.arange(total, dtype=np.int64) - starts]
+
+    # Order all picks by (level, first-time before repeat, random)
+    idx = np.concatenate((low, new_T, rep_full, rep_T))
+    level = np.concatenate((
+        low_c,
+        np.full(new_T.size, level_T),
+        rep_level,
+        np.full(rep_T.size, level_T),
+    ))
+    repeat = np.concatenate((
+        np.zeros(low.size + new_T.size, dtype=np.int8),
+        np.ones(rep_full.size + rep_T.size, dtype=np.int8),
+    ))
+    key = np.concatenate((np.arange(low.size + new_T.size), rng.random(total + rep_T.size)))
+    winners = idx[np.lexsort((key, repeat, level))]
+
+    out = c.copy()
+    out[low] = level_T
+    out[new_T] += 1
+    out[rep_T] += 1
+    m_out = int(out.min())
+    if m_out > 0:
+        out -= m_out
+    return winners, out
+
+
+# ============================================================
+# Batch draw on an engine
+# ============================================================
+# From this batch size on, winners are chosen by the vectorised draw_batch;
+# below it picking one by one is faster than importing NumPy.
+BATCH_DRAW_MIN = 256
+
+
+def draw_and_apply(engine: FairnessEngine, n: int, rng: Optional[random.Random] = None) -> list[int]:
+    """Draw *n* winners as one batch, apply them to *engine* and close the batch.
+
+    Same result as the GUI's "Ziehung starten" without the animation.
+    """
+    rng = rng if rng is not None else random.Random()
+    if n >= BATCH_DRAW_MIN:
+        import numpy as np
+
+        winners, _ = draw_batch(engine.counters(), n, np.random.default_rng(rng.getrandbits(64)))
+        winners = winners.tolist()
+        for idx in winners:
+            engine.apply_winner(idx)
+    else:
+        winners = []
+        for _ in range(n):
+            idx = engine.pick(rng)
+            engine.apply_winner(idx)
+            winners.append(idx)
+    engine.clear_batch()
+    return winners
+
+
+# ============================================================
+# Draw strategies
+# ============================================================
+class DrawStrategy:
+    """Decides the winners of a batch; applying them stays with the caller.
+
+    Winners are decided up front (the GUI journals and animates them one
+    by one) and follow the batch rules of :meth:`FairnessEngine.apply_winner`.
+    """
+
+    name = ""
+    label = ""
+
+    def draw(self, engine: FairnessEngine, n: int, rng: Optional[random.Random] = None) -> list[int]:
+        raise NotImplementedError
+
+
+class _BatchOverlay:
+    """Winners of a batch being decided, on top of an engine left untouched.
+
+    Undrawn entries keep their engine counter and bucket; drawn ones are
+    tracked here with the times drawn. Costs O(batch), never a copy of the
+    engine.
+    """
+
+    __slots__ = ("engine", "dealt", "taken", "rest")
+
+    def __init__(self, engine: FairnessEngine) -> None:
+        self.engine = engine
+        self.dealt: dict[int, int] = {}       # index -> times drawn
+        self.taken: dict[int, int] = {}       # raw counter -> entries of its bucket drawn
+        self.rest: dict[int, _IndexSet] = {}  # undrawn entries of mostly drawn buckets
+
+    def undrawn(self, c: int) -> int:
+        """Undrawn entries in the bucket of raw counter *c*."""
+        b = self.engine._buckets.get(c)
+        return len(b) - self.taken.get(c, 0) if b is not None else 0
+
+    def take(self, c: int, rng) -> int:
+        """Uniformly one undrawn entry of bucket *c*; O(1) amortised."""
+        b = self.engine._buckets[c]
+        taken = self.taken[c] = self.taken.get(c, 0) + 1
+        s = self.rest.get(c)
+        if s is None:
+            k = len(b)
+            if taken * 2 <= k:
+                # At most half drawn: rejection takes < 2 tries on average
+                n_open = len(b.open)
+                while True:
+                    j = rng.randrange(k)
+                    idx = b.open.items[j] if j < n_open else b.held.items[j - n_open]
+                    if idx not in self.dealt:
+                        return idx
+            # Mostly drawn: collect the rest once, O(k) over >= k/2 picks
+            s = self.rest[c] = _IndexSet()
+            for items in (b.open.items, b.held.items):
+                for i in items:
+                    if i not in self.dealt:
+                        s.add(i)
+        idx = s.choice(rng)
+        s.remove(idx)
+        return idx
+
+    def add(self, idx: int) -> None:
+        self.dealt[idx] = self.dealt.get(idx, 0) + 1
+
+    def counter(self, idx: int) -> int:
+        """Raw counter of a drawn entry including this batch."""
+        return self.engine._raw[idx] + self.dealt[idx]
+
+
+class MinCounterStrategy(DrawStrategy):
+    """Lowest counter first, no repeats within a batch (the V2 rule).
+
+    Small batches pick one by one like :meth:`FairnessEngine.pick`, large
+    ones (``BATCH_DRAW_MIN``) go through the vectorised :func:`draw_batch`.
+    """
+
+    name = "fair"
+    label = "Niedrigster Zähler zuerst"
+
+    def draw(self, engine, n, rng=None):
+        if n >= BATCH_DRAW_MIN:
+            import numpy as np
+
+            nprng = None if rng is None else np.random.default_rng(rng.getrandbits(64))
+            return draw_batch(engine.counters(), n, nprng)[0].tolist()
+        if not len(engine):
+            raise ValueError("Keine Namen vorhanden.")
+        rng = rng if rng is not None else random
+        batch = _BatchOverlay(engine)
+        winners = []
+        for _ in range(n):
+            # Lowest level with undrawn entries vs. the lowest drawn entry
+            # (O(distinct counters + batch), independent of the roster size)
+            m = min((c for c in engine._buckets if batch.undrawn(c)), default=None)
+            low = min(map(batch.counter, batch.dealt), default=None)
+            if m is not None and (low is None or m <= low):
+                idx = batch.take(m, rng)
+            else:
+                # Everyone at the minimum was drawn: repeats are allowed
+                idx = rng.choice([i for i in batch.dealt if batch.counter(i) == low])
+            batch.add(idx)
+            winners.append(idx)
+        return winners
+
+
+class WeightedStrategy(DrawStrategy):
+    """Chance ∝ ``base ** -counter``: the soft alternative to the fair mode.
+
+    Higher counters stay possible, just less likely. Entries drawn in the
+    current batch only compete once nobody else is left. All entries of a
+    bucket share one weight, so a level is chosen first and then an entry
+    of it. The batch is drawn against the engine's buckets without copying
+    them (see :class:`_BatchOverlay`), so a pick costs O(distinct counters).
+    """
+
+    name = "weighted"
+    label = "Gewichtet (seltener bei hohem Zähler)"
+
+    def __init__(self, base: float = 2.0) -> None:
+        self.base = base
+
+    def draw(self, engine, n, rng=None):
+        if not len(engine):
+            raise ValueError("Keine Namen vorhanden.")
+        if self.base <= 1.0:
+            raise ValueError("Die Gewichtungsbasis muss größer als 1 sein.")
+        rng = rng if rng is not None else random
+        batch = _BatchOverlay(engine)
+        winners = []
+        for _ in range(n):
+            if len(batch.dealt) < len(engine):
+                idx = self._pick_undrawn(batch, rng)
+            else:
+                # Everyone was drawn: all compete again at their new counters
+                # (only for batches larger than the roster; O(n) per pick)
+                m = min(map(batch.counter, batch.dealt))
+                weights = [self.base ** (m - batch.counter(i)) for i in batch.dealt]
+                idx = rng.choices(list(batch.dealt), weights)[0]
+            batch.add(idx)
+            winners.append(idx)
+        return winners
+
+    def _pick_undrawn(self, batch: _BatchOverlay, rng) -> int:
+        # Undrawn entries still have their engine counter: weigh each level
+        # by its undrawn entries, relative to the minimum
+        m = batch.engine._min_raw()
+        levels = []
+        total = 0.0
+        for c in batch.engine._buckets:
+            k = batch.undrawn(c)
+            if k:
+                w = k * self.base ** (m - c)
+                levels.append((w, c))
+                total += w
+        r = rng.random() * total
+        for w, c in levels:
+            r -= w
+            if r < 0:
+                break
+        return batch.take(c, rng)
+
+
+class ShuffleDeck(DrawStrategy):
+    """Deals "everyone once before anyone twice" from a pre-shuffled deck.
+
+    When a cycle starts, the entries at the minimal counter are shuffled
+    once and winners are dealt off the top in O(1). Cards are checked
+    against the engine when they are reached: an entry whose counter left
+    the cycle level in the meantime (edited, already drawn) is skipped, so
+    the deck can never break the min-counter rule. Entries added or removed
+    mid-cycle are inserted into / deleted from the remaining deck.
+
+    *version* changes whenever the deck itself changes (not on dealing);
+    callers persist :meth:`state` when it does and just *pos* otherwise.
+    """
+
+    name = "deck"
+    label = "Gemischter Stapel (jeder einmal)"
+
+    def __init__(self) -> None:
+        self.deck: list[int] = []
+        self.pos = 0
+        self.level: Optional[int] = None   # raw counter of the current cycle
+        self.version = 0
+        self._slot: dict[int, int] = {}    # undealt index -> position in deck
+
+    # ----- dealing -----
+    def draw(self, engine, n, rng=None):
+        rng = rng if rng is not None else random
+        m = engine._min_raw()
+        if m is None:
+            raise ValueError("Keine Namen vorhanden.")
+        if self.level != m:
+            # First draw, or the cycle ended / someone fell below it
+            self._build(engine, m, {}, rng)
+        dealt: dict[int, int] = {}  # winners of this batch -> times dealt
+        winners: list[int] = []
+        while len(winners) < n:
+            idx = self._next(engine, dealt)
+            if idx is None:
+                # Cycle exhausted: entries still at the level (added or
+                # skipped meanwhile) go first, then the next level
+                self._build(engine, self.level, dealt, rng)
+                if not self.deck:
+                    self._build(engine, self.level + 1, dealt, rng)
+                continue
+            winners.append(idx)
+            dealt[idx] = dealt.get(idx, 0) + 1
+        return winners
+
+    def _next(self, engine: FairnessEngine, dealt: dict[int, int]) -> Optional[int]:
+        raw = engine._raw
+        while self.pos < len(self.deck):
+            idx = self.deck[self.pos]
+            self.pos += 1
+            if idx < 0:
+                continue  # removed mid-cycle
+            self._slot.pop(idx, None)
+            if raw[idx] + dealt.get(idx, 0) == self.level:
+                return idx
+        return None
+
+    def _build(self, engine: FairnessEngine, level: int, dealt: dict[int, int], rng) -> None:
+        """New deck of everyone at *level*, counting this batch's winners.
+
+        Winners of the running batch go to the bottom, so nobody repeats
+        within a batch while others are left.
+        """
+        fresh: list[int] = []
+        again: list[int] = []
+        for c, b in engine._buckets.items():
+            if c > level:
+                continue
+            for s in (b.open, b.held):
+                for idx in s.items:
+                    if c + dealt.get(idx, 0) == level:
+                        (again if idx in dealt else fresh).append(idx)
+        rng.shuffle(fresh)
+        rng.shuffle(again)
+        self._set(fresh + again, 0, level)
+
+    def _set(self, deck: list[int], pos: int, level: Optional[int]) -> None:
+        self.deck = deck
+        self.pos = pos
+        self.level = level
+        self._slot = {idx: p for p, idx in enumerate(deck) if p >= pos and idx >= 0}
+        self.version += 1
+
+    # ----- roster edits -----
+    def insert(self, engine: FairnessEngine, idx: int, rng: Optional[random.Random] = None) -> None:
+        """Entry *idx* was appended: shuffle it into the remaining deck."""
+        if self.level is None or engine._raw[idx] != self.level:
+            return  # not part of this cycle; the next build picks it up
+        self.deck.append(idx)
+        j = (rng if rng is not None else random).randrange(self.pos, len(self.deck))
+        moved = self.deck[j]
+        self.deck[j], self.deck[-1] = idx, moved
+        self._slot[idx] = j
+        if moved >= 0 and moved != idx:
+            self._slot[moved] = len(self.deck) - 1
+        self.version += 1
+
+    def remove(self, idx: int, last: int) -> None:
+        """Mirror :meth:`FairnessEngine.remove`: *idx* deleted, *last* moved to it."""
+        p = self._slot.pop(idx, None)
+        if p is not None:
+            self.deck[p] = -1
+        if last != idx:
+            p = self._slot.pop(last, None)
+            if p is not None:
+                self.deck[p] = idx
+                self._slot[idx] = p
+        self.version += 1
+
+    # ----- persistence -----
+    def state(self, names: Sequence[str]) -> dict:
+        """Undealt cards as ``{"start": pos, "cards": [[idx, name], …]}``.
+
+        Positions stay absolute: *start* is the deck position of the first
+        card. Removed cards are kept as ``[-1, ""]`` so later ones line up.
+        """
+        cards = [[i, names[i]] if i >= 0 else [-1, ""] for i in self.deck[self.pos:]]
+        return {"start": self.pos, "cards": cards}
+
+    def restore(self, engine: FairnessEngine, names: Sequence[str], cards, pos: int = 0) -> None:
+        """Continue a saved deck at *pos* (relative to *cards*).
+
+        Cards are matched by index and verified by name, like journal replay.
+        A card that resolves to an index already in the deck (duplicate
+        names) is dropped.
+
+        The cycle level is the current minimum: cards that were dealt but
+        whose pick was never applied are dealt again at the end of the cycle.
+        """
+        by_name: Optional[dict[str, int]] = None
+        deck = []
+        seen: set[int] = set()
+        for i, name in cards:
+            if i >= 0 and not (i < len(names) and names[i] == name):
+                if by_name is None:
+                    by_name = {n: k for k, n in enumerate(names)}
+                i = by_name.get(name, -1)
+            if i in seen:
+                i = -1
+            elif i >= 0:
+                seen.add(i)
+            deck.append(i)
+        self._set(deck, min(pos, len(deck)), engine._min_raw())
+
+
+STRATEGIES: dict[str, type] = {
+    cls.name: cls for cls in (MinCounterStrategy, WeightedStrategy, ShuffleDeck)
+}
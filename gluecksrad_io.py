@@ -0,0 +1,1615 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Glücksrad – roster file handling.
+
+Loading and saving of name lists, shared by the GUI and headless tools.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import logging
+import math
+import mmap
+import os
+import posixpath
+import random
+import re
+import shutil
+import struct
+import threading
+import time
+import zipfile
+from array import array
+from itertools import repeat
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional, Sequence
+from xml.etree import ElementTree
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+log = logging.getLogger(__name__)
+
+# pandas is imported inside the functions that need it: it dominates the
+# import time and the streaming .xlsx path does not use it for parsing.
+
+# Values that count as "no name" (V2: astype(str) turns NaN into "nan")
+EMPTY_NAMES = frozenset(("", "nan", "None"))
+
+# progress(rows_read, fraction or None) – called every PROGRESS_EVERY rows
+ProgressCallback = Callable[[int, Optional[float]], None]
+PROGRESS_EVERY = 5000
+
+
+class LoadCancelled(Exception):
+    """Raised when a load is cancelled through its *cancel* callback."""
+
+
+# ============================================================
+# Excel handling
+# ============================================================
+def _to_counter(value) -> int:
+    """Convert a Counter cell like ``pd.to_numeric(errors="coerce")`` + fillna(0)."""
+    if value is None:
+        return 0
+    if isinstance(value, (bool, int)):
+        return int(value)
+    if isinstance(value, float):
+        return int(value) if math.isfinite(value) else 0
+    if isinstance(value, str):
+        try:
+            f = float(value.strip())
+        except ValueError:
+            return 0
+        return int(f) if math.isfinite(f) else 0
+    return 0
+
+
+def _header_columns(header: list) -> tuple[int, int]:
+    """Column positions of Name and Counter (-1 if missing) in *header*.
+
+    Same rule as V2: columns titled "A" and "B" win, otherwise the first
+    column is Name and the second Counter.
+    """
+    titles = [None if h is None else str(h) for h in header]
+    if "A" in titles and "B" in titles:
+        return titles.index("A"), titles.index("B")
+    return 0, (1 if len(titles) >= 2 else -1)
+
+
+# ----- minimal SpreadsheetML streaming -----
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_ROW, _C, _V, _T, _IS, _R, _SI = (
+    _NS + "row", _NS + "c", _NS + "v", _NS + "t", _NS + "is", _NS + "r", _NS + "si"
+)
+
+
+def _first_sheet_path(zf: zipfile.ZipFile) -> str:
+    """Archive path of the first worksheet in workbook order."""
+    wb = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+    sheet = wb.find(f"{_NS}sheets/{_NS}sheet")
+    if sheet is None:
+        raise ValueError("Die Datei enthält kein Tabellenblatt.")
+    rid = sheet.get(_NS_REL + "id")
+    rels = ElementTree.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    for rel in rels.iter(_NS_PKG + "Relationship"):
+        if rel.get("Id") == rid:
+            target = rel.get("Target", "")
+            if target.startswith("/"):
+                return target[1:]
+            return posixpath.normpath(posixpath.join("xl", target))
+    raise ValueError("Tabellenblatt nicht gefunden.")
+
+
+def _rich_text(el) -> str:
+    """Text of an <si>/<is> element (plain or rich runs, no phonetics)."""
+    parts = []
+    for child in el:
+        if child.tag == _T:
+            parts.append(child.text or "")
+        elif child.tag == _R:
+            for t in child.iter(_T):
+                parts.append(t.text or "")
+    return "".join(parts)
+
+
+def _shared_strings(zf: zipfile.ZipFile) -> list[str]:
+    if "xl/sharedStrings.xml" not in zf.namelist():
+        return []
+    strings: list[str] = []
+    with zf.open("xl/sharedStrings.xml") as f:
+        for _, el in ElementTree.iterparse(f):
+            if el.tag == _SI:
+                strings.append(_rich_text(el))
+                el.clear()
+    return strings
+
+
+def _col_index(ref: str) -> int:
+    """0-based column of a cell reference like "AB12"."""
+    col = 0
+    for ch in ref:
+        if ch.isdigit():
+            break
+        col = col * 26 + (ord(ch.upper()) - 64)
+    return col - 1
+
+
+def _cell_value(el, shared: list[str]):
+    """Python value of a <c> element, like openpyxl with data_only=True."""
+    t = el.get("t")
+    if t == "inlineStr":
+        is_el = el.find(_IS)
+        return None if is_el is None else _rich_text(is_el)
+    v = el.find(_V)
+    if v is None or v.text is None:
+        return None
+    text = v.text
+    if t == "s":
+        return shared[int(text)]
+    if t == "b":
+        return text == "1"
+    if t in ("str", "e", "d"):
+        return text
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _iter_rows(
+    xls_path: Path,
+    wanted: list,
+    progress: Optional[ProgressCallback] = None,
+    cancel: Optional[Callable[[], bool]] = None,
+) -> Iterator[tuple[int, dict[int, object]]]:
+    """Stream the first sheet as ``(row_number, {column: value})`` pairs.
+
+    The first row is returned complete; after that only the columns in
+    *wanted* (mutable – the caller fills it after seeing the header).
+    Every PROGRESS_EVERY rows *cancel* is polled and *progress* is called
+    with the fraction of the sheet XML consumed so far.
+    """
+    with zipfile.ZipFile(xls_path) as zf:
+        shared = _shared_strings(zf)
+        sheet = zf.getinfo(_first_sheet_path(zf))
+        with zf.open(sheet) as f:
+            first = True
+            n = 0
+            row_number = 0
+            for _, el in ElementTree.iterparse(f):
+                if el.tag != _ROW:
+                    continue
+                n += 1
+                if n % PROGRESS_EVERY == 0:
+                    if cancel is not None and cancel():
+                        raise LoadCancelled()
+                    if progress is not None:
+                        progress(n, f.tell() / max(1, sheet.file_size))
+                r = el.get("r")
+                row_number = int(r) if r else row_number + 1
+                row: dict[int, object] = {}
+                col = -1
+                for c in el.iter(_C):
+                    ref = c.get("r")
+                    col = _col_index(ref) if ref else col + 1
+                    if first or col in wanted:
+                        row[col] = _cell_value(c, shared)
+                el.clear()
+                first = False
+                yield row_number, row
+
+
+class XlsxLayout:
+    """Where the roster lives inside an .xlsx file, recorded while loading.
+
+    *rows[i]* is the sheet row of roster entry *i*; *file_id* identifies
+    the file version the positions belong to. Used by :func:`patch_counters`.
+    """
+
+    __slots__ = ("header_row", "name_col", "counter_col", "rows", "file_id")
+
+    def __init__(self, header_row: int, name_col: int, counter_col: int,
+                 rows: array, file_id: tuple[int, int]) -> None:
+        self.header_row = header_row
+        self.name_col = name_col
+        self.counter_col = counter_col
+        self.rows = rows
+        self.file_id = file_id
+
+
+def _file_id(path: Path) -> tuple[int, int]:
+    st = path.stat()
+    return st.st_size, st.st_mtime_ns
+
+
+def read_namelist(
+    xls_path: Path,
+    progress: Optional[ProgressCallback] = None,
+    cancel: Optional[Callable[[], bool]] = None,
+) -> tuple[list[str], array]:
+    """Stream names and counters from an .xlsx file in one pass.
+
+    Parses the sheet XML directly and converts only the Name/Counter
+    cells; no DataFrame or per-cell objects are built. Returns ``(names,
+    counters)`` with the counters as a compact ``array("q")``.
+    Raises LoadCancelled once *cancel()* returns True.
+    """
+    names, counters, _ = _read_xlsx(xls_path, progress, cancel)
+    return names, counters
+
+
+def _read_xlsx(
+    xls_path: Path,
+    progress: Optional[ProgressCallback] = None,
+    cancel: Optional[Callable[[], bool]] = None,
+) -> tuple[list[str], array, XlsxLayout]:
+    """Like :func:`read_namelist`, plus the sheet layout."""
+    file_id = _file_id(xls_path)
+    wanted: list = []
+    rows = _iter_rows(xls_path, wanted, progress, cancel)
+    header_number, header_row = next(rows, (1, {}))
+    header = [header_row.get(i) for i in range(max(header_row, default=-1) + 1)]
+    while header and header[-1] is None:
+        header.pop()
+    if not header:
+        raise ValueError("Spalte A (Namen) fehlt.")
+    name_col, counter_col = _header_columns(header)
+    wanted.extend((name_col, counter_col))
+
+    names: list[str] = []
+    counters = array("q")
+    row_numbers = array("i")
+    for row_number, row in rows:
+        value = row.get(name_col)
+        if value is None:
+            continue
+        name = str(value).strip()
+        if name in EMPTY_NAMES:
+            continue
+        names.append(name)
+        counters.append(_to_counter(row.get(counter_col)))
+        row_numbers.append(row_number)
+
+    if not names:
+        raise ValueError("Die Datei enthält keine gültigen Namen.")
+    return names, counters, XlsxLayout(header_number, name_col, counter_col, row_numbers, file_id)
+
+
+def _load_namelist_pandas(xls_path: Path) -> "pd.DataFrame":
+    """DataFrame-based loader for .xls files."""
+    import pandas as pd
+
+    df = pd.read_excel(xls_path)
+    if df.shape[1] < 1:
+        raise ValueError("Spalte A (Namen) fehlt.")
+
+    # Rename columns robustly
+    if "A" in df.columns and "B" in df.columns:
+        df = df.rename(columns={"A": "Name", "B": "Counter"})
+    else:
+        cols = list(df.columns)
+        rename_map = {cols[0]: "Name"}
+        if len(cols) >= 2:
+            rename_map[cols[1]] = "Counter"
+        df = df.rename(columns=rename_map)
+
+    if "Counter" not in df.columns:
+        df["Counter"] = 0
+
+    df["Name"] = df["Name"].astype(str).str.strip()
+    # BUG-FIX: astype(str) turns NaN → "nan"; filter that out too
+    df = df[~df["Name"].isin(EMPTY_NAMES)]
+    df["Counter"] = pd.to_numeric(df["Counter"], errors="coerce").fillna(0).astype(int)
+    df = df.reset_index(drop=True)
+
+    if df.empty:
+        raise ValueError("Die Datei enthält keine gültigen Namen.")
+    return df
+
+
+def save_namelist(
+    df: "pd.DataFrame",
+    xls_path: Path,
+    before_replace: Optional[Callable[[Path], None]] = None,
+) -> None:
+    """Save the name/counter DataFrame back to Excel.
+
+    *before_replace(tmp_path)* runs after the temp file is complete and
+    before it replaces *xls_path* (used by the draw journal).
+    """
+    import pandas as pd
+
+    # BUG-FIX V2: write to a temp file first, then replace – prevents data
+    # loss if the write is interrupted or the file is locked.
+    tmp_path = xls_path.with_suffix(".tmp.xlsx")
+    try:
+        with pd.ExcelWriter(tmp_path, engine="openpyxl") as writer:
+            df.to_excel(writer, index=False)
+        if before_replace is not None:
+            before_replace(tmp_path)
+        tmp_path.replace(xls_path)
+    except Exception:
+        # Clean up temp file on failure
+        if tmp_path.exists():
+            tmp_path.unlink(missing_ok=True)
+        raise
+
+
+# ============================================================
+# In-place counter patching
+# ============================================================
+_ROW_RE = re.compile(rb"<(\w+:)?row\b([^>]*?)(?:/>|>(.*?)</(?:\w+:)?row>)", re.S)
+_CELL_RE = re.compile(rb"<(?:\w+:)?c\b([^>]*?)(?:/>|>.*?</(?:\w+:)?c>)", re.S)
+_ATTR_R = re.compile(rb'\br="([A-Za-z]*)(\d*)"')
+_ATTR_S = re.compile(rb'\ss="\d+"')
+_ATTR_SPANS = re.compile(rb'\sspans="[^"]*"')
+_DIMENSION_RE = re.compile(rb'(<(?:\w+:)?dimension\b[^>]*\bref=")([A-Z]+\d+)(?::([A-Z]+)(\d+))?"')
+
+
+def _xml_escape(text: str) -> str:
+    # xml.sax.saxutils.escape would pull in urllib (~20 ms of import time)
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _col_letters(col: int) -> str:
+    """Column letters for a 0-based column index (0 -> "A")."""
+    letters = ""
+    col += 1
+    while col:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _patch_row(prefix: bytes, row_number: int, content: bytes, col: int, value) -> tuple[bytes, bool]:
+    """Set cell *col* of one row's XML *content*; returns (content, inserted)."""
+    ref = f"{_col_letters(col)}{row_number}".encode()
+    if isinstance(value, str):
+        body = b'<%sis><%st>%s</%st></%sis>' % (
+            prefix, prefix, _xml_escape(value).encode("utf-8"), prefix, prefix)
+        cell_attrs = b' t="inlineStr"'
+    else:
+        body = b"<%sv>%d</%sv>" % (prefix, value, prefix)
+        cell_attrs = b""
+
+    def cell(style: bytes) -> bytes:
+        return b'<%sc r="%s"%s%s>%s</%sc>' % (prefix, ref, style, cell_attrs, body, prefix)
+
+    cur = -1
+    for m in _CELL_RE.finditer(content):
+        r = _ATTR_R.search(m.group(1))
+        cur = _col_index(r.group(1).decode()) if r else cur + 1
+        if cur == col:
+            style = _ATTR_S.search(m.group(1))
+            new = cell(style.group(0) if style else b"")
+            return content[:m.start()] + new + content[m.end():], False
+        if cur > col:
+            return content[:m.start()] + cell(b"") + content[m.start():], True
+    return content + cell(b""), True
+
+
+def _find_rows(xml: bytes, rows) -> list[tuple[int, "re.Match[bytes]"]]:
+    """Locate the ``<row>`` elements with the given numbers, in file order.
+
+    Rows carry their number in an ``r`` attribute (cells use letter+digit
+    refs), so each one is found with a plain substring search instead of
+    parsing every row; sheets without ``r`` attributes fall back to a full
+    pass that counts rows.
+    """
+    found = []
+    pos = 0
+    for n in sorted(rows):
+        i = xml.find(b' r="%d"' % n, pos)
+        m = _ROW_RE.match(xml, xml.rfind(b"<", 0, i)) if i >= 0 else None
+        if m is None or m.end(2) < i:
+            break
+        found.append((n, m))
+        pos = m.end()
+    else:
+        return found
+
+    found = []
+    row_number = 0
+    for m in _ROW_RE.finditer(xml):
+        r = _ATTR_R.search(m.group(2))
+        row_number = int(r.group(2)) if r and r.group(2) else row_number + 1
+        if row_number in rows:
+            found.append((row_number, m))
+    return found
+
+
+def _patch_sheet(xml: bytes, cells: dict[int, object], col: int) -> bytes:
+    """Set column *col* of the rows in *cells* (row number -> value)."""
+    out = []
+    last = 0
+    inserted = False
+    for row_number, m in _find_rows(xml, cells):
+        prefix = m.group(1) or b""
+        attrs = m.group(2)
+        content, ins = _patch_row(prefix, row_number, m.group(3) or b"", col, cells[row_number])
+        if ins:
+            # The row's span hint no longer covers the new cell
+            attrs = _ATTR_SPANS.sub(b"", attrs)
+            inserted = True
+        out.append(xml[last:m.start()])
+        out.append(b"<%srow%s>%s</%srow>" % (prefix, attrs, content, prefix))
+        last = m.end()
+    out.append(xml[last:])
+    xml = b"".join(out)
+
+    if inserted:
+        m = _DIMENSION_RE.search(xml)
+        if m and m.group(3) and _col_index(m.group(3).decode()) < col:
+            new_ref = b"%s:%s%s" % (m.group(2), _col_letters(col).encode(), m.group(4))
+            xml = xml[:m.start(2)] + new_ref + xml[m.end(4):]
+    return xml
+
+
+def _locate_rows(
+    file_names: Sequence[str], rows: array, names: Sequence[str], updates: dict[int, int]
+) -> Optional[dict[int, object]]:
+    """Sheet row -> counter for *updates* in a file that changed on disk.
+
+    An entry keeps its row if the file has the same name at the same
+    index; otherwise it is looked up by name. Entries whose name is gone
+    are skipped. Returns None if a looked-up name occurs more than once
+    (in the file or the roster), since its row cannot be told apart.
+    """
+    cells: dict[int, object] = {}
+    row_of: Optional[dict[str, int]] = None
+    dupes: set[str] = set()
+    for i, v in updates.items():
+        name = names[i]
+        if i < len(file_names) and file_names[i] == name:
+            cells[rows[i]] = v
+            continue
+        if row_of is None:
+            row_of = {}
+            for n, r in zip(file_names, rows):
+                if n in row_of:
+                    dupes.add(n)
+                row_of[n] = r
+            seen: set[str] = set()
+            for n in names:
+                if n in seen:
+                    dupes.add(n)
+                seen.add(n)
+        if name in dupes:
+            return None
+        if name in row_of:
+            cells[row_of[name]] = v
+    return cells
+
+
+def patch_counters(
+    xls_path: Path,
+    layout: XlsxLayout,
+    names: Sequence[str],
+    updates: dict[int, int],
+    before_replace: Optional[Callable[[Path], None]] = None,
+) -> Optional[XlsxLayout]:
+    """Write changed counters into the existing .xlsx file in place.
+
+    Only the Counter cells of the roster entries in *updates* (index ->
+    counter) are rewritten; other sheets, columns, formatting and cell
+    styles are copied unchanged. If the file was modified since *layout*
+    was recorded, the rows are located again (see :func:`_locate_rows`);
+    when that is ambiguous nothing is written and None is returned, so
+    the caller can save the whole roster instead. Like save_namelist the
+    result is written to a temp file that then replaces the original
+    (*before_replace(tmp_path)* runs in between). Returns the layout for
+    the new file version.
+    """
+    if not updates:
+        return layout
+    if _file_id(xls_path) != layout.file_id:
+        file_names, _, layout = _read_xlsx(xls_path)
+        located = _locate_rows(file_names, layout.rows, names, updates)
+        if located is None:
+            return None
+        cells = located
+    else:
+        cells = {layout.rows[i]: v for i, v in updates.items()}
+
+    col = layout.counter_col
+    if col < 0:
+        # Name-only sheet: counters go into the next column, with a header
+        col = layout.name_col + 1
+        cells[layout.header_row] = "Counter"
+
+    tmp_path = xls_path.with_suffix(".tmp.xlsx")
+    try:
+        with zipfile.ZipFile(xls_path) as zin, zipfile.ZipFile(tmp_path, "w") as zout:
+            sheet = _first_sheet_path(zin)
+            for item in zin.infolist():
+                data = zin.read(item)
+                if item.filename == sheet:
+                    data = _patch_sheet(data, cells, col)
+                zout.writestr(item, data)
+        if before_replace is not None:
+            before_replace(tmp_path)
+        tmp_path.replace(xls_path)
+    except Exception:
+        if tmp_path.exists():
+            tmp_path.unlink(missing_ok=True)
+        raise
+    return XlsxLayout(layout.header_row, layout.name_col, col, layout.rows, _file_id(xls_path))
+
+
+# ============================================================
+# Roster model
+# ============================================================
+class Roster:
+    """Names and stored counters of one roster, index-aligned.
+
+    The in-memory form between the storage backends and the apps: a plain
+    list of names and an int64 ``array`` of counters, indexed directly
+    (``roster.names[i]``, ``roster.counters[i]``) without per-access
+    overhead. pandas only comes in at the edges, through
+    :meth:`from_frame` and :meth:`to_frame`.
+    """
+
+    __slots__ = ("names", "counters")
+
+    def __init__(self, names: Iterable[str] = (), counters: Iterable[int] = ()) -> None:
+        self.names: list[str] = names if isinstance(names, list) else list(names)
+        self.counters = (
+            counters if isinstance(counters, array) and counters.typecode == "q"
+            else array("q", counters)
+        )
+        if len(self.names) != len(self.counters):
+            raise ValueError("Namen und Zähler sind unterschiedlich lang.")
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def copy(self) -> "Roster":
+        return Roster(list(self.names), array("q", self.counters))
+
+    def append(self, name: str, counter: int) -> int:
+        """Add an entry; returns its index."""
+        self.names.append(name)
+        self.counters.append(counter)
+        return len(self.names) - 1
+
+    def remove(self, idx: int) -> int:
+        """Remove entry *idx* by moving the last entry into its place.
+
+        Same contract as ``FairnessEngine.remove``: returns the former index
+        of the moved entry, so both stay in step.
+        """
+        names, counters = self.names, self.counters
+        last = len(names) - 1
+        names[idx] = names[last]
+        counters[idx] = counters[last]
+        names.pop()
+        counters.pop()
+        return last
+
+    @classmethod
+    def from_frame(cls, df: "pd.DataFrame") -> "Roster":
+        """Roster from a Name/Counter DataFrame (legacy loaders, .xls)."""
+        return cls(df["Name"].tolist(), array("q", df["Counter"]))
+
+    def to_frame(self) -> "pd.DataFrame":
+        """Name/Counter DataFrame, e.g. for pandas-based writers."""
+        import pandas as pd
+
+        return pd.DataFrame({"Name": self.names, "Counter": self.counters})
+
+
+# ============================================================
+# Parsed-roster cache
+# ============================================================
+def _default_cache_dir() -> Path:
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+    return (Path(base) if base else Path.home() / ".cache") / "gluecksrad"
+
+
+class RosterCache:
+    """On-disk cache of parsed rosters, so unchanged files load instantly.
+
+    One entry per (file, backend) holds the names, the counters and the
+    .xlsx layout in a flat binary file that is read through ``mmap``. An
+    entry is only used if size and content hash (BLAKE2b) of the file
+    still match; anything else falls back to a full parse. Entries are
+    evicted least-recently-used once the directory exceeds *max_bytes*.
+    A broken or unwritable cache never fails a load.
+
+    Entry layout: header (_HEADER), counters (int64 × n), sheet rows
+    (int32 × n, only with a layout), NUL-separated UTF-8 names, source path.
+    """
+
+    VERSION = 1
+    _MAGIC = b"GRRC"
+    # magic, version, has_layout, n, size, mtime_ns, digest, names_len,
+    # header_row, name_col, counter_col, path_len (72 bytes, 8-aligned)
+    _HEADER = struct.Struct("=4sHHIqq16sqiiiI4x")
+    SUFFIX = ".roster"
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: int = 64 << 20) -> None:
+        self.directory = directory if directory is not None else _default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def _entry(self, path: Path, kind: str) -> tuple[Path, bytes]:
+        key = f"{kind}:{os.path.abspath(path)}".encode("utf-8")
+        return self.directory / (hashlib.sha1(key).hexdigest() + self.SUFFIX), key
+
+    @staticmethod
+    def _digest(path: Path) -> bytes:
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        return h.digest()
+
+    def get(self, path: Path, kind: str) -> Optional[tuple[list[str], array, Optional[XlsxLayout]]]:
+        """Cached ``(names, counters, layout)`` of *path*, None on a miss."""
+        entry, key = self._entry(path, kind)
+        try:
+            st = path.stat()
+            with open(entry, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                (magic, version, has_layout, n, size, _, digest, names_len,
+                 header_row, name_col, counter_col, path_len) = self._HEADER.unpack_from(mm)
+                if magic != self._MAGIC or version != self.VERSION or size != st.st_size:
+                    return None
+                pos = self._HEADER.size
+                counters = array("q")
+                counters.frombytes(mm[pos:pos + 8 * n])
+                pos += 8 * n
+                rows = array("i")
+                if has_layout:
+                    rows.frombytes(mm[pos:pos + 4 * n])
+                    pos += 4 * n
+                names = mm[pos:pos + names_len].decode("utf-8").split("\0")
+                pos += names_len
+                if mm[pos:pos + path_len] != key or len(names) != n:
+                    return None
+            # Size matches; only the content hash proves the file unchanged
+            if self._digest(path) != digest:
+                return None
+            os.utime(entry)  # LRU clock
+        except (OSError, ValueError, struct.error):
+            return None
+        layout = None
+        if has_layout:
+            layout = XlsxLayout(header_row, name_col, counter_col, rows, (st.st_size, st.st_mtime_ns))
+        return names, counters, layout
+
+    def put(self, path: Path, kind: str, names: Sequence[str], counters: Sequence[int],
+            layout: Optional[XlsxLayout] = None) -> None:
+        """Store the parse result of *path*; failures are only logged."""
+        entry, key = self._entry(path, kind)
+        blob = "\0".join(names).encode("utf-8")
+        if blob.count(b"\0") != len(names) - 1:
+            return  # a name contains NUL – not representable, skip
+        tmp = entry.with_suffix(".tmp")
+        try:
+            st = path.stat()
+            digest = self._digest(path)
+            if _file_id(path) != (st.st_size, st.st_mtime_ns):
+                return  # changed while hashing
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(self._HEADER.pack(
+                    self._MAGIC, self.VERSION, layout is not None, len(names),
+                    st.st_size, st.st_mtime_ns, digest, len(blob),
+                    layout.header_row if layout else 0,
+                    layout.name_col if layout else 0,
+                    layout.counter_col if layout else 0,
+                    len(key),
+                ))
+                f.write(array("q", counters).tobytes())
+                if layout is not None:
+                    f.write(layout.rows.tobytes())
+                f.write(blob)
+                f.write(key)
+            tmp.replace(entry)
+            self._evict(keep=entry)
+        except OSError:
+            log.warning("Roster-Cache nicht beschreibbar: %s", self.directory, exc_info=True)
+            tmp.unlink(missing_ok=True)
+
+    def _evict(self, keep: Path) -> None:
+        """Delete least-recently-used entries until the cache fits *max_bytes*."""
+        entries = []
+        total = 0
+        for p in self.directory.glob("*" + self.SUFFIX):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, p))
+            total += st.st_size
+        entries.sort()
+        for _, size, p in entries:
+            if total <= self.max_bytes:
+                break
+            if p == keep and total - size <= self.max_bytes and len(entries) > 1:
+                continue
+            p.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        """Delete all entries (Datei → Roster-Cache leeren in the GUI)."""
+        for p in self.directory.glob("*" + self.SUFFIX):
+            p.unlink(missing_ok=True)
+
+
+# ============================================================
+# Storage backends
+# ============================================================
+class StorageError(Exception):
+    """A storage backend could not read or write the roster."""
+
+
+class RosterStorage:
+    """Persistence backend for one roster.
+
+    File backends (Excel, CSV) rewrite the file in :meth:`save`; picks in
+    between are kept by a :class:`DrawJournal` (*journalled*). Database
+    backends persist every pick in :meth:`apply_winner` and need no journal.
+    """
+
+    name = ""
+    label = ""
+    suffixes: tuple[str, ...] = ()
+    journalled = True
+
+    def __init__(self, path: Path, cache: Optional[RosterCache] = None) -> None:
+        self.path = path
+        self.cache = cache
+        # True if the last load() was served from *cache*
+        self.from_cache = False
+        # (size, mtime_ns) of the file version last loaded or saved, used
+        # to notice external edits; None for database backends
+        self.file_id: Optional[tuple[int, int]] = None
+
+    def load(
+        self,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[Callable[[], bool]] = None,
+    ) -> Roster:
+        """Read the roster as a :class:`Roster` (see :meth:`read`)."""
+        names, counters, _ = self.read(progress, cancel)
+        return Roster(names, counters)
+
+    def _parse(self, progress, cancel) -> tuple[list[str], array, Optional[XlsxLayout]]:
+        """Full parse of a roster file (file backends)."""
+        raise NotImplementedError
+
+    def read(
+        self,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[Callable[[], bool]] = None,
+    ) -> tuple[list[str], array, Optional[XlsxLayout]]:
+        """``(names, counters, layout)`` of a roster file without pandas;
+        served from the cache while the file is unchanged.
+        """
+        self.from_cache = False
+        # Taken before parsing: an edit during the parse shows up as a change
+        self.file_id = _file_id(self.path)
+        if self.cache is not None:
+            hit = self.cache.get(self.path, self.name)
+            if hit is not None:
+                self.from_cache = True
+                return hit
+        result = self._parse(progress, cancel)
+        if self.cache is not None:
+            self.cache.put(self.path, self.name, *result)
+        return result
+
+    def remap(self, diff: "RosterDiff") -> None:
+        """Follow the index moves of a :class:`RosterDiff` applied to the roster."""
+
+    def apply_winner(self, idx: int) -> None:
+        """Persist one pick of entry *idx* (counter + 1, then normalise).
+
+        File backends only write in :meth:`save`; the journal covers the gap.
+        """
+
+    def save(
+        self,
+        names: Sequence[str],
+        counters: Sequence[int],
+        changed: Optional[Iterable[int]] = None,
+        before_replace: Optional[Callable[[Path], None]] = None,
+    ) -> None:
+        """Write the counters back; *changed* limits the work to those
+        entries (None = all). *before_replace* is passed the temp file of
+        backends that replace the file atomically.
+        """
+        raise NotImplementedError
+
+    def snapshot(self, dest: Path) -> None:
+        """Write a consistent copy of the stored roster to *dest*."""
+        shutil.copy2(self.path, dest)
+
+    def close(self) -> None:
+        pass
+
+
+class ExcelStorage(RosterStorage):
+    """.xlsx/.xls workbooks; .xlsx saves patch only the changed cells."""
+
+    name = "excel"
+    label = "Excel-Dateien"
+    suffixes = (".xlsx", ".xls")
+
+    def __init__(self, path: Path, cache: Optional[RosterCache] = None) -> None:
+        super().__init__(path, cache)
+        self.layout: Optional[XlsxLayout] = None
+
+    def _parse(self, progress, cancel):
+        if self.path.suffix.lower() == ".xls":
+            roster = Roster.from_frame(_load_namelist_pandas(self.path))
+            return roster.names, roster.counters, None
+        return _read_xlsx(self.path, progress, cancel)
+
+    def read(self, progress=None, cancel=None):
+        names, counters, self.layout = super().read(progress, cancel)
+        return names, counters, self.layout
+
+    def remap(self, diff: "RosterDiff") -> None:
+        if self.layout is not None and diff.rows is not None:
+            self.layout.rows = diff.rows
+
+    def save(self, names, counters, changed=None, before_replace=None) -> None:
+        if self.layout is None:
+            df = Roster(list(names), counters).to_frame()
+            save_namelist(df, self.path, before_replace=before_replace)
+        else:
+            # A sheet without Counter column gets all counters on first save
+            if changed is None or self.layout.counter_col < 0:
+                changed = range(len(names))
+            self.layout = patch_counters(
+                self.path, self.layout, names, {i: counters[i] for i in changed}, before_replace
+            )
+            if self.layout is None:
+                # The file changed and rows are ambiguous: rewrite it whole
+                log.warning("Zeilen in %s nicht eindeutig, speichere vollständig", self.path)
+                df = Roster(list(names), counters).to_frame()
+                save_namelist(df, self.path, before_replace=before_replace)
+        self.file_id = _file_id(self.path)
+        # The next reload of the file we just wrote needs no parse
+        if self.cache is not None:
+            self.cache.put(self.path, self.name, names, counters, self.layout)
+
+
+# Leading integer of a counter field, as std::stoi reads it
+_CSV_INT = re.compile(r"\s*([+-]?\d+)")
+CSV_BLOCK = 1 << 18   # bytes decoded and split per step
+CSV_WRITE_ROWS = 4096  # rows joined per write
+_INT64_MAX = (1 << 63) - 1
+
+
+def _csv_counter(field: str) -> int:
+    """Counter field like the C++ ``std::stoi``: leading integer, else 0.
+
+    Like ``std::stoi`` an integer that does not fit (here: int64) is an
+    error rather than being wrapped or clamped.
+    """
+    try:
+        value = int(field)
+    except ValueError:
+        m = _CSV_INT.match(field)
+        value = int(m.group(1)) if m else 0
+    if not -_INT64_MAX - 1 <= value <= _INT64_MAX:
+        raise ValueError(f"Zähler außerhalb des gültigen Bereichs: {field.strip()!r}")
+    return value
+
+
+def _csv_blocks(f) -> Iterator[str]:
+    """Decoded chunks of binary file *f* that end at a line break.
+
+    Every line is one record, as in the C++ port, so only the unfinished
+    last line is carried into the next chunk.
+    """
+    tail = b""
+    while True:
+        data = f.read(CSV_BLOCK)
+        if not data:
+            if tail:
+                yield tail.decode("utf-8")
+            return
+        data = tail + data
+        cut = data.rfind(b"\n") + 1
+        if cut == 0:
+            tail = data
+            continue
+        tail = data[cut:]
+        yield data[:cut].decode("utf-8")
+
+
+def _csv_rows(text: str, delim: str) -> Iterator[tuple[str, str]]:
+    """``(name, counter field)`` per line of *text*, like the C++ LoadCSV.
+
+    The C++ port splits at the delimiter without quoting rules; quotes
+    only matter at the start of a field, which is how :meth:`CsvStorage.save`
+    writes names the C++ port could not represent. A quote left open ends
+    with its line, so a stray quote cannot swallow the following rows.
+    """
+    for line in text.split("\n"):
+        if '"' in line:
+            row = next(csv.reader([line.rstrip("\r")], delimiter=delim), [])
+            yield (row[0], row[1] if len(row) > 1 else "") if row else ("", "")
+            continue
+        name, _, rest = line.partition(delim)
+        yield name, rest.partition(delim)[0]
+
+
+def _csv_block(text: str, delim: str, names: list[str], counters: array) -> None:
+    """Append the entries of one chunk to *names* and *counters*."""
+    body = text[:-1] if text.endswith("\n") else text
+    if '"' not in body and set(map(str.count, body.split("\n"), repeat(delim))) == {1}:
+        # Fast path: exactly one delimiter on every line, so names and
+        # counters alternate once the delimiters are turned into line breaks.
+        # Nothing is appended unless the whole block parsed.
+        fields = body.replace(delim, "\n").split("\n")
+        block = [n.strip() for n in fields[0::2]]
+        if EMPTY_NAMES.isdisjoint(block):
+            try:
+                parsed = array("q", list(map(int, fields[1::2])))
+            except (ValueError, OverflowError):
+                pass  # e.g. "2.7", "x" or too large: std::stoi rules, line by line
+            else:
+                names.extend(block)
+                counters.extend(parsed)
+                return
+    for name, field in _csv_rows(body, delim):
+        name = name.strip()
+        if name in EMPTY_NAMES:
+            continue
+        names.append(name)
+        counters.append(_csv_counter(field))
+
+
+def _csv_name(name: str) -> str:
+    """*name* as the C++ port writes it; quoted only if it could not be read back raw.
+
+    Records are single lines, so line breaks inside a name become spaces.
+    """
+    if "\n" in name or "\r" in name:
+        name = " ".join(name.splitlines())
+    if ";" in name or name.startswith('"'):
+        return '"' + name.replace('"', '""') + '"'
+    return name
+
+
+class CsvStorage(RosterStorage):
+    """``Name;Counter`` CSV files as used by the C++ port.
+
+    The dialect is that of the C++ LoadCSV/SaveCSV: the delimiter (``;`` or
+    ``,``) is detected from the header line like DetectDelimiter, fields are
+    split without quoting rules, counters are read like ``std::stoi``, and
+    files are UTF-8 with or without BOM. Saving writes ``;``, a BOM and CRLF
+    line ends. Both directions stream in blocks without pandas.
+    """
+
+    name = "csv"
+    label = "CSV-Dateien"
+    suffixes = (".csv",)
+
+    def _parse(self, progress, cancel):
+        names: list[str] = []
+        counters = array("q")
+        size = max(1, self.path.stat().st_size)
+        with open(self.path, "rb") as f:
+            header = f.readline().decode("utf-8-sig")
+            delim = ";" if header.count(";") >= header.count(",") else ","
+            for text in _csv_blocks(f):
+                if cancel is not None and cancel():
+                    raise LoadCancelled()
+                _csv_block(text, delim, names, counters)
+                if progress is not None:
+                    progress(len(names), f.tell() / size)
+        if not names:
+            raise ValueError("Die Datei enthält keine gültigen Namen.")
+        return names, counters, None
+
+    def save(self, names, counters, changed=None, before_replace=None) -> None:
+        # A CSV has no cell addressing; it is always rewritten as a whole
+        tmp_path = self.path.with_suffix(".tmp.csv")
+        try:
+            with open(tmp_path, "w", encoding="utf-8-sig", newline="") as f:
+                f.write("Name;Counter\r\n")
+                for start in range(0, len(names), CSV_WRITE_ROWS):
+                    chunk = names[start:start + CSV_WRITE_ROWS]
+                    joined = "".join(chunk)
+                    if ";" in joined or '"' in joined or "\n" in joined or "\r" in joined:
+                        chunk = [_csv_name(n) for n in chunk]
+                    f.write("".join([
+                        f"{n};{c}\r\n" for n, c in zip(chunk, counters[start:start + CSV_WRITE_ROWS])
+                    ]))
+            if before_replace is not None:
+                before_replace(tmp_path)
+            tmp_path.replace(self.path)
+        except Exception:
+            if tmp_path.exists():
+                tmp_path.unlink(missing_ok=True)
+            raise
+        self.file_id = _file_id(self.path)
+        if self.cache is not None:
+            self.cache.put(self.path, self.name, names, counters)
+
+
+class SqliteStorage(RosterStorage):
+    """SQLite database with a ``roster(id, name, counter)`` table.
+
+    Every pick is committed in its own transaction, so no journal is
+    needed and several processes can share the roster (WAL mode). An index
+    on counter makes the minimum and the minimal-counter candidates cheap
+    queries, which :meth:`draw` uses to draw without loading the roster
+    into memory. Saves only ever update counters by row id; rows the
+    loader skips, their ids and any extra columns are left alone.
+    """
+
+    name = "sqlite"
+    label = "SQLite-Datenbanken"
+    suffixes = (".db", ".sqlite", ".sqlite3")
+    journalled = False
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS roster ("
+        " id INTEGER PRIMARY KEY,"
+        " name TEXT NOT NULL,"
+        " counter INTEGER NOT NULL DEFAULT 0)",
+        "CREATE INDEX IF NOT EXISTS roster_counter ON roster (counter)",
+    )
+    # Rows the file loaders skip (see EMPTY_NAMES)
+    _VALID = "trim(name) NOT IN ('', 'nan', 'None')"
+
+    def __init__(self, path: Path, cache: Optional[RosterCache] = None) -> None:
+        # The database is its own index; *cache* is not used
+        super().__init__(path, cache)
+        self._conn = None
+        # Roster index -> row id, filled by load()
+        self._ids = array("q")
+
+    def _connect(self):
+        if self._conn is None:
+            import sqlite3  # deferred like pandas; only this backend needs it
+
+            # Loaded on the worker thread, used on the Tk thread afterwards
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            for stmt in self._SCHEMA:
+                conn.execute(stmt)
+            self._conn = conn
+        return self._conn
+
+    def _transaction(self):
+        """Context manager running a block in BEGIN IMMEDIATE … COMMIT."""
+        conn = self._connect()
+        return _SqliteTransaction(conn)
+
+    def _normalize(self, conn) -> None:
+        m = conn.execute(f"SELECT MIN(counter) FROM roster WHERE {self._VALID}").fetchone()[0]
+        if m:
+            conn.execute("UPDATE roster SET counter = counter - ?", (m,))
+
+    def read(self, progress=None, cancel=None):
+        conn = self._connect()
+        total = conn.execute("SELECT COUNT(*) FROM roster").fetchone()[0]
+        names: list[str] = []
+        counters = array("q")
+        ids = array("q")
+        cur = conn.execute(f"SELECT id, name, counter FROM roster WHERE {self._VALID} ORDER BY id")
+        n = 0
+        while True:
+            rows = cur.fetchmany(PROGRESS_EVERY)
+            if not rows:
+                break
+            for row_id, name, counter in rows:
+                ids.append(row_id)
+                names.append(str(name).strip())
+                counters.append(_to_counter(counter))
+            n += len(rows)
+            if cancel is not None and cancel():
+                raise LoadCancelled()
+            if progress is not None:
+                progress(n, n / max(1, total))
+        if not names:
+            raise ValueError("Die Datenbank enthält keine gültigen Namen.")
+        self._ids = ids
+        return names, counters, None
+
+    def apply_winner(self, idx: int) -> None:
+        with self._transaction() as conn:
+            conn.execute("UPDATE roster SET counter = counter + 1 WHERE id = ?", (self._ids[idx],))
+            self._normalize(conn)
+
+    def save(self, names, counters, changed=None, before_replace=None) -> None:
+        with self._transaction() as conn:
+            if not self._ids and conn.execute("SELECT COUNT(*) FROM roster").fetchone()[0] == 0:
+                # New database: create the rows
+                conn.executemany(
+                    "INSERT INTO roster (name, counter) VALUES (?, ?)",
+                    ((name, int(c)) for name, c in zip(names, counters)),
+                )
+                self._ids = array("q", (r[0] for r in conn.execute("SELECT id FROM roster ORDER BY id")))
+                return
+            if len(self._ids) != len(names):
+                raise StorageError("Die Namensliste passt nicht zur geladenen Datenbank.")
+            conn.executemany(
+                "UPDATE roster SET counter = ? WHERE id = ?",
+                ((int(counters[i]), self._ids[i]) for i in (range(len(names)) if changed is None else changed)),
+            )
+
+    def snapshot(self, dest: Path) -> None:
+        import sqlite3
+
+        out = sqlite3.connect(dest)
+        try:
+            self._connect().backup(out)
+        finally:
+            out.close()
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ----- queries for headless draws -----
+    # Rows the loader skips (_VALID) are never candidates, like in the GUI
+    def count(self) -> int:
+        """Number of valid rows in the roster."""
+        return self._connect().execute(f"SELECT COUNT(*) FROM roster WHERE {self._VALID}").fetchone()[0]
+
+    def _draw_one(self, conn, rng) -> str:
+        m = conn.execute(f"SELECT MIN(counter) FROM roster WHERE {self._VALID}").fetchone()[0]
+        if m is None:
+            raise ValueError("Keine Namen vorhanden.")
+        where = f"counter = ? AND {self._VALID} AND id NOT IN (SELECT id FROM temp.held)"
+        k = conn.execute(f"SELECT COUNT(*) FROM roster WHERE {where}", (m,)).fetchone()[0]
+        if not k:
+            # Everyone at the minimum was drawn: repeats are allowed
+            where = f"counter = ? AND {self._VALID}"
+            k = conn.execute(f"SELECT COUNT(*) FROM roster WHERE {where}", (m,)).fetchone()[0]
+        row_id = conn.execute(
+            f"SELECT id FROM roster WHERE {where} ORDER BY id LIMIT 1 OFFSET ?",
+            (m, rng.randrange(k)),
+        ).fetchone()[0]
+        conn.execute("UPDATE roster SET counter = counter + 1 WHERE id = ?", (row_id,))
+        conn.execute("INSERT OR IGNORE INTO temp.held VALUES (?)", (row_id,))
+        self._normalize(conn)
+        name = conn.execute("SELECT name FROM roster WHERE id = ?", (row_id,)).fetchone()[0]
+        return str(name).strip()
+
+    def draw(self, n: int, rng: Optional[random.Random] = None, commit: bool = True) -> list[str]:
+        """Draw *n* winners with the V2 batch rules.
+
+        Runs on indexed queries only: per pick the minimal counter, the
+        number of candidates at it and one of them by random offset. Names
+        drawn in this batch are skipped until everyone at the minimum was
+        drawn. Each pick is its own transaction; with *commit* False the
+        whole batch is rolled back instead (dry run).
+        """
+        rng = rng if rng is not None else random
+        conn = self._connect()
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS held (id INTEGER PRIMARY KEY)")
+        conn.execute("DELETE FROM temp.held")
+        if not commit:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                return [self._draw_one(conn, rng) for _ in range(n)]
+            finally:
+                conn.execute("ROLLBACK")
+        winners: list[str] = []
+        for _ in range(n):
+            with self._transaction():
+                winners.append(self._draw_one(conn, rng))
+        return winners
+
+
+class _SqliteTransaction:
+    """``with`` block as one IMMEDIATE transaction; errors become StorageError."""
+
+    def __init__(self, conn) -> None:
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        import sqlite3
+
+        if exc_type is None:
+            try:
+                self.conn.execute("COMMIT")
+                return False
+            except sqlite3.Error as e:
+                exc = e
+        self.conn.execute("ROLLBACK")
+        if isinstance(exc, sqlite3.Error):
+            raise StorageError(str(exc)) from exc
+        return False
+
+
+STORAGE_BACKENDS: dict[str, type[RosterStorage]] = {
+    cls.name: cls for cls in (ExcelStorage, CsvStorage, SqliteStorage)
+}
+
+
+def open_storage(
+    path: Path, backend: Optional[str] = None, cache: Optional[RosterCache] = None
+) -> RosterStorage:
+    """Storage for *path*, chosen by *backend* name or the file extension.
+
+    File backends serve unchanged files from *cache* if one is given.
+    """
+    if backend is not None:
+        try:
+            return STORAGE_BACKENDS[backend](path, cache)
+        except KeyError:
+            raise ValueError(f"Unbekanntes Speicherformat: {backend}") from None
+    suffix = path.suffix.lower()
+    for cls in STORAGE_BACKENDS.values():
+        if suffix in cls.suffixes:
+            return cls(path, cache)
+    raise ValueError(f"Unbekanntes Dateiformat: {path.suffix or path.name}")
+
+
+# ============================================================
+# Merging external edits
+# ============================================================
+class RosterDiff:
+    """Changes between the loaded roster and a re-read file, matched by name.
+
+    Apply in this order: set the counters in *changed* (old index, new
+    counter), remove *removed* (old indices, descending) by swap-remove –
+    the last entry moves into the freed slot, see FairnessEngine.remove –
+    then append *added* (name, counter). *rows* are the sheet rows of the
+    resulting index order when the file has a layout.
+    """
+
+    __slots__ = ("changed", "removed", "added", "rows")
+
+    def __init__(self) -> None:
+        self.changed: list[tuple[int, int]] = []
+        self.removed: list[int] = []
+        self.added: list[tuple[str, int]] = []
+        self.rows: Optional[array] = None
+
+    def __bool__(self) -> bool:
+        return bool(self.changed or self.removed or self.added)
+
+    def __len__(self) -> int:
+        return len(self.changed) + len(self.removed) + len(self.added)
+
+
+def diff_roster(
+    old_names: Sequence[str],
+    old_counters: Sequence[int],
+    new_names: Sequence[str],
+    new_counters: Sequence[int],
+    new_rows: Optional[array] = None,
+) -> RosterDiff:
+    """Diff a re-read roster against the loaded one.
+
+    *old_counters* are the counters as last read from or written to the
+    file, so only external counter edits show up in *changed*. Duplicate
+    names are paired in file order.
+    """
+    diff = RosterDiff()
+    n_old, n_new = len(old_names), len(new_names)
+    # Edits are usually local: rows before the first and after the last
+    # differing name pair up by position, only the middle is matched by name
+    lo = next(
+        (k for k, (a, b) in enumerate(zip(old_names, new_names)) if a != b), min(n_old, n_new)
+    )
+    hi = next(
+        (k for k, (a, b) in enumerate(zip(reversed(old_names), reversed(new_names)))
+         if a != b or k >= min(n_old, n_new) - lo),
+        min(n_old, n_new) - lo,
+    )
+    # old index of every new row, -1 for additions
+    match = array("q", range(n_new))
+    for j in range(n_new - hi, n_new):
+        match[j] = j - n_new + n_old
+
+    positions: dict[str, list[int]] = {}
+    for i in range(n_old - hi - 1, lo - 1, -1):
+        positions.setdefault(old_names[i], []).append(i)
+    for j in range(lo, n_new - hi):
+        stack = positions.get(new_names[j])
+        if stack:
+            match[j] = stack.pop()
+        else:
+            match[j] = -1
+            diff.added.append((new_names[j], new_counters[j]))
+    diff.removed = sorted((i for stack in positions.values() for i in stack), reverse=True)
+    diff.changed = [
+        (i, c) for i, c in zip(match, new_counters) if i >= 0 and old_counters[i] != c
+    ]
+
+    if new_rows is not None:
+        # Replay the index moves to find the sheet row of every final index
+        row_of_old = array("i", bytes(4 * len(old_names)))
+        for j, i in enumerate(match):
+            if i >= 0:
+                row_of_old[i] = new_rows[j]
+        rows = row_of_old
+        for i in diff.removed:
+            rows[i] = rows[-1]
+            rows.pop()
+        rows.extend(new_rows[j] for j, i in enumerate(match) if i < 0)
+        diff.rows = rows
+    return diff
+
+
+# ============================================================
+# Draw journal
+# ============================================================
+class DrawJournal:
+    """Append-only log of draws next to a roster file.
+
+    Each applied winner is one small JSON line instead of a full workbook
+    rewrite. The first line identifies the snapshot (size and mtime of the
+    roster file) the records apply to; :meth:`replay` re-applies them after
+    a restart or crash. Compaction writes the roster back with all picks
+    included: :meth:`mark_compacting` before the new file replaces the old
+    one, :meth:`reset` afterwards.
+
+    Records are written through immediately; fsync is batched: at most
+    every *sync_every* picks or *sync_seconds*, and always at the end of a
+    batch.
+
+    Compaction may run on another thread while draws continue:
+    :meth:`checkpoint` marks the state being saved, records written after
+    it are carried over by ``reset(carry=True)``. Writes are serialised by
+    a lock.
+    """
+
+    def __init__(self, xls_path: Path, sync_every: int = 16, sync_seconds: float = 1.0) -> None:
+        self.xls_path = xls_path
+        self.path = xls_path.with_name(xls_path.name + ".journal")
+        self.sync_every = sync_every
+        self.sync_seconds = sync_seconds
+        self.picks = 0          # picks recorded since the snapshot
+        self.batch_open = False
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._file = None
+        self._lock = threading.RLock()
+        # Records written since checkpoint(), None without a checkpoint
+        self._carry: Optional[list[dict]] = None
+
+    # ----- reading -----
+    @staticmethod
+    def _file_id(path: Path, op: str) -> dict:
+        st = path.stat()
+        return {"op": op, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    def read(self) -> list[dict]:
+        """Records that still have to be applied to the roster file.
+
+        Returns [] if there is no journal or if the file already contains
+        its picks (a crash between writing the roster and :meth:`reset`).
+        If the file was edited externally, the picks are returned anyway and
+        replayed by name on top of the edited roster. A torn last line from
+        a crash during writing is ignored.
+        """
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return []
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+        if not records:
+            return []
+        if records[0] != self._file_id(self.xls_path, "snapshot"):
+            compacted = self._file_id(self.xls_path, "compacting")
+            ends = [i for i, r in enumerate(records) if r == compacted]
+            if ends:
+                # The file already holds every pick before the checkpoint
+                # of that compaction; only the records after it still apply
+                end = ends[-1]
+                start = max((i for i in range(end) if records[i].get("op") == "checkpoint"), default=end)
+                records = records[start:]
+        return [r for r in records[1:] if r.get("op") not in ("compacting", "checkpoint")]
+
+    def replay(self, names: Sequence[str], engine) -> Optional[tuple[list[int], list[int]]]:
+        """Apply the journalled picks to *engine*.
+
+        Picks are matched by index and verified by name, falling back to a
+        name lookup. Returns ``(planned_winners, picked)`` if the last batch
+        was interrupted, else None.
+        """
+        by_name: Optional[dict[str, int]] = None
+
+        def resolve(idx: int, name: str) -> Optional[int]:
+            nonlocal by_name
+            if 0 <= idx < len(names) and names[idx] == name:
+                return idx
+            if by_name is None:
+                by_name = {n: i for i, n in enumerate(names)}
+            return by_name.get(name)
+
+        pending: Optional[tuple[list[int], list[int]]] = None
+        for rec in self.read():
+            op = rec.get("op")
+            if op == "begin":
+                engine.clear_batch()
+                planned = [resolve(i, n) for i, n in rec["winners"]]
+                pending = ([i for i in planned if i is not None], [])
+            elif op == "pick":
+                idx = resolve(rec["idx"], rec["name"])
+                if idx is not None:
+                    engine.apply_winner(idx)
+                    if pending is not None:
+                        pending[1].append(idx)
+                self.picks += 1
+            elif op == "end":
+                engine.clear_batch()
+                pending = None
+        self.batch_open = pending is not None
+        return pending
+
+    # ----- writing -----
+    def _write(self, record: dict) -> None:
+        with self._lock:
+            if self._file is None:
+                if not self.path.exists():
+                    self.reset()
+                # Line-buffered: every record reaches the OS at once (survives
+                # an app crash); fsync for power loss is batched in pick()
+                self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+            self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self._unsynced += 1
+            if self._carry is not None:
+                self._carry.append(record)
+
+    def begin_batch(self, winners: Sequence[int], names: Sequence[str]) -> None:
+        with self._lock:
+            self._write({"op": "begin", "winners": [[i, names[i]] for i in winners]})
+            self.batch_open = True
+
+    def pick(self, idx: int, name: str) -> None:
+        with self._lock:
+            self._write({"op": "pick", "idx": idx, "name": name})
+            self.picks += 1
+            if (self._unsynced >= self.sync_every
+                    or time.monotonic() - self._last_sync >= self.sync_seconds):
+                self.sync()
+
+    def end_batch(self, sync: bool = True) -> None:
+        """Close the batch; *sync* False leaves the fsync to a later :meth:`sync`."""
+        with self._lock:
+            self._write({"op": "end"})
+            self.batch_open = False
+            if sync:
+                self.sync()
+
+    def sync(self) -> None:
+        """Flush and fsync all written records."""
+        with self._lock:
+            if self._file is not None and self._unsynced:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            self._unsynced = 0
+            self._last_sync = time.monotonic()
+
+    def checkpoint(self) -> None:
+        """Mark the state a background compaction is about to save.
+
+        Call between batches, on the thread that writes the picks.
+        """
+        with self._lock:
+            self._carry = None
+            self._write({"op": "checkpoint"})
+            self._carry = []
+
+    def drop_checkpoint(self) -> None:
+        """The compaction failed; keep journalling as before."""
+        self._carry = None
+
+    def mark_compacting(self, new_file: Path) -> None:
+        """Record that *new_file* (with all picks) is about to replace the roster."""
+        self._write(self._file_id(new_file, "compacting"))
+        self.sync()
+
+    def reset(self, carry: bool = False) -> None:
+        """Start an empty journal for the current state of the roster file.
+
+        Call after the roster was written back (compaction). The new journal
+        replaces the old one atomically; if a crash happens in between, the
+        old journal no longer matches the file and is ignored. With *carry*,
+        the records written since :meth:`checkpoint` are kept.
+        """
+        with self._lock:
+            carried = [r for r in self._carry or () if r["op"] != "compacting"] if carry else []
+            self._carry = None
+            self.close()
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(json.dumps(self._file_id(self.xls_path, "snapshot")) + "\n")
+                for record in carried:
+                    f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            tmp.replace(self.path)
+            self.picks = sum(1 for r in carried if r["op"] == "pick")
+            self.batch_open = False
+            for r in carried:
+                if r["op"] in ("begin", "end"):
+                    self.batch_open = r["op"] == "begin"
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self.sync()
+                self._file.close()
+                self._file = None
+
+
+# ============================================================
+# Shuffle deck
+# ============================================================
+class DeckFile:
+    """Position of the shuffle-deck cycle next to a roster file.
+
+    The first line holds the undealt cards (see ``ShuffleDeck.state``) and
+    is rewritten atomically when the deck changes; dealing only appends a
+    small ``{"pos": k}`` line. A torn last line from a crash
+    is ignored, a lost one just re-deals a card: the engine checks every card
+    against the counters before it counts.
+    """
+
+    def __init__(self, xls_path: Path) -> None:
+        self.path = xls_path.with_name(xls_path.name + ".deck")
+
+    def read(self) -> Optional[tuple[list, int]]:
+        """``(cards, pos)`` of the saved deck, *pos* relative to *cards*.
+
+        None if there is no (readable) deck.
+        """
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return None
+        try:
+            head = json.loads(lines[0])
+            cards, start = head["cards"], int(head["start"])
+        except (IndexError, ValueError, KeyError, TypeError):
+            return None
+        pos = start
+        for line in lines[1:]:
+            try:
+                pos = int(json.loads(line)["pos"])
+            except (ValueError, KeyError, TypeError):
+                break
+        return cards, max(0, pos - start)
+
+    def write(self, state: dict) -> None:
+        """Replace the file with a new deck (see ShuffleDeck.state)."""
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(state, ensure_ascii=False, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        tmp.replace(self.path)
+
+    def advance(self, pos: int) -> None:
+        """Record that the deck was dealt up to *pos*."""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"pos": pos}) + "\n")
+
+    def remove(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Glücksrad – Ziehungsdienst (HTTP/JSON)
+
+Local asyncio service for chat bots and dashboards:
+
+    python gluecksrad_server.py --roster team_a.xlsx --roster team_b.csv
+
+    GET  /rosters                      -> {"rosters": [{"name", "file", "entries", "unsaved"}]}
+    POST /draw  {"roster": "team_a", "n": 3, "seed": 1}
+                                       -> {"roster": "team_a", "winners": [...]}
+
+Rosters are loaded once through the storage backends and kept in memory.
+Draws on one roster are serialised by its lock, different rosters proceed
+independently. For roster files, picks go to the draw journal without
+fsync on the request path; a background task fsyncs every second and
+writes the counters back to the file in batches. Database rosters commit
+each pick within the request. Listens on 127.0.0.1 by default.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import signal
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+from gluecksrad_engine import BATCH_DRAW_MIN, FairnessEngine, draw_and_apply
+from gluecksrad_io import (
+    STORAGE_BACKENDS,
+    DrawJournal,
+    RosterCache,
+    RosterStorage,
+    open_storage,
+)
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s  %(levelname)s  %(message)s")
+log = logging.getLogger(__name__)
+
+MAX_BODY = 64 * 1024
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+# ============================================================
+# Rosters
+# ============================================================
+class LoadedRoster:
+    """One roster held in memory, with its lock, journal and save state."""
+
+    def __init__(self, name: str, storage: RosterStorage) -> None:
+        self.name = name
+        self.storage = storage
+        self.lock = asyncio.Lock()
+        self.names: list[str] = []
+        self.engine = FairnessEngine()
+        self._changes = self.engine.track()
+        self.journal: Optional[DrawJournal] = None
+        self.rng = random.Random()
+        self.unsaved = 0  # picks not yet written to the roster file
+
+    def load(self) -> None:
+        """Read the roster and replay journalled picks (runs in a thread)."""
+        self.names, counters, _ = self.storage.read()
+        self.engine.reset(counters)
+        self._changes.drain()
+        if self.storage.journalled:
+            # fsync is done by the service's sync task, never per request
+            self.journal = DrawJournal(self.storage.path, sync_every=1 << 30, sync_seconds=float("inf"))
+            self.journal.replay(self.names, self.engine)
+            self.engine.clear_batch()
+            self.unsaved = self.journal.picks
+
+    def draw(self, n: int, rng: random.Random) -> list[int]:
+        winners = draw_and_apply(self.engine, min(n, len(self.names)), rng)
+        if self.journal is not None:
+            self.journal.begin_batch(winners, self.names)
+            for idx in winners:
+                self.journal.pick(idx, self.names[idx])
+            self.journal.end_batch(sync=False)
+            self.unsaved += len(winners)
+        else:
+            # Databases commit every pick (see commit); nothing is left
+            # for the periodic save
+            self._changes.drain()
+        return winners
+
+    def commit(self, winners: Sequence[int]) -> None:
+        """Commit the picks of a database roster (runs in a thread)."""
+        for idx in winners:
+            self.storage.apply_winner(idx)
+
+    def save(self) -> None:
+        """Write the counters back and reset the journal (runs in a thread)."""
+        indices, offset_changed = self._changes.drain()
+        try:
+            self.storage.save(
+                self.names,
+                self.engine.counters(),
+                None if offset_changed else indices,
+                before_replace=self.journal.mark_compacting if self.journal is not None else None,
+            )
+        except Exception:
+            if offset_changed:
+                self._changes.mark_offset()
+            for i in indices:
+                self._changes.mark(i)
+            raise
+        if self.journal is not None:
+            self.journal.reset()
+        self.unsaved = 0
+
+    def close(self) -> None:
+        if self.journal is not None:
+            self.journal.close()
+        self.storage.close()
+
+
+# ============================================================
+# Service
+# ============================================================
+class DrawService:
+    """Rosters by name plus the background persistence task."""
+
+    def __init__(self, save_every: int = 500, save_seconds: float = 30.0, sync_seconds: float = 1.0) -> None:
+        self.rosters: dict[str, LoadedRoster] = {}
+        self.save_every = save_every
+        self.save_seconds = save_seconds
+        self.sync_seconds = sync_seconds
+        self._persist_task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    async def add(self, path: Path, backend: Optional[str] = None, cache: Optional[RosterCache] = None) -> None:
+        name = path.stem
+        if name in self.rosters:
+            raise ValueError(f"Liste {name!r} ist doppelt angegeben.")
+        roster = LoadedRoster(name, open_storage(path, backend, cache))
+        await asyncio.to_thread(roster.load)
+        self.rosters[name] = roster
+        log.info("Loaded roster %r: %d names from %s", name, len(roster.names), path)
+
+    def start(self) -> None:
+        self._stopping = asyncio.Event()
+        self._persist_task = asyncio.create_task(self._persist_loop())
+
+    async def close(self) -> None:
+        if self._persist_task is not None:
+            # Let a running save finish instead of cancelling it half-way
+            self._stopping.set()
+            await self._persist_task
+        for roster in self.rosters.values():
+            async with roster.lock:
+                if roster.unsaved:
+                    await self._save(roster)
+                roster.close()
+
+    # ----- persistence, off the request path -----
+    async def _persist_loop(self) -> None:
+        last_save = time.monotonic()
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.sync_seconds)
+            except asyncio.TimeoutError:
+                pass
+            save_all = time.monotonic() - last_save >= self.save_seconds
+            for roster in self.rosters.values():
+                if roster.journal is not None:
+                    async with roster.lock:
+                        await asyncio.to_thread(roster.journal.sync)
+                if roster.unsaved and (save_all or roster.unsaved >= self.save_every):
+                    # Draws on this roster wait; the others carry on
+                    async with roster.lock:
+                        await self._save(roster)
+            if save_all:
+                last_save = time.monotonic()
+
+    async def _save(self, roster: LoadedRoster) -> None:
+        try:
+            await asyncio.to_thread(roster.save)
+            log.info("Saved roster %r", roster.name)
+        except Exception:
+            log.exception("Speichern von %r fehlgeschlagen", roster.name)
+
+    # ----- requests -----
+    async def draw(self, body: dict) -> dict:
+        roster = self.rosters.get(body.get("roster"))
+        if roster is None:
+            raise HTTPError(404, f"Unbekannte Liste: {body.get('roster')!r}")
+        n = body.get("n", 1)
+        seed = body.get("seed")
+        if not isinstance(n, int) or isinstance(n, bool) or n < 1:
+            raise HTTPError(400, "'n' muss eine ganze Zahl ≥ 1 sein.")
+        if seed is not None and not isinstance(seed, int):
+            raise HTTPError(400, "'seed' muss eine ganze Zahl sein.")
+        rng = random.Random(seed) if seed is not None else roster.rng
+        async with roster.lock:
+            if n >= BATCH_DRAW_MIN:
+                # Large batches run in a thread so other rosters are served meanwhile
+                winners = await asyncio.to_thread(roster.draw, n, rng)
+            else:
+                winners = roster.draw(n, rng)
+            if roster.journal is None:
+                # Database I/O (transactions, busy waits) stays off the loop
+                await asyncio.to_thread(roster.commit, winners)
+            return {"roster": roster.name, "winners": [roster.names[i] for i in winners]}
+
+    def list_rosters(self) -> dict:
+        return {"rosters": [
+            {"name": r.name, "file": str(r.storage.path), "entries": len(r.names), "unsaved": r.unsaved}
+            for r in self.rosters.values()
+        ]}
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> dict:
+        path = target.split("?", 1)[0]
+        if path == "/rosters":
+            if method != "GET":
+                raise HTTPError(405, "Nur GET erlaubt.")
+            return self.list_rosters()
+        if path == "/draw":
+            if method != "POST":
+                raise HTTPError(405, "Nur POST erlaubt.")
+            try:
+                data = json.loads(body or b"{}")
+            except ValueError:
+                raise HTTPError(400, "Ungültiges JSON.") from None
+            if not isinstance(data, dict):
+                raise HTTPError(400, "JSON-Objekt erwartet.")
+            return await self.draw(data)
+        raise HTTPError(404, f"Unbekannter Pfad: {path}")
+
+
+# ============================================================
+# HTTP/1.1 (keep-alive, Content-Length bodies only)
+# ============================================================
+async def _read_request(reader: asyncio.StreamReader) -> Optional[tuple[str, str, dict, bytes]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise HTTPError(400, "Ungültige Anfragezeile.")
+    method, target, version = parts
+    headers = {"_version": version}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0) or 0)
+    if length > MAX_BODY:
+        raise HTTPError(413, "Anfrage zu groß.")
+    body = await reader.readexactly(length) if length else b""
+    return method, target, headers, body
+
+
+def _response(status: int, payload: dict, keep_alive: bool) -> bytes:
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        + ("" if keep_alive else "Connection: close\r\n")
+        + "\r\n"
+    )
+    return head.encode("latin-1") + data
+
+
+def make_handler(service: DrawService):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except HTTPError as e:
+                    writer.write(_response(e.status, {"error": str(e)}, False))
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = (
+                    headers["_version"] == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close"
+                )
+                try:
+                    status, payload = 200, await service.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    log.exception("Anfrage fehlgeschlagen")
+                    status, payload = 500, {"error": str(e)}
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+# ============================================================
+# Main
+# ============================================================
+async def serve(
+    paths: Sequence[Path], host: str = "127.0.0.1", port: int = 8765,
+    backend: Optional[str] = None, cache: Optional[RosterCache] = None,
+    ready: Optional[asyncio.Event] = None,
+) -> None:
+    """Load *paths* and serve until cancelled; unsaved picks are written on exit."""
+    service = DrawService()
+    try:
+        # SIGTERM (systemd, docker stop) shuts down like Ctrl+C, saving first
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except (NotImplementedError, AttributeError):
+        pass  # Windows
+    try:
+        await asyncio.gather(*(service.add(p, backend, cache) for p in paths))
+        service.start()
+        server = await asyncio.start_server(make_handler(service), host, port)
+        log.info("Listening on http://%s:%d", host, port)
+        if ready is not None:
+            ready.set()
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Glücksrad – Ziehungsdienst (HTTP/JSON)")
+    parser.add_argument("--roster", type=Path, action="append", required=True,
+                        help="Namensliste; Name in Anfragen = Dateiname ohne Endung (mehrfach möglich)")
+    parser.add_argument("--host", default="127.0.0.1", help="Adresse (Standard: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port (Standard: 8765)")
+    parser.add_argument("--backend", choices=sorted(STORAGE_BACKENDS),
+                        help="Speicherformat erzwingen (Standard: nach Dateiendung)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.roster, args.host, args.port, args.backend, RosterCache()))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
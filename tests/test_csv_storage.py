@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""CSV backend: block parser must keep names and counters aligned."""
+
+import sys
+from array import array
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import gluecksrad_io  # noqa: E402
+from gluecksrad_io import CsvStorage  # noqa: E402
+
+
+def _read(tmp_path: Path, body: str) -> tuple[list[str], list[int]]:
+    path = tmp_path / "roster.csv"
+    path.write_text("Name;Counter\r\n" + body, encoding="utf-8")
+    names, counters, _ = CsvStorage(path).read()
+    return names, list(counters)
+
+
+def test_malformed_counter_mid_block(tmp_path):
+    rows = [f"P{i};{i}" for i in range(50)]
+    rows[30] = "P30;2.7"
+    rows[40] = "P40;x"
+    rows[45] = "P45;"
+    names, counters = _read(tmp_path, "\r\n".join(rows) + "\r\n")
+    expected = list(range(50))
+    expected[30], expected[40], expected[45] = 2, 0, 0
+    assert names == [f"P{i}" for i in range(50)]
+    assert counters == expected
+
+
+def test_mixed_width_rows(tmp_path):
+    # One row without a delimiter and one with an extra field: the total
+    # delimiter count matches the line count, the pairing must not shift
+    names, counters = _read(tmp_path, "A;1\r\nB\r\nC;3;extra\r\nD;4\r\n")
+    assert names == ["A", "B", "C", "D"]
+    assert counters == [1, 0, 3, 4]
+
+
+def test_malformed_counter_across_small_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(gluecksrad_io, "CSV_BLOCK", 16)
+    names, counters = _read(tmp_path, "A;1\nB;x\nC;3\nD\nE;5;6\n")
+    assert names == ["A", "B", "C", "D", "E"]
+    assert counters == [1, 0, 3, 0, 5]
+
+
+def test_unclosed_quote_ends_with_its_line(tmp_path, monkeypatch):
+    monkeypatch.setattr(gluecksrad_io, "CSV_BLOCK", 16)
+    names, counters = _read(tmp_path, 'A;1\n"B;2\nC;3\n"D;E";4\nF;5\n')
+    assert names == ["A", "B;2", "C", "D;E", "F"]
+    assert counters == [1, 0, 3, 4, 5]
+
+
+def test_counter_beyond_int64_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Bereichs"):
+        _read(tmp_path, "A;1\nB;99999999999999999999\n")
+
+
+def test_save_round_trip_with_special_names(tmp_path):
+    path = tmp_path / "roster.csv"
+    storage = CsvStorage(path)
+    storage.save(['a;b', '"q"', "line\nbreak", "plain"], array("q", [1, 2, 3, 4]))
+    names, counters, _ = CsvStorage(path).read()
+    assert names == ['a;b', '"q"', "line break", "plain"]
+    assert list(counters) == [1, 2, 3, 4]
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""Merging external edits: diff_roster must reproduce the re-read file."""
+
+import random
+import sys
+from array import array
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gluecksrad_io import diff_roster  # noqa: E402
+
+
+def _apply(names: list[str], counters: list[int], diff) -> tuple[list[str], list[int]]:
+    """Apply *diff* in the documented order (set, swap-remove, append)."""
+    names, counters = list(names), list(counters)
+    for i, c in diff.changed:
+        counters[i] = c
+    for i in diff.removed:
+        names[i], counters[i] = names[-1], counters[-1]
+        names.pop()
+        counters.pop()
+    for name, c in diff.added:
+        names.append(name)
+        counters.append(c)
+    return names, counters
+
+
+def _check(old_names, old_counters, new_names, new_counters):
+    rows = array("q", range(2, len(new_names) + 2))
+    diff = diff_roster(old_names, old_counters, new_names, new_counters, rows)
+    names, counters = _apply(old_names, old_counters, diff)
+    assert sorted(zip(names, counters)) == sorted(zip(new_names, new_counters))
+    # Every final index points at the sheet row holding its name
+    assert [new_names[r - 2] for r in diff.rows] == names
+    return diff
+
+
+def test_unchanged_roster_gives_an_empty_diff():
+    diff = _check(["A", "B"], [0, 1], ["A", "B"], [0, 1])
+    assert not diff
+
+
+def test_counter_edit():
+    diff = _check(["A", "B", "C"], [0, 1, 2], ["A", "B", "C"], [0, 5, 2])
+    assert diff.changed == [(1, 5)] and not diff.removed and not diff.added
+
+
+def test_add_and_remove():
+    diff = _check(["A", "B", "C", "D"], [0, 0, 1, 1], ["A", "C", "D", "E"], [0, 1, 1, 3])
+    assert diff.removed == [1]
+    assert diff.added == [("E", 3)]
+    assert not diff.changed
+
+
+def test_rename_is_a_remove_plus_an_add():
+    diff = _check(["Anna", "Bob", "Cem"], [1, 2, 3], ["Anna", "Bobby", "Cem"], [1, 2, 3])
+    assert diff.removed == [1]
+    assert diff.added == [("Bobby", 2)]
+
+
+def test_duplicate_names_pair_in_file_order():
+    diff = _check(["A", "X", "A"], [1, 0, 2], ["A", "A"], [1, 2])
+    assert diff.removed == [1] and not diff.changed
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_random_edits(seed):
+    rng = random.Random(seed)
+    old_names = [f"P{rng.randrange(40)}" for _ in range(rng.randrange(0, 30))]
+    old_counters = [rng.randrange(3) for _ in old_names]
+    new = list(zip(old_names, old_counters))
+    for _ in range(rng.randrange(6)):
+        op = rng.randrange(3)
+        if op == 0 and new:
+            del new[rng.randrange(len(new))]
+        elif op == 1:
+            new.insert(rng.randrange(len(new) + 1), (f"N{rng.randrange(9)}", rng.randrange(3)))
+        elif new:
+            j = rng.randrange(len(new))
+            new[j] = (new[j][0], rng.randrange(5))
+    _check(old_names, old_counters, [n for n, _ in new], [c for _, c in new])
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Fairness engine and batch draws must follow the original V2 rule."""
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gluecksrad_engine import (  # noqa: E402
+    BATCH_DRAW_MIN,
+    FairnessEngine,
+    MinCounterStrategy,
+    draw_and_apply,
+    draw_batch,
+)
+
+
+def _v2_eligible(counters: list[int], excluded: set[int]) -> set[int]:
+    """``eligible_indices`` minus this batch's winners, as in gluecksrad_V2 1.0."""
+    m = min(counters)
+    elig = [i for i, c in enumerate(counters) if c == m]
+    return {i for i in elig if i not in excluded} or set(elig)
+
+
+def _v2_replay(counters, winners) -> list[int]:
+    """Apply *winners* one by one, checking each was eligible; normalised result."""
+    c = list(counters)
+    excluded: set[int] = set()
+    for w in winners:
+        assert w in _v2_eligible(c, excluded)
+        excluded.add(w)
+        c[w] += 1
+        m = min(c)
+        c = [v - m for v in c]
+    return c
+
+
+def _roster(rng: random.Random, n: int, spread: int) -> list[int]:
+    counters = [rng.randrange(spread) for _ in range(n)]
+    m = min(counters)
+    return [c - m for c in counters]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_engine_candidates_match_v2(seed):
+    rng = random.Random(seed)
+    counters = _roster(rng, rng.randrange(1, 30), 4)
+    engine = FairnessEngine(counters)
+    reference = list(counters)
+    excluded: set[int] = set()
+    for _ in range(2 * len(counters) + 3):
+        assert set(engine.candidates()) == _v2_eligible(reference, excluded)
+        w = engine.pick(rng)
+        engine.apply_winner(w)
+        excluded.add(w)
+        reference[w] += 1
+        m = min(reference)
+        reference = [v - m for v in reference]
+        assert engine.counters() == reference
+    engine.clear_batch()
+    assert set(engine.candidates()) == _v2_eligible(reference, set())
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_min_counter_strategy_small_batches(seed):
+    rng = random.Random(seed)
+    counters = _roster(rng, 40, 3)
+    engine = FairnessEngine(counters)
+    for n in (1, 5, 40, 90):
+        winners = MinCounterStrategy().draw(engine, n, rng)
+        assert len(winners) == n
+        expected = _v2_replay(engine.counters(), winners)
+        for w in winners:
+            engine.apply_winner(w)
+        engine.clear_batch()
+        assert engine.counters() == expected
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("n", [1, 7, 50, 137, 400])
+def test_draw_batch_matches_v2(seed, n):
+    rng = random.Random(seed)
+    counters = _roster(rng, 60, 5)
+    winners, out = draw_batch(counters, n, np.random.default_rng(seed))
+    assert len(winners) == n
+    assert out.tolist() == _v2_replay(counters, winners.tolist())
+
+
+def test_draw_batch_handles_wide_counter_ranges():
+    counters = [0, 10**12, 5, 10**12, 0]
+    winners, out = draw_batch(counters, 4, np.random.default_rng(1))
+    assert out.tolist() == _v2_replay(counters, winners.tolist())
+
+
+@pytest.mark.parametrize("n", [3, BATCH_DRAW_MIN + 10])
+def test_draw_and_apply_uses_both_paths(n):
+    rng = random.Random(n)
+    counters = _roster(rng, 300, 3)
+    engine = FairnessEngine(counters)
+    winners = draw_and_apply(engine, n, rng)
+    assert engine.counters() == _v2_replay(counters, winners)
+    # The batch is closed: the next pick may hit anyone at the minimum again
+    assert set(engine.candidates()) == _v2_eligible(engine.counters(), set())
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""Excel backend: counters are patched into the workbook in place."""
+
+import os
+import sys
+import time
+from array import array
+from pathlib import Path
+
+import openpyxl
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gluecksrad_io import ExcelStorage  # noqa: E402
+
+
+def _workbook(path: Path, rows: list[tuple], extra_sheet: bool = True) -> Path:
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Namen"
+    ws.append(["Name", "Counter", "Notiz"])
+    for row in rows:
+        ws.append(list(row))
+    ws["C2"].font = openpyxl.styles.Font(bold=True)
+    if extra_sheet:
+        wb.create_sheet("Info")["A1"] = "bleibt"
+    wb.save(path)
+    return path
+
+
+def _touch(path: Path) -> None:
+    # Make an external edit visible even within the mtime resolution
+    t = time.time() + 5
+    os.utime(path, (t, t))
+
+
+def _sheet(path: Path) -> list[tuple]:
+    wb = openpyxl.load_workbook(path)
+    return [tuple(r) for r in wb.worksheets[0].iter_rows(min_row=2, values_only=True)]
+
+
+def test_patch_round_trip_keeps_the_rest_of_the_workbook(tmp_path):
+    path = _workbook(tmp_path / "namen.xlsx", [("Anna", 0, "x"), ("Bob", 2, None), ("Cem", 1, "y")])
+    storage = ExcelStorage(path)
+    names, counters, _ = storage.read()
+    assert names == ["Anna", "Bob", "Cem"] and list(counters) == [0, 2, 1]
+    counters[0], counters[2] = 3, 4
+    storage.save(names, counters, changed=[0, 2])
+
+    assert _sheet(path) == [("Anna", 3, "x"), ("Bob", 2, None), ("Cem", 4, "y")]
+    wb = openpyxl.load_workbook(path)
+    assert wb["Namen"]["C2"].font.bold
+    assert wb["Info"]["A1"].value == "bleibt"
+    # The returned layout is valid for the file just written
+    names2, counters2, _ = ExcelStorage(path).read()
+    assert names2 == names and list(counters2) == [3, 2, 4]
+
+
+def test_patch_after_external_reorder_matches_by_name(tmp_path):
+    path = _workbook(tmp_path / "namen.xlsx", [("Anna", 0), ("Bob", 0), ("Cem", 0)])
+    storage = ExcelStorage(path)
+    names, counters, _ = storage.read()
+    _workbook(path, [("Cem", 0), ("Anna", 0), ("Bob", 0), ("Dora", 5)])
+    _touch(path)
+    counters[1] = 1
+    storage.save(names, counters, changed=[1])
+    assert [r[:2] for r in _sheet(path)] == [("Cem", 0), ("Anna", 0), ("Bob", 1), ("Dora", 5)]
+
+
+def test_patch_with_duplicate_names_prefers_the_same_index(tmp_path):
+    path = _workbook(tmp_path / "namen.xlsx", [("Anna", 0), ("Bob", 0), ("Anna", 0)])
+    storage = ExcelStorage(path)
+    names, counters, _ = storage.read()
+    _workbook(path, [("Anna", 1), ("Bob", 2), ("Anna", 3), ("Cem", 4)])
+    _touch(path)
+    counters[0] = 7
+    storage.save(names, counters, changed=[0])
+    assert [r[:2] for r in _sheet(path)] == [("Anna", 7), ("Bob", 2), ("Anna", 3), ("Cem", 4)]
+
+
+def test_ambiguous_names_fall_back_to_a_full_save(tmp_path):
+    path = _workbook(tmp_path / "namen.xlsx", [("Anna", 0), ("Bob", 0), ("Anna", 0)])
+    storage = ExcelStorage(path)
+    names, counters, _ = storage.read()
+    _workbook(path, [("Bob", 5), ("Anna", 5), ("Anna", 5)])
+    _touch(path)
+    counters[0] = 7
+    storage.save(names, counters, changed=[0])
+    assert [r[:2] for r in _sheet(path)] == [("Anna", 7), ("Bob", 0), ("Anna", 0)]
+
+
+def test_name_only_sheet_gets_a_counter_column(tmp_path):
+    path = tmp_path / "namen.xlsx"
+    wb = openpyxl.Workbook()
+    wb.active.append(["Name"])
+    for name in ("Anna", "Bob"):
+        wb.active.append([name])
+    wb.save(path)
+    storage = ExcelStorage(path)
+    names, counters, _ = storage.read()
+    storage.save(names, array("q", [1, 0]), changed=[0])
+    names2, counters2, _ = ExcelStorage(path).read()
+    assert names2 == ["Anna", "Bob"] and list(counters2) == [1, 0]
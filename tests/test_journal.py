@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""Draw journal: replay after a restart, compaction and torn writes."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gluecksrad_engine import FairnessEngine  # noqa: E402
+from gluecksrad_io import DrawJournal  # noqa: E402
+
+NAMES = ["Anna", "Bob", "Cem", "Dana"]
+
+
+def _roster(tmp_path: Path, text: str = "Name;Counter\r\n") -> Path:
+    path = tmp_path / "roster.csv"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def _batch(journal: DrawJournal, winners: list[int], end: bool = True) -> None:
+    journal.begin_batch(winners, NAMES)
+    for i in winners:
+        journal.pick(i, NAMES[i])
+    if end:
+        journal.end_batch()
+
+
+def _replay(path: Path, counters=(0, 0, 0, 0), names=NAMES):
+    engine = FairnessEngine(counters)
+    pending = DrawJournal(path).replay(names, engine)
+    return engine.counters(), pending
+
+
+def test_replay_after_restart(tmp_path):
+    path = _roster(tmp_path)
+    journal = DrawJournal(path)
+    _batch(journal, [0, 2])
+    _batch(journal, [1, 3])
+    _batch(journal, [2])
+    journal.close()
+    counters, pending = _replay(path)
+    assert counters == [0, 0, 1, 0]  # normalised
+    assert pending is None
+
+
+def test_interrupted_batch_is_reported(tmp_path):
+    path = _roster(tmp_path)
+    journal = DrawJournal(path)
+    journal.begin_batch([3, 1, 0], NAMES)
+    journal.pick(3, "Dana")
+    journal.close()
+    counters, pending = _replay(path)
+    assert counters == [0, 0, 0, 1]
+    assert pending == ([3, 1, 0], [3])
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    path = _roster(tmp_path)
+    journal = DrawJournal(path)
+    _batch(journal, [0, 1])
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"op":"pick","idx":2,"na')
+    counters, pending = _replay(path)
+    assert counters == [1, 1, 0, 0]
+    assert pending is None
+
+
+def test_replay_falls_back_to_names(tmp_path):
+    path = _roster(tmp_path)
+    journal = DrawJournal(path)
+    _batch(journal, [1])
+    journal.close()
+    # Same snapshot, rows reordered: Bob is now index 3
+    counters, _ = _replay(path, names=["Anna", "Dana", "Cem", "Bob"])
+    assert counters == [0, 0, 0, 1]
+
+
+def test_journal_of_another_file_version_is_replayed_by_name(tmp_path):
+    path = _roster(tmp_path)
+    journal = DrawJournal(path)
+    _batch(journal, [2])
+    journal.close()
+    path.write_text("Name;Counter\r\nedited externally\r\n", encoding="utf-8")
+    counters, _ = _replay(path)
+    assert counters == [0, 0, 1, 0]
+
+
+def _compact(journal: DrawJournal, path: Path, text: str, crash: bool = False) -> None:
+    """Write *text* as the new roster the way the GUI's compaction does."""
+    tmp = path.with_name("roster.tmp.csv")
+    tmp.write_text(text, encoding="utf-8")
+    journal.mark_compacting(tmp)
+    tmp.replace(path)
+    if not crash:
+        journal.reset(carry=True)
+
+
+def test_compaction_keeps_picks_after_checkpoint(tmp_path):
+    path = _roster(tmp_path)
+    journal = DrawJournal(path)
+    _batch(journal, [0, 1])
+    journal.checkpoint()
+    # Draws continue while the compaction runs in the background
+    _batch(journal, [2])
+    _compact(journal, path, "Name;Counter\r\nAnna;1\r\nBob;1\r\nCem;0\r\nDana;0\r\n")
+    assert journal.picks == 1
+    journal.close()
+    counters, pending = _replay(path, counters=(1, 1, 0, 0))
+    assert counters == [1, 1, 1, 0]
+    assert pending is None
+
+
+def test_crash_between_replace_and_reset(tmp_path):
+    path = _roster(tmp_path)
+    journal = DrawJournal(path)
+    _batch(journal, [0])
+    journal.checkpoint()
+    _batch(journal, [1])
+    _compact(journal, path, "Name;Counter\r\nAnna;1\r\nBob;0\r\nCem;0\r\nDana;0\r\n", crash=True)
+    journal.close()
+    # The new file holds the pick before the checkpoint; only Bob's remains
+    counters, _ = _replay(path, counters=(1, 0, 0, 0))
+    assert counters == [1, 1, 0, 0]
+
+
+def test_reset_starts_an_empty_journal(tmp_path):
+    path = _roster(tmp_path)
+    journal = DrawJournal(path)
+    _batch(journal, [0, 1, 2])
+    journal.reset()
+    journal.close()
+    assert DrawJournal(path).read() == []
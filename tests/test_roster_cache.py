@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Roster cache: hits only while the file content is unchanged."""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gluecksrad_io import CsvStorage, RosterCache  # noqa: E402
+
+
+def _setup(tmp_path: Path, body: str = "Anna;1\r\nBob;2\r\n") -> tuple[Path, RosterCache]:
+    path = tmp_path / "roster.csv"
+    path.write_text("Name;Counter\r\n" + body, encoding="utf-8")
+    return path, RosterCache(tmp_path / "cache")
+
+
+def test_second_load_is_served_from_the_cache(tmp_path):
+    path, cache = _setup(tmp_path)
+    first = CsvStorage(path, cache)
+    assert first.load().names == ["Anna", "Bob"] and not first.from_cache
+    second = CsvStorage(path, cache)
+    roster = second.load()
+    assert second.from_cache
+    assert roster.names == ["Anna", "Bob"] and list(roster.counters) == [1, 2]
+
+
+def test_same_size_edit_invalidates_the_entry(tmp_path):
+    path, cache = _setup(tmp_path)
+    CsvStorage(path, cache).load()
+    st = path.stat()
+    # Same size and mtime: only the content hash can tell the difference
+    path.write_text("Name;Counter\r\nAnna;7\r\nBob;2\r\n", encoding="utf-8")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert path.stat().st_size == st.st_size
+    assert cache.get(path, "csv") is None
+    storage = CsvStorage(path, cache)
+    assert list(storage.load().counters) == [7, 2] and not storage.from_cache
+    # The fresh parse replaced the entry
+    assert list(cache.get(path, "csv")[1]) == [7, 2]
+
+
+def test_entries_are_per_backend(tmp_path):
+    path, cache = _setup(tmp_path)
+    CsvStorage(path, cache).load()
+    assert cache.get(path, "csv") is not None
+    assert cache.get(path, "excel") is None
+
+
+def test_broken_entry_is_a_miss(tmp_path):
+    path, cache = _setup(tmp_path)
+    CsvStorage(path, cache).load()
+    for entry in (tmp_path / "cache").glob("*" + RosterCache.SUFFIX):
+        entry.write_bytes(b"GRRC garbage")
+    storage = CsvStorage(path, cache)
+    assert storage.load().names == ["Anna", "Bob"] and not storage.from_cache
+
+
+def test_clear_removes_all_entries(tmp_path):
+    path, cache = _setup(tmp_path)
+    CsvStorage(path, cache).load()
+    cache.clear()
+    assert cache.get(path, "csv") is None
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Shuffle deck: a saved cycle continues where it stopped after a restart."""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gluecksrad_engine import FairnessEngine, ShuffleDeck  # noqa: E402
+from gluecksrad_io import DeckFile  # noqa: E402
+
+NAMES = ["Anna", "Bob", "Cem", "Dana", "Emil", "Fred"]
+
+
+def _deal(deck: ShuffleDeck, engine: FairnessEngine, n: int, rng) -> list[int]:
+    winners = deck.draw(engine, n, rng)
+    for w in winners:
+        engine.apply_winner(w)
+    engine.clear_batch()
+    return winners
+
+
+def test_restored_deck_deals_the_same_cards(tmp_path):
+    rng = random.Random(3)
+    engine = FairnessEngine([0] * len(NAMES))
+    deck = ShuffleDeck()
+    deck_file = DeckFile(tmp_path / "namen.xlsx")
+    first = _deal(deck, engine, 2, rng)
+    deck_file.write(deck.state(NAMES))
+    second = _deal(deck, engine, 1, rng)
+    deck_file.advance(deck.pos)
+
+    restored = ShuffleDeck()
+    cards, pos = deck_file.read()
+    restored.restore(engine, NAMES, cards, pos)
+    rest = restored.draw(engine, 3, rng)
+    assert rest == deck.draw(engine, 3, rng)
+    # One cycle: everyone exactly once
+    assert sorted(first + second + rest) == list(range(len(NAMES)))
+
+
+def test_torn_advance_line_is_ignored(tmp_path):
+    engine = FairnessEngine([0] * len(NAMES))
+    deck = ShuffleDeck()
+    deck_file = DeckFile(tmp_path / "namen.xlsx")
+    _deal(deck, engine, 1, random.Random(1))
+    deck_file.write(deck.state(NAMES))
+    deck_file.advance(deck.pos + 2)
+    with open(deck_file.path, "a", encoding="utf-8") as f:
+        f.write('{"pos": ')
+    cards, pos = deck_file.read()
+    assert pos == 2 and len(cards) == len(NAMES) - 1
+
+
+def test_restore_matches_moved_names_and_skips_dealt_ones():
+    engine = FairnessEngine([0, 0, 0, 0])
+    names = ["Anna", "Bob", "Cem", "Dana"]
+    deck = ShuffleDeck()
+    # Roster reordered since the save; Cem was drawn meanwhile
+    engine.apply_winner(2)
+    engine.clear_batch()
+    deck.restore(engine, names, [[2, "Dana"], [0, "Cem"], [1, "Bob"], [3, "Anna"]])
+    assert deck.draw(engine, 3, random.Random(0)) == [3, 1, 0]
+
+
+def test_restore_with_duplicate_names_drops_repeated_cards():
+    # Saved for ["Anna", "Anna", "Bob"], restored after one Anna was removed
+    engine = FairnessEngine([0, 0])
+    deck = ShuffleDeck()
+    deck.restore(engine, ["Anna", "Bob"], [[1, "Anna"], [0, "Anna"], [2, "Bob"]])
+    winners = _deal(deck, engine, 2, random.Random(0))
+    assert sorted(winners) == [0, 1]
+
+
+def test_removed_entry_is_not_dealt():
+    rng = random.Random(5)
+    engine = FairnessEngine([0] * 5)
+    deck = ShuffleDeck()
+    _deal(deck, engine, 1, rng)
+    victim = deck.deck[deck.pos]
+    last = engine.remove(victim)
+    deck.remove(victim, last)
+    winners = _deal(deck, engine, 3, rng)
+    assert len(set(winners)) == 3 and max(winners) < len(engine)